@@ -0,0 +1,309 @@
+""" Zero-copy reader of the uncompressed WAV / RF64 / AIFF files: the header
+    are parsed here and the PCM data are the NumPy memory map, the blocks are
+    converted to float32 one by one. The other files and formats are read by
+    'soundfile', so the callers use 'audio_info' / 'open_blocks' for all files.
+"""
+
+import os
+import struct
+import numpy
+
+
+class AudioInfo(object):
+    """ The file format, the same attributes as 'soundfile.info' has """
+
+    def __init__(self, samplerate, channels, frames, subtype, format):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.frames = frames
+        self.subtype = subtype
+        self.format = format
+
+    @property
+    def duration(self):
+        return self.frames / self.samplerate if self.samplerate else 0.0
+
+
+# (bits, float) -> (soundfile subtype, numpy dtype without the byte order, the full scale)
+_PCM = {
+    (8, False): ("PCM_U8", "u1", 128.0),
+    (16, False): ("PCM_16", "i2", 32768.0),
+    (24, False): ("PCM_24", None, 8388608.0),
+    (32, False): ("PCM_32", "i4", 2147483648.0),
+    (32, True): ("FLOAT", "f4", 1.0),
+    (64, True): ("DOUBLE", "f8", 1.0)
+}
+
+
+def _pcm(bits, is_float, format):
+    """ Return (subtype, dtype, full scale), None for the not supported samples """
+    # the 8 bit AIFF samples are signed
+    if format == "AIFF" and (bits, is_float) == (8, False):
+        return "PCM_S8", "i1", 128.0
+    return _PCM.get((bits, is_float))
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _chunks(f, end, big_endian):
+    """ Yield (chunk id, data offset, data size), the chunks are word aligned """
+    position = f.tell()
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        cid, size = struct.unpack(">4sI" if big_endian else "<4sI", header)
+        yield cid, position + 8, size
+        position += 8 + size + (size & 1)
+
+
+def _extended(data):
+    """ Return the 80-bit IEEE 754 extended float of the AIFF sample rate """
+    exponent, mantissa = struct.unpack(">HQ", data[:10])
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def _parse_wav(f, file_size, rf64):
+    f.seek(12)
+    fmt, data_size64 = None, None
+    for cid, offset, size in _chunks(f, file_size, False):
+        if cid == b"ds64":
+            f.seek(offset)
+            _, data_size64 = struct.unpack("<QQ", f.read(16))
+        elif cid == b"fmt ":
+            f.seek(offset)
+            fmt = f.read(min(size, 40))
+        elif cid == b"data":
+            if fmt is None or len(fmt) < 16:
+                return None
+            tag, channels, samplerate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+            if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                # the sub format GUID starts with the format tag
+                tag = struct.unpack("<H", fmt[24:26])[0]
+            if tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+                return None
+            if rf64 and size == 0xFFFFFFFF and data_size64 is not None:
+                size = data_size64
+            # the streamed files have the not updated size
+            size = min(size, file_size - offset)
+            return (tag == WAVE_FORMAT_IEEE_FLOAT), bits, channels, samplerate, block_align, offset, size, "<", "RF64" if rf64 else "WAV"
+    return None
+
+
+def _parse_aiff(f, file_size, aifc):
+    f.seek(12)
+    comm, ssnd = None, None
+    for cid, offset, size in _chunks(f, file_size, True):
+        if cid == b"COMM":
+            f.seek(offset)
+            comm = f.read(min(size, 22))
+        elif cid == b"SSND":
+            f.seek(offset)
+            data_offset, _ = struct.unpack(">II", f.read(8))
+            ssnd = offset + 8 + data_offset, min(size - 8 - data_offset, file_size - offset - 8 - data_offset)
+        if comm is not None and ssnd is not None:
+            break
+    if comm is None or ssnd is None or len(comm) < 18:
+        return None
+    channels, _, bits = struct.unpack(">hIh", comm[:8])
+    samplerate = _extended(comm[8:18])
+    compression = comm[18:22] if aifc else b"NONE"
+    is_float, byteorder = False, ">"
+    if compression == b"sowt":
+        byteorder = "<"
+    elif compression in (b"fl32", b"FL32"):
+        is_float, bits = True, 32
+    elif compression in (b"fl64", b"FL64"):
+        is_float, bits = True, 64
+    elif compression != b"NONE":
+        return None
+    block_align = channels * ((bits + 7) // 8)
+    return is_float, bits, channels, int(samplerate), block_align, ssnd[0], ssnd[1], byteorder, "AIFF"
+
+
+class MappedAudio(object):
+    """ The PCM data of the WAV / RF64 / AIFF file as the (frames, channels)
+        memory map, the file pages are read by the OS on the access only
+    """
+
+    def __init__(self, filepath, header):
+        is_float, bits, channels, samplerate, block_align, offset, size, byteorder, format = header
+        subtype, dtype, self.scale = _pcm(bits, is_float, format)
+        self.byteorder = byteorder
+        frames = size // block_align if block_align else 0
+        self.info = AudioInfo(samplerate, channels, frames, subtype, format)
+        if not frames:
+            self.data = numpy.zeros((0, channels, 3) if dtype is None else (0, channels), dtype="u1" if dtype is None else dtype)
+        elif dtype is None:
+            # the 24 bit samples are the byte triples
+            self.data = numpy.memmap(filepath, dtype="u1", mode="r", offset=offset, shape=(frames, channels, 3))
+        else:
+            self.data = numpy.memmap(filepath, dtype=byteorder + dtype, mode="r", offset=offset, shape=(frames, channels))
+
+    @property
+    def samplerate(self):
+        return self.info.samplerate
+
+    @property
+    def channels(self):
+        return self.info.channels
+
+    @property
+    def frames(self):
+        return self.info.frames
+
+    def raw(self, start=0, stop=None):
+        """ Return the view of the file samples without the conversion """
+        return self.data[start:stop]
+
+    def read(self, start=0, stop=None, dtype="float32"):
+        """ Return the frames converted to the float array in [-1.0, 1.0) """
+        raw = self.data[start:stop]
+        if self.info.subtype == "PCM_24":
+            # the byte triples are the high bytes of int32, the shift keeps the sign
+            b = numpy.zeros(raw.shape[:2] + (4,), dtype="u1")
+            if self.byteorder == "<":
+                b[..., 1:] = raw
+            else:
+                b[..., :3] = raw
+            raw = b.view(self.byteorder + "i4")[..., 0] >> 8
+        out = raw.astype(dtype)
+        if self.info.subtype in ("FLOAT", "DOUBLE"):
+            return out
+        if self.info.subtype == "PCM_U8":
+            out -= 128.0
+        out *= 1.0 / self.scale
+        return out
+
+    def blocks(self, block_size=65536, dtype="float32", start=0, stop=None):
+        """ Yield the converted blocks, only one block are in the memory """
+        stop = self.frames if stop is None else min(stop, self.frames)
+        for position in range(start, stop, block_size):
+            yield self.read(position, min(position + block_size, stop), dtype)
+
+    def close(self):
+        # the map are closed by the last view release
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _header(filepath):
+    """ Return the parsed header tuple, None if the file are not mapped """
+    try:
+        file_size = os.path.getsize(filepath)
+        with open(filepath, "rb") as f:
+            head = f.read(12)
+            if len(head) < 12:
+                return None
+            if head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE":
+                header = _parse_wav(f, file_size, head[:4] == b"RF64")
+            elif head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+                header = _parse_aiff(f, file_size, head[8:12] == b"AIFC")
+            else:
+                return None
+    except (OSError, struct.error):
+        return None
+    if header is None or _pcm(header[1], header[0], header[8]) is None or not header[2] or not header[3]:
+        return None
+    # the samples in the wider containers are read by 'soundfile'
+    if header[4] != header[2] * ((header[1] + 7) // 8):
+        return None
+    return header
+
+
+def open_mapped(filepath):
+    """ Return the MappedAudio of the file, None for the not supported file """
+    header = _header(filepath)
+    if header is None:
+        return None
+    try:
+        return MappedAudio(filepath, header)
+    except (OSError, ValueError):
+        return None
+
+
+def audio_info(filepath):
+    """ Return the file info from the header, 'soundfile.info' for the other files """
+    header = _header(filepath)
+    if header is not None:
+        is_float, bits, channels, samplerate, block_align, _, size, _, format = header
+        return AudioInfo(samplerate, channels, size // block_align, _pcm(bits, is_float, format)[0], format)
+    import soundfile
+    return soundfile.info(filepath)
+
+
+class _SoundFileBlocks(object):
+    """ The 'soundfile' fallback with the MappedAudio 'blocks' interface """
+
+    def __init__(self, filepath):
+        import soundfile
+        self.file = soundfile.SoundFile(filepath)
+        self.samplerate = self.file.samplerate
+        self.channels = self.file.channels
+        self.frames = self.file.frames
+
+    def blocks(self, block_size=65536, dtype="float32", start=0, stop=None):
+        self.file.seek(start)
+        frames = (self.frames if stop is None else min(stop, self.frames)) - start
+        while frames > 0:
+            block = self.file.read(min(block_size, frames), dtype=dtype, always_2d=True)
+            if not len(block):
+                break
+            frames -= len(block)
+            yield block
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def open_blocks(filepath):
+    """ Return the block reader of the file: the memory map or 'soundfile' """
+    mapped = open_mapped(filepath)
+    return mapped if mapped is not None else _SoundFileBlocks(filepath)
+
+
+def peaks(filepath, bins=4096, block_size=1 << 18):
+    """ Return the (bins, 2) array of the min / max over the all channels of
+        the file parts, the file are scanned block by block
+    """
+    with open_blocks(filepath) as f:
+        frames = f.frames
+        bins = min(bins, frames)
+        out = numpy.zeros((bins, 2), dtype="float32")
+        if not bins:
+            return out
+        out[:, 0], out[:, 1] = numpy.inf, -numpy.inf
+        edges = numpy.linspace(0, frames, bins + 1).astype(numpy.int64)
+        position = 0
+        for block in f.blocks(block_size):
+            end = position + len(block)
+            first = int(numpy.searchsorted(edges, position, side="right")) - 1
+            last = int(numpy.searchsorted(edges, end - 1, side="right")) - 1
+            # the block parts of the bins
+            starts = numpy.concatenate(([position], edges[first + 1:last + 1])) - position
+            index = numpy.arange(first, last + 1)
+            out[index, 0] = numpy.minimum(out[index, 0], numpy.minimum.reduceat(block, starts, axis=0).min(axis=1))
+            out[index, 1] = numpy.maximum(out[index, 1], numpy.maximum.reduceat(block, starts, axis=0).max(axis=1))
+            position = end
+    return out
@@ -0,0 +1,200 @@
+#!python3
+""" Headless batch render of the job chain, without the Qt GUI.
+    The progress are printed to stdout as JSON lines, the log to stderr.
+"""
+
+import os
+import sys
+import glob
+import json
+import logging
+import argparse
+import threading
+from time import time, sleep
+from multiprocessing import Pipe, freeze_support
+
+from neil_vst_gui.main_worker import MainWorker
+from neil_vst_gui.metrics import MetricsServer
+
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+class JsonLinesProgress(object):
+    """docstring for JsonLinesProgress"""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+
+    def __call__(self, event):
+        with self.lock:
+            if event["event"] == "done":
+                self.done += 1
+            elif event["event"] == "failed":
+                self.failed += 1
+            self.stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+
+def _log_pipe_reader(pipe, stream=sys.stderr):
+    while True:
+        try:
+            text, level = pipe.recv()
+        except EOFError:
+            break
+        stream.write(text + "\n")
+        stream.flush()
+
+
+def input_files(patterns, list_file=None):
+    """ Expand the input globs and list file lines to the sorted files list """
+    files = []
+    if list_file is not None:
+        with open(list_file, "r", encoding="utf-8") as f:
+            patterns = list(patterns) + [ line.strip() for line in f if line.strip() ]
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for m in sorted(matches):
+            if os.path.isfile(m) and m not in files:
+                files.append(os.path.abspath(m))
+    return files
+
+
+def _tuned_buffer_size(settings, in_filepath, buffer_size, logger):
+    from neil_vst_gui.buffer_tune import chain_fingerprint, tune_buffer_size, BufferSizeStore
+
+    store = BufferSizeStore()
+    tuned = store.get(chain_fingerprint(settings["plugins_list"]))
+    if tuned is None:
+        try:
+            tuned, _ = tune_buffer_size(settings, in_filepath, logger, store=store)
+        except Exception as e:
+            logger.warning("Buffer tune error - %s" % str(e))
+            return buffer_size
+    logger.info("VST buffer size of the tuned chain - %d" % tuned)
+    return tuned
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-j', '--job', type=str, required=True, help='JSON job file')
+    parser.add_argument('-o', '--output', type=str, required=True, help='output folder for audio files')
+    parser.add_argument('-l', '--list', type=str, default=None, help='text file with input files, one per line')
+    parser.add_argument('-p', '--parallel', type=int, default=os.cpu_count() or 1, help='parallel workers count (default: %(default)s)')
+    parser.add_argument('-b', '--buffersize', type=int, default=8192, help='VST buffer size [1024...65536] (default: %(default)s)')
+    parser.add_argument('--auto-buffer', action="store_true", help='use the tuned buffer size of the chain, tune it on the first file if it is unknown')
+    parser.add_argument('-d', '--pipeline-depth', type=int, default=4, help='worker decode/DSP/encode buffers, 0 - serial (default: %(default)s)')
+    parser.add_argument('--chain-stages', type=int, default=1, help='plugins chain pipeline threads per file, 1 - serial chain (default: %(default)s)')
+    parser.add_argument('--prefix-cache', type=str, default=None, metavar="FOLDER",
+                        help='cache the chain prefixes output in the folder, the re-render starts from the deepest unchanged prefix')
+    parser.add_argument('--prefix-cache-gb', type=float, default=20.0, help='prefix cache size limit, GB (default: %(default)s)')
+    parser.add_argument('-c', '--cover-max-size', type=int, default=0, help='cover picture longest side, 0 - original (default: %(default)s)')
+    parser.add_argument('-s', '--split-long', type=float, default=0, help='split files longer than this, sec, to segments rendered in parallel, 0 - off (default: %(default)s)')
+    parser.add_argument('--memory-budget', type=float, default=0, help='workers memory budget, MB, 0 - system available memory (default: %(default)s)')
+    parser.add_argument('--memory-reserve', type=float, default=1024, help='system memory kept free, MB, 0 with zero budget - no memory limit (default: %(default)s)')
+    parser.add_argument('--dedup', type=str, default=None, choices=("full", "sample"),
+                        help='render the same content inputs once, the others are copied: hash of the full file or of the sampled parts')
+    parser.add_argument('--dedup-copy', action="store_true", help='copy the duplicates out files, not hard link (the tagged files are copied always)')
+    parser.add_argument('--retries', type=int, default=2, help='hung worker retries before the file fails, -1 - no watchdog (default: %(default)s)')
+    parser.add_argument('--heartbeat', type=float, default=120.0, help='worker without progress for this time are hung, sec (default: %(default)s)')
+    parser.add_argument('--timeout-factor', type=float, default=4.0,
+                        help='worker render time limit, x the expected time from the history or x the file duration (default: %(default)s)')
+    parser.add_argument('--reserve-cores', type=int, default=0, help='CPU cores the workers do not use (default: %(default)s)')
+    parser.add_argument('--nice', type=int, default=0, help='workers priority, 0 - normal ... 19 - idle (Windows: below normal from 5, idle from 15) (default: %(default)s)')
+    parser.add_argument('--keep-order', action="store_true", help='render in the input order, not the longest files first')
+    parser.add_argument('-r', '--resume', action="store_true", help='skip the files done by the interrupted run of the same job')
+    parser.add_argument('--metrics-port', type=int, default=None, help='serve /metrics (Prometheus) and /status (JSON) on the port, 0 - any free port')
+    parser.add_argument('--metrics-host', type=str, default="127.0.0.1", help='metrics endpoint address (default: %(default)s)')
+    parser.add_argument('--status-file', type=str, default=None, help='JSON status file rewritten every 5 seconds')
+    parser.add_argument('--trace', type=str, default=None, metavar="FILE",
+                        help='write the batch timeline as the Chrome trace JSON (chrome://tracing, ui.perfetto.dev)')
+    parser.add_argument('-m', '--meas', action="store_true", help='measure RMS/peak only, no render')
+    parser.add_argument('--log-level', type=str, default="INFO", choices=LOG_LEVELS, help='log level (default: %(default)s)')
+    parser.add_argument('inputs', nargs='*', help='input audio files or globs')
+
+    args = parser.parse_args(argv)
+    if args.buffersize < 1024 or args.buffersize > 65536:
+        parser.error('buffersize must be in range [1024...65536]')
+    if not len(args.inputs) and args.list is None:
+        parser.error('no input files')
+    return args
+
+
+def main(argv=None):
+    freeze_support()
+    args = parse_args(argv)
+
+    log_level = getattr(logging, args.log_level)
+    logger = logging.getLogger("neil_vst_batch")
+    logger.setLevel(log_level)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt='%(name)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'))
+    logger.addHandler(handler)
+
+    with open(args.job, "r") as f:
+        settings = json.load(f)
+    in_files = input_files(args.inputs, args.list)
+    os.makedirs(args.output, exist_ok=True)
+    if args.auto_buffer and len(settings.get("plugins_list", {})) and len(in_files):
+        args.buffersize = _tuned_buffer_size(settings, in_files[0], args.buffersize, logger)
+
+    # the workers log pipe
+    mother_pipe, child_pipe = Pipe()
+    t = threading.Thread(target=_log_pipe_reader, args=(mother_pipe,))
+    t.daemon = True
+    t.start()
+
+    progress = JsonLinesProgress()
+    progress({"event": "batch_start", "files": len(in_files), "time": time()})
+    start = time()
+
+    worker = MainWorker(logger, tag_threads=args.parallel, max_processes=args.parallel, on_event=progress)
+    metrics = None
+    if args.metrics_port is not None or args.status_file:
+        metrics = MetricsServer(worker, args.metrics_host, args.metrics_port, args.status_file, logger=logger).start()
+    worker.start_files(
+        child_pipe,
+        os.path.abspath(args.job),
+        in_files,
+        os.path.abspath(args.output),
+        tuple(settings.get("metadata", ())),
+        len(settings.get("plugins_list", {})) == 0,
+        args.meas,
+        args.buffersize,
+        log_level,
+        cover_max_size=args.cover_max_size,
+        pipeline_depth=args.pipeline_depth,
+        chain_stages=args.chain_stages,
+        prefix_cache={"enable": args.prefix_cache is not None, "folder": args.prefix_cache, "max_gb": args.prefix_cache_gb},
+        split={"enable": args.split_long > 0, "split_long_sec": args.split_long},
+        memory={"enable": args.memory_budget > 0 or args.memory_reserve > 0,
+                "budget_mb": args.memory_budget, "reserve_mb": args.memory_reserve},
+        resume=args.resume,
+        schedule=not args.keep_order,
+        trace_file=args.trace,
+        dedup={"enable": args.dedup is not None, "mode": args.dedup, "link": "copy" if args.dedup_copy else "hardlink"},
+        watchdog={"enable": args.retries >= 0, "heartbeat_sec": args.heartbeat, "timeout_factor": args.timeout_factor,
+                  "retries": args.retries},
+        cpu_policy={"enable": args.reserve_cores > 0 or args.nice > 0, "reserve_cores": args.reserve_cores, "nice": args.nice,
+                    "throttle_on_play": False}
+    )
+    try:
+        while worker.is_active():
+            sleep(0.1)
+    except KeyboardInterrupt:
+        worker.stop()
+        progress({"event": "batch_stop", "time": time()})
+        return 130
+    finally:
+        if metrics is not None:
+            metrics.stop()
+
+    progress({"event": "batch_end", "done": progress.done, "failed": progress.failed, "elapsed": time() - start, "time": time()})
+    return 1 if progress.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import threading
+from time import time
+
+
+JOURNAL_FILENAME = ".neil_vst_journal.json"
+
+
+def temp_filepath(filepath):
+    """ Return the temp path for the output file, the extension are kept so
+        the encoder format are the same
+    """
+    base, ext = os.path.splitext(filepath)
+    return base + ".part" + ext
+
+
+def job_fingerprint(settings, buffer_size=0):
+    """ Return hash of the job settings which change the rendered audio """
+    data = { k: settings.get(k) for k in ("plugins_list", "normalize", "metadata") }
+    data["buffer_size"] = buffer_size
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(filepath):
+    st = os.stat(filepath)
+    return "%d:%d" % (st.st_size, int(st.st_mtime))
+
+
+class BatchJournal(object):
+    """ Persistent per-file batch state in the output folder. The journal are
+        rewritten atomically on every change, so an interrupted batch can be
+        resumed with only the not finished files.
+    """
+
+    def __init__(self, out_folder, fingerprint):
+        self.filepath = os.path.join(out_folder, JOURNAL_FILENAME)
+        self.fingerprint = fingerprint
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        """ Load the previous state if it was made by the same job settings """
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("fingerprint") == self.fingerprint:
+            self.files = data.get("files", {})
+        return self
+
+    def save(self):
+        data = { "fingerprint": self.fingerprint, "time": time(), "files": self.files }
+        tmp = self.filepath + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent="    ", ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filepath)
+
+    # -------------------------------------------------------------------------
+
+    def update(self, in_filepath, state, **kwargs):
+        with self.lock:
+            entry = self.files.setdefault(in_filepath, {})
+            entry.update(kwargs, state=state, time=time())
+            if state == "done":
+                try:
+                    entry["source"] = file_fingerprint(in_filepath)
+                except OSError:
+                    pass
+            self.save()
+
+    def is_done(self, in_filepath, out_filepath):
+        """ Return True if the file are rendered by the same job settings, the
+            input file are not changed after it and the output file exists
+        """
+        entry = self.files.get(in_filepath, {})
+        if entry.get("state") != "done" or not os.path.exists(out_filepath):
+            return False
+        try:
+            return entry.get("source") == file_fingerprint(in_filepath)
+        except OSError:
+            return False
@@ -0,0 +1,123 @@
+#!python3
+""" VST buffer size auto-tune: render the excerpt of the file through the job
+    chain with the several buffer sizes, the fastest size are kept for the
+    chain fingerprint and used by the next jobs with the same chain.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from time import time, perf_counter
+
+from neil_vst_gui.schedule import cache_folder, _json_load, _json_save
+
+
+BUFFER_SIZES = (1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+def chain_fingerprint(plugins_list):
+    """ Return hash of the plugins chain, the buffer size are not a part of it """
+    data = [ { k: v.get(k) for k in ("path", "shell_uid", "params") } for v in plugins_list.values() ]
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class BufferSizeStore(object):
+    """ The tuned buffer sizes by the chain fingerprint """
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or os.path.join(cache_folder(), "buffer_sizes.json")
+        self.chains = _json_load(self.filepath)
+        self.lock = threading.Lock()
+
+    def get(self, fingerprint):
+        """ Return the tuned buffer size, None if the chain are not tuned """
+        with self.lock:
+            return self.chains.get(fingerprint, {}).get("buffer_size")
+
+    def set(self, fingerprint, buffer_size, results):
+        with self.lock:
+            self.chains[fingerprint] = {
+                "buffer_size": buffer_size,
+                "frames_per_second": { str(k): v for k, v in results.items() },
+                "time": time()
+            }
+            _json_save(self.filepath, self.chains)
+
+
+def _excerpt(in_filepath, excerpt_sec):
+    """ Return (samplerate, float32 frames) from the middle of the file """
+    from neil_vst_gui.audio_map import open_blocks
+
+    with open_blocks(in_filepath) as f:
+        if not f.frames:
+            raise ValueError("The buffer tune file [%s] has no audio" % os.path.basename(in_filepath))
+        frames = min(f.frames, int(excerpt_sec * f.samplerate))
+        start = max(0, (f.frames - frames) // 2)
+        return f.samplerate, next(f.blocks(frames, dtype='float32', start=start, stop=start + frames))
+
+
+def measure_throughput(plugins_list, samplerate, data, buffer_size, logger=None):
+    """ Return the chain processing speed, frames per second, the plugins load
+        and the first block are not timed
+    """
+    from neil_vst_gui.chain_render import ChainRenderer
+
+    renderer = ChainRenderer.from_settings(plugins_list, samplerate, data.shape[1], buffer_size, logger)
+    renderer.process(data[:buffer_size])
+    start = perf_counter()
+    for position in range(buffer_size, len(data), buffer_size):
+        renderer.process(data[position:position + buffer_size])
+    elapsed = perf_counter() - start
+    return max(len(data) - buffer_size, 0) / elapsed if elapsed > 0 else 0.0
+
+
+def tune_buffer_size(settings, in_filepath, logger, sizes=BUFFER_SIZES, excerpt_sec=20.0, store=None, stop=None):
+    """ Measure the chain speed with the all buffer sizes on the file excerpt,
+        store and return the fastest size and {size: frames per second}. The
+        sizes without the timed block in the excerpt (the first one are not
+        timed) are skipped, ValueError if no size are timed.
+    """
+    samplerate, data = _excerpt(in_filepath, excerpt_sec)
+    skipped = [ size for size in sizes if len(data) < size * 2 ]
+    if len(skipped):
+        logger.warning("Buffer tune excerpt are short, %d frames, the sizes %s are skipped" % (
+            len(data), ", ".join(str(size) for size in skipped)))
+    sizes = [ size for size in sizes if size not in skipped ]
+    if not len(sizes):
+        raise ValueError("The buffer tune excerpt are too short, %d frames" % len(data))
+    results = {}
+    for size in sizes:
+        if stop is not None and stop():
+            return None, results
+        results[size] = measure_throughput(settings["plugins_list"], samplerate, data, size)
+        logger.info("[ BUFFER TUNE ] %6d - %.1fx realtime" % (size, results[size] / samplerate))
+    best = max(results, key=lambda k: results[k])
+    logger.info("[ BUFFER TUNE ] the fastest buffer size - %d" % best)
+    if store is not None:
+        store.set(chain_fingerprint(settings["plugins_list"]), best, results)
+    return best, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-j', '--job', type=str, required=True, help='JSON job file')
+    parser.add_argument('-e', '--excerpt', type=float, default=20.0, help='excerpt length, sec (default: %(default)s)')
+    parser.add_argument('file', help='input audio file for the excerpt')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logger = logging.getLogger("BufferTune")
+
+    with open(args.job, "r") as f:
+        settings = json.load(f)
+    best, _ = tune_buffer_size(settings, args.file, logger, excerpt_sec=args.excerpt, store=BufferSizeStore())
+    print(best)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!python3
+""" Compile 'main.ui' to the 'main_ui.py' module, so the GUI startup does not
+    parse the XML file. Run it after the 'main.ui' changes:
+
+        python -m neil_vst_gui.build_ui
+"""
+
+import os
+import io
+import hashlib
+
+
+def ui_hash(ui_filepath):
+    """ Return sha1 of the UI file, the line endings changed by the checkout are the same """
+    with open(ui_filepath, "rb") as f:
+        return hashlib.sha1(f.read().replace(b"\r\n", b"\n")).hexdigest()
+
+
+def build(ui_filepath, py_filepath):
+    from PyQt5 import uic
+
+    out = io.StringIO()
+    with open(ui_filepath, "r", encoding="utf-8") as f:
+        uic.compileUi(f, out, from_imports=True)
+    # the Qt resources are imported by the main module as 'neil_vst_gui.resources'
+    code = out.getvalue().replace(ui_filepath, os.path.basename(ui_filepath))
+    lines = [ l for l in code.splitlines(True) if not l.startswith("from . import main_rc") ]
+    # the GUI loads 'main.ui' instead of the module built from the other one
+    lines.append("\n\nUI_SOURCE_HASH = \"%s\"\n" % ui_hash(ui_filepath))
+    with open(py_filepath, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+def main():
+    path = os.path.abspath(os.path.dirname(__file__))
+    build(os.path.join(path, "main.ui"), os.path.join(path, "main_ui.py"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+import os
+import copy
+import time
+import ctypes
+import threading
+import numpy
+from queue import Queue
+
+from neil_vst_gui.trace import tracer, now
+from neil_vst_gui.watchdog import heartbeat
+from neil_vst_gui.vst_chain import vst_module
+
+
+class ChainRenderer(object):
+    """ VST plugins chain block processing for numpy (frames, channels) arrays """
+
+    def __init__(self, plugins, channels, block_size):
+        for plugin in plugins:
+            if plugin.output_channels < channels:
+                raise ValueError(
+                    "VST [%s] has OUTPUT channels count [%d] less than audio file channels [%d]" % (plugin.name, plugin.output_channels, channels))
+            if plugin.input_channels < channels:
+                raise ValueError(
+                    "VST [%s] has INPUT channels count [%d] less than audio file channels [%d]" % (plugin.name, plugin.input_channels, channels))
+        self.plugins = plugins
+        self.channels = channels
+        self.block_size = block_size
+        self.vst_host = None
+        # channels input C buffers and numpy views to them
+        self._in_buffers = [ (ctypes.c_float * block_size)() for ch in range(channels) ]
+        self._in_pointers = [ ctypes.addressof(b) for b in self._in_buffers ]
+        self._in_views = [ numpy.frombuffer(b, dtype=numpy.float32) for b in self._in_buffers ]
+
+    @classmethod
+    def from_settings(cls, plugins_list, samplerate, channels, block_size, logger=None):
+        """ Create the chain from job "plugins_list" settings """
+        vst = vst_module()
+
+        vst_host = vst.VstHost(samplerate, block_size, logger=logger)
+        plugins = []
+        for v in plugins_list.values():
+            with tracer.span("plugin load", "chain", path=os.path.basename(v["path"])):
+                plugin = vst.VstPlugin(
+                    vst_host,
+                    v["path"],
+                    samplerate,
+                    block_size=block_size,
+                    max_channels=v.get("max_channels", 8),
+                    self_buffers=True,
+                    shell_uid=v.get("shell_uid", -1),
+                    logger=logger
+                )
+            with tracer.span("parameters restore", "chain", plugin=plugin.name, count=len(v.get("params", {}))):
+                for k, p in v.get("params", {}).items():
+                    plugin.parameter_value(
+                        name=k,
+                        normalized=p.get("normalized", True),
+                        value=p.get("value", 0.0),
+                        fullscale=p.get("fullscale", 1.0)
+                    )
+            if logger is not None:
+                logger.info("LOADED VST PLUGIN: %s " % plugin.name)
+            plugins.append(plugin)
+
+        renderer = cls(plugins, channels, block_size)
+        renderer.vst_host = vst_host
+        return renderer
+
+    def split(self, stages):
+        """ Return the chain split to 'stages' sequential sub-chains with the
+            near equal plugins count, every sub-chain has own input buffers
+        """
+        stages = max(1, min(stages, len(self.plugins)))
+        return self.split_at([ round(i * len(self.plugins) / stages) for i in range(1, stages) ])
+
+    def split_at(self, counts):
+        """ Return the sub-chains which end after the 'counts' plugins and the rest """
+        bounds = [0] + list(counts) + [len(self.plugins)]
+        chains = []
+        for i in range(len(bounds) - 1):
+            chain = ChainRenderer(self.plugins[bounds[i]:bounds[i + 1]], self.channels, self.block_size)
+            chain.vst_host = self.vst_host
+            chains.append(chain)
+        return chains
+
+    # -------------------------------------------------------------------------
+
+    def flush(self, frames):
+        """ Process the silence, the tails and the delay lines of the previous
+            file are run out. The plugins state are not reset exactly, so the
+            output can differ from the just loaded chain one.
+        """
+        block = numpy.zeros((self.block_size, self.channels), dtype=numpy.float32)
+        for position in range(0, frames, self.block_size):
+            self.process(block[:min(self.block_size, frames - position)])
+
+    def process(self, block, out=None):
+        """ Process the block through the all chain, return float32 array -
+            the 'out' array if it is set or the new one
+        """
+        block_len = len(block)
+        for ch in range(self.channels):
+            self._in_views[ch][:block_len] = block[:, ch]
+
+        in_buf_c_p = self._in_pointers
+        for plugin in self.plugins:
+            plugin.process_replacing(in_buf_c_p, plugin.out_buffers, block_len)
+            in_buf_c_p = plugin.out_buffers
+
+        if out is None:
+            out = numpy.empty((block_len, self.channels), dtype=numpy.float32)
+        for ch in range(self.channels):
+            out[:, ch] = numpy.ctypeslib.as_array(
+                ctypes.cast(in_buf_c_p[ch], ctypes.POINTER(ctypes.c_float)), shape=(block_len,))
+        return out
+
+
+class TapRenderer(object):
+    """ The chain which also writes the output after the some plugins, the
+        'taps' are [(plugins count, writer)]
+    """
+
+    def __init__(self, renderer, taps):
+        taps = sorted(taps, key=lambda t: t[0])
+        self.chains = renderer.split_at([ t[0] for t in taps ])
+        self.writers = [ t[1] for t in taps ]
+        self.vst_host = renderer.vst_host
+
+    def split(self, stages):
+        # the taps are written in order, the chain are not pipelined
+        return [self]
+
+    def process(self, block, out=None):
+        for chain, writer in zip(self.chains, self.writers):
+            block = chain.process(block)
+            writer.write(block)
+        return self.chains[-1].process(block, out=out)
+
+
+def normalize_settings(settings, in_filepath, logger):
+    """ Return copy of job settings with the first limiter gain set to reach
+        the normalize target RMS, same as the py-neil-vst chain worker does
+        (the RMS are measured the same way)
+    """
+    settings = copy.deepcopy(settings)
+    normalize = settings.get("normalize", {})
+    if not normalize.get("enable", False):
+        return settings
+
+    from neil_vst_gui.measure import measure_file, result_text
+
+    logger.info( "Normilize [ ENABLED ]" )
+    target_rms_db = normalize["target_rms"]
+    error_db = normalize["error_db"]
+
+    with tracer.span("normalize measure", "chain"):
+        result = measure_file(in_filepath)
+    logger.info(result_text(in_filepath, result))
+    meas_rms_db = result["rms_db"]
+    change_db = target_rms_db - meas_rms_db
+    logger.info( "Normilize [ COEFFICIENT ]: %.3f dB" % change_db )
+
+    if meas_rms_db < (target_rms_db - error_db) or meas_rms_db > (target_rms_db + error_db):
+        try:
+            limiter_settings = settings["plugins_list"]["FabFilter Pro-L 2 (0)"]["params"]
+            limiter_settings["Bypass"]["value"] = 0.0
+            if change_db > 0:
+                limiter_settings["Gain"].update(value=change_db, fullscale=30.0, normalized=False)
+            else:
+                limiter_settings["Output Level"].update(value=change_db, fullscale=-30.0, normalized=False)
+        except KeyError:
+            logger.warning("[ FabFilter Pro-L 2 ] as the first plugin in chain are not found! Normilize are [ DISABLED ]")
+    return settings
+
+
+def _render_serial(in_file, out_file, renderer, buffer_size):
+    blocks = in_file.blocks(blocksize=buffer_size, always_2d=True)
+    while True:
+        t0 = now()
+        block = next(blocks, None)
+        if block is None:
+            break
+        t1 = now()
+        out = renderer.process(block)
+        t2 = now()
+        out_file.write(out)
+        heartbeat.beat()
+        tracer.block("decode", t0, t1)
+        tracer.block("DSP", t1, t2)
+        tracer.block("encode", t2, now())
+
+
+def _render_pipelined(in_file, out_file, renderer, buffer_size, depth, stages=1):
+    """ Decode -> DSP -> encode in the threads, the stages exchange the
+        preallocated buffers by queues, so the codecs work (without GIL)
+        overlaps with the plugins chain work. With 'stages' > 1 the chain are
+        split to the plugins groups with own threads, the group N processes
+        the block K while the group N-1 processes the block K+1. Every plugin
+        gets the same blocks in the same order, so the output are the same
+        as the serial one, the latency grows by 'depth' blocks per stage.
+    """
+    chains = renderer.split(stages)
+    # the buffers pools and the full buffers queues between the stages:
+    # 0 - decoder -> first chain, ..., len(chains) - last chain -> encoder
+    free = [ Queue() for i in range(len(chains) + 1) ]
+    full = [ Queue() for i in range(len(chains) + 1) ]
+    for pool in free:
+        for i in range(depth):
+            pool.put(numpy.empty((buffer_size, in_file.channels), dtype=numpy.float32))
+    errors = []
+
+    def decode():
+        try:
+            while not len(errors):
+                buf = free[0].get()
+                if buf is None:
+                    break
+                t0 = now()
+                block_len = len(in_file.read(dtype='float32', always_2d=True, out=buf))
+                tracer.block("decode", t0, now())
+                if not block_len:
+                    break
+                full[0].put((buf, block_len))
+                if block_len < buffer_size:
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            full[0].put(None)
+
+    def dsp(i):
+        name = "DSP %d" % (i + 1) if len(chains) > 1 else "DSP"
+        # after an error the blocks are only passed back to keep the stages going to the end
+        while True:
+            item = full[i].get()
+            if item is None:
+                full[i + 1].put(None)
+                break
+            buf, block_len = item
+            if not len(errors):
+                out = free[i + 1].get()
+                try:
+                    t0 = now()
+                    chains[i].process(buf[:block_len], out=out[:block_len])
+                    tracer.block(name, t0, now())
+                    full[i + 1].put((out, block_len))
+                except Exception as e:
+                    errors.append(e)
+                    free[i + 1].put(out)
+            free[i].put(buf)
+
+    def encode():
+        while True:
+            item = full[-1].get()
+            if item is None:
+                break
+            buf, block_len = item
+            if not len(errors):
+                try:
+                    t0 = now()
+                    out_file.write(buf[:block_len])
+                    heartbeat.beat()
+                    tracer.block("encode", t0, now())
+                except Exception as e:
+                    errors.append(e)
+            free[-1].put(buf)
+
+    threads = [ threading.Thread(target=decode, daemon=True), threading.Thread(target=encode, daemon=True) ]
+    threads += [ threading.Thread(target=dsp, args=(i, ), daemon=True) for i in range(1, len(chains)) ]
+    for t in threads:
+        t.start()
+    try:
+        # the first chain stage runs in the caller thread
+        dsp(0)
+    finally:
+        free[0].put(None)
+        full[1].put(None)
+        for t in threads:
+            t.join()
+    if len(errors):
+        raise errors[0]
+
+
+def render_file(settings, in_filepath, out_filepath, buffer_size, logger, tags=None, pipeline_depth=0, renderer=None, chain_stages=1,
+                prefix_cache=None):
+    """ Render input file through the job chain to the output file. The text
+        tags are written by the encoder, so the output are written only once.
+        With 'pipeline_depth' > 0 the decode/DSP/encode stages run in threads,
+        'chain_stages' > 1 splits the plugins chain to the pipelined threads too.
+        The already loaded 'renderer' chain are used as is, without normalize.
+        With the 'prefix_cache' the render starts from the deepest cached
+        chain prefix output and stores the new prefixes.
+    """
+    import soundfile
+
+    start = time.time()
+    if renderer is None:
+        settings = normalize_settings(settings, in_filepath, logger)
+
+    logger.info("[ VST CHAIN START.... ] - %s " % os.path.basename(in_filepath))
+
+    in_file = soundfile.SoundFile(in_filepath, mode='r', closefd=True)
+    source = in_file
+    writers = []
+    if renderer is None and prefix_cache is not None:
+        plugins = list(settings["plugins_list"].items())
+        with tracer.span("prefix cache lookup", "chain"):
+            depth, hit, store = prefix_cache.plan(in_filepath, settings["plugins_list"], buffer_size, in_file.frames)
+        if hit is not None:
+            logger.info("[ PREFIX CACHE ] - %d of %d plugins are cached" % (depth, len(plugins)))
+            source = soundfile.SoundFile(hit, mode='r', closefd=True)
+        renderer = ChainRenderer.from_settings(dict(plugins[depth:]), in_file.samplerate, in_file.channels, buffer_size, logger)
+        if len(store):
+            writers = [ (k - depth, prefix_cache.writer(path, in_file.samplerate, in_file.channels)) for k, path in store ]
+            renderer = TapRenderer(renderer, writers)
+    if renderer is None:
+        renderer = ChainRenderer.from_settings(settings["plugins_list"], in_file.samplerate, in_file.channels, buffer_size, logger)
+    out_file = soundfile.SoundFile(
+        out_filepath, mode='w', samplerate=in_file.samplerate, channels=in_file.channels, subtype=in_file.subtype, closefd=True)
+    # the tags must be set before the first audio data write
+    for k, v in (tags or {}).items():
+        if not v:
+            continue
+        try:
+            setattr(out_file, k, v)
+        except RuntimeError as e:
+            logger.debug("tag '%s' are not supported for '%s' - %s" % (k, os.path.basename(out_filepath), str(e)))
+
+    try:
+        if chain_stages > 1:
+            # the plugins stages are pipelined only with the buffers in flight
+            _render_pipelined(source, out_file, renderer, buffer_size, max(pipeline_depth, 2), chain_stages)
+        elif pipeline_depth > 0:
+            _render_pipelined(source, out_file, renderer, buffer_size, pipeline_depth)
+        else:
+            _render_serial(source, out_file, renderer, buffer_size)
+    except BaseException:
+        for _, writer in writers:
+            writer.abort()
+        raise
+    finally:
+        in_file.close()
+        source.close()
+        out_file.close()
+        tracer.flush()
+    for _, writer in writers:
+        writer.commit()
+    if prefix_cache is not None:
+        prefix_cache.trim()
+
+    end_time = time.time() - start
+    logger.info("[ VST CHAIN COMPLITE ] - from %s - saved to - %s " % (os.path.basename(in_filepath), os.path.basename(out_filepath)))
+    logger.info("[ END ] - Elapsed time: [ %.3f | %.3f ]" % (end_time, end_time/60))
@@ -0,0 +1,201 @@
+import os
+import sys
+import ctypes
+
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# the Windows priority classes of the nice values, the lowest nice first
+_PRIORITY_CLASSES = (
+    (15, 0x00000040),   # IDLE_PRIORITY_CLASS
+    (5, 0x00004000),    # BELOW_NORMAL_PRIORITY_CLASS
+    (0, 0x00000020)     # NORMAL_PRIORITY_CLASS
+)
+
+
+def _priority_class(nice):
+    for level, priority_class in _PRIORITY_CLASSES:
+        if nice >= level:
+            return priority_class
+    return _PRIORITY_CLASSES[-1][1]
+
+
+def available_cpus():
+    """ Return the sorted CPU indexes the process can run on """
+    try:
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        if psutil is not None:
+            return sorted(psutil.Process().cpu_affinity())
+    except (OSError, AttributeError):
+        pass
+    return list(range(os.cpu_count() or 1))
+
+
+def _threads(pid):
+    """ Return the Linux thread ids of the process, the affinity and the nice
+        are per thread there and the already started threads do not inherit it
+    """
+    try:
+        return [ int(t) for t in os.listdir("/proc/%d/task" % pid) ]
+    except (OSError, ValueError):
+        return [ pid ]
+
+
+def set_affinity(pid, cpus):
+    """ Bind the process to the CPUs, False if it are not supported """
+    pid = pid or os.getpid()
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            for tid in _threads(pid):
+                try:
+                    os.sched_setaffinity(tid, cpus)
+                except ProcessLookupError:
+                    # the thread are finished
+                    continue
+            return True
+        if psutil is not None:
+            psutil.Process(pid).cpu_affinity(list(cpus))
+            return True
+        if sys.platform == "win32":
+            mask = sum(1 << c for c in cpus if c < 64)
+            # PROCESS_SET_INFORMATION | PROCESS_QUERY_LIMITED_INFORMATION
+            handle = ctypes.windll.kernel32.OpenProcess(0x0200 | 0x1000, False, pid)
+            if not handle:
+                return False
+            try:
+                return bool(ctypes.windll.kernel32.SetProcessAffinityMask(handle, ctypes.c_size_t(mask)))
+            finally:
+                ctypes.windll.kernel32.CloseHandle(handle)
+    except Exception:
+        pass
+    return False
+
+
+def set_nice(pid, nice):
+    """ Set the process priority by the POSIX nice value (0 - normal, 19 - idle),
+        on Windows it are the priority class. The not privileged process can
+        lower the priority only, False if it are not changed.
+    """
+    pid = pid or os.getpid()
+    try:
+        if sys.platform == "win32":
+            if psutil is not None:
+                psutil.Process(pid).nice(_priority_class(nice))
+                return True
+            handle = ctypes.windll.kernel32.OpenProcess(0x0200 | 0x1000, False, pid)
+            if not handle:
+                return False
+            try:
+                return bool(ctypes.windll.kernel32.SetPriorityClass(handle, _priority_class(nice)))
+            finally:
+                ctypes.windll.kernel32.CloseHandle(handle)
+        if hasattr(os, "setpriority"):
+            tids = _threads(pid) if sys.platform.startswith("linux") else [ pid ]
+            for tid in tids:
+                try:
+                    os.setpriority(os.PRIO_PROCESS, tid, nice)
+                except ProcessLookupError:
+                    continue
+            return True
+        if psutil is not None:
+            psutil.Process(pid).nice(nice)
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def get_nice(pid):
+    """ Return the POSIX nice value of the process, None if it are not known """
+    try:
+        return os.getpriority(os.PRIO_PROCESS, pid or os.getpid())
+    except (AttributeError, OSError):
+        return None
+
+
+def nice_floor():
+    """ Return the lowest nice the process can set, so the priority lowered
+        above it can be raised back. The not privileged Linux process are
+        limited by RLIMIT_NICE (0 by default - the priority can be lowered only).
+    """
+    if sys.platform == "win32" or not hasattr(os, "geteuid"):
+        return 0
+    if os.geteuid() == 0:
+        return -20
+    try:
+        import resource
+        limit = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    except (ImportError, AttributeError, OSError, ValueError):
+        return 20
+    if limit == resource.RLIM_INFINITY:
+        return -20
+    return 20 - limit
+
+
+class CpuPolicy(object):
+    """ The batch workers CPUs and priority: 'reserve_cores' are left to the
+        GUI and the playback, the workers run at 'nice'. While the audition
+        plays the workers are throttled to the 'throttle_share' of their
+        cores, at 'throttle_nice' only when the process can raise the
+        priority back to 'nice' after the audition.
+    """
+
+    def __init__(self, reserve_cores=1, nice=10, throttle_on_play=True, throttle_nice=19, throttle_share=0.5):
+        self.reserve_cores = reserve_cores
+        self.nice = nice
+        self.throttle_on_play = throttle_on_play
+        self.throttle_nice = throttle_nice
+        self.throttle_share = throttle_share
+        self.cpus = available_cpus()
+        self.nice_floor = nice_floor()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Create from the "cpu_policy" settings dict, None if disabled """
+        if not settings or not settings.get("enable", False):
+            return None
+        return cls(
+            reserve_cores=settings.get("reserve_cores", 1),
+            nice=settings.get("nice", 10),
+            throttle_on_play=settings.get("throttle_on_play", True),
+            throttle_nice=settings.get("throttle_nice", 19),
+            throttle_share=settings.get("throttle_share", 0.5)
+        )
+
+    def worker_cpus(self, throttled=False):
+        """ Return the workers CPUs, the first ones are reserved, at least one are left """
+        cpus = self.cpus[min(max(0, self.reserve_cores), len(self.cpus) - 1):]
+        if throttled and self.throttle_on_play:
+            cpus = cpus[:max(1, int(len(cpus) * self.throttle_share))]
+        return cpus
+
+    def nice_restorable(self):
+        """ True if the throttled workers nice can be returned to 'nice' """
+        return self.nice >= self.nice_floor
+
+    def worker_nice(self, throttled=False):
+        if throttled and self.throttle_on_play and self.nice_restorable():
+            return max(self.nice, self.throttle_nice)
+        return self.nice
+
+    def settings(self, throttled=False):
+        """ Return (cpus, nice) of the worker """
+        return self.worker_cpus(throttled), self.worker_nice(throttled)
+
+    def apply(self, pid, throttled=False):
+        """ Apply the policy to the process, 0 - the current process """
+        cpus, nice = self.settings(throttled)
+        return set_affinity(pid, cpus), set_nice(pid, nice)
+
+    def status(self, throttled=False):
+        cpus, nice = self.settings(throttled)
+        if throttled and self.throttle_on_play and not self.nice_restorable():
+            state = " (throttled by CPUs only, the priority can not be raised back)"
+        else:
+            state = " (throttled)" if throttled else ""
+        return "workers CPUs %s, nice %d%s" % (",".join(str(c) for c in cpus), nice, state)
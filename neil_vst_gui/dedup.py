@@ -0,0 +1,51 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from neil_vst_gui.prefix_cache import file_hash
+
+
+def sample_hash(filepath, samples=16, chunk_size=64 * 1024):
+    """ Return sha1 of the file size and the evenly spaced chunks, the first
+        and the last chunks are included. It reads ~1 MB of the any file.
+    """
+    size = os.path.getsize(filepath)
+    h = hashlib.sha1(("size:%d" % size).encode("utf-8"))
+    with open(filepath, "rb") as f:
+        if size <= samples * chunk_size:
+            h.update(f.read())
+            return h.hexdigest()
+        for i in range(samples):
+            f.seek((size - chunk_size) * i // (samples - 1))
+            h.update(f.read(chunk_size))
+    return h.hexdigest()
+
+
+def content_hash(filepath, mode="full"):
+    """ Return the file content hash, 'sample' mode reads only the file parts """
+    return sample_hash(filepath) if mode == "sample" else file_hash(filepath)
+
+
+def duplicate_groups(filepaths, mode="full", threads=8):
+    """ Return [[index, ...]] of the files with the same content, the first
+        index of the group are the file to render. Only the files of the
+        same size and extension are hashed.
+    """
+    def key(filepath):
+        return os.path.splitext(filepath)[1].lower(), os.path.getsize(filepath)
+
+    by_size = {}
+    for i, f in enumerate(filepaths):
+        try:
+            by_size.setdefault(key(f), []).append(i)
+        except OSError:
+            continue
+    candidates = [ i for group in by_size.values() if len(group) > 1 for i in group ]
+    if not len(candidates):
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        hashes = list(executor.map(lambda i: content_hash(filepaths[i], mode), candidates))
+    groups = {}
+    for i, h in zip(candidates, hashes):
+        groups.setdefault((key(filepaths[i]), h), []).append(i)
+    return sorted(sorted(g) for g in groups.values() if len(g) > 1)
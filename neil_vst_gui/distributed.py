@@ -0,0 +1,662 @@
+#!python3
+""" Distributed render over TCP. The coordinator hands out the (job
+    fingerprint, input file) tasks to the connected render workers, the
+    workers cache the job settings per fingerprint and send back the output
+    metrics (and the output file in the 'stream' mode). The chain are loaded
+    per file as the local workers do, '--reuse-chain' keeps it for the job.
+
+    The workers send the render progress, the task without it for the
+    heartbeat time or rendering longer than the watchdog time limit are
+    returned to the queue. The not loopback coordinator requires the shared
+    token, the workers prove it by HMAC of the connection challenge.
+
+    Modes:
+        shared - the input/output paths are on the shared folder, visible to
+                 the workers (optionally with '--path-map' prefix change)
+        stream - the input file are sent to the worker, the output file are
+                 sent back to the coordinator
+"""
+
+import os
+import sys
+import hmac
+import json
+import types
+import struct
+import select
+import socket
+import hashlib
+import ipaddress
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from time import time, sleep
+from multiprocessing import Process, freeze_support
+
+from neil_vst_gui.batch_journal import BatchJournal, temp_filepath, job_fingerprint
+from neil_vst_gui.watchdog import Watchdog, heartbeat
+
+
+PROTOCOL_VERSION = 2
+DEFAULT_PORT = 7878
+CHUNK_SIZE = 1024 * 1024
+TASK_ATTEMPTS = 3
+
+
+# -----------------------------------------------------------------------------
+# messages: 4 bytes big-endian header length, JSON header, 'size' bytes payload
+
+def send_message(sock, header, payload_filepath=None):
+    header = dict(header, size=os.path.getsize(payload_filepath) if payload_filepath else 0)
+    data = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    sock.sendall(struct.pack("!I", len(data)) + data)
+    if payload_filepath:
+        with open(payload_filepath, "rb") as f:
+            sock.sendfile(f)
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), CHUNK_SIZE))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_message(sock):
+    """ Return the message header, the payload are left in the socket """
+    size, = struct.unpack("!I", _recv_exact(sock, 4))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+def recv_payload(sock, header, filepath):
+    """ Receive the message payload to the file """
+    left = header.get("size", 0)
+    with open(filepath, "wb") as f:
+        while left > 0:
+            chunk = sock.recv(min(left, CHUNK_SIZE))
+            if not chunk:
+                raise ConnectionError("connection closed")
+            f.write(chunk)
+            left -= len(chunk)
+
+
+def skip_payload(sock, header):
+    left = header.get("size", 0)
+    while left > 0:
+        chunk = sock.recv(min(left, CHUNK_SIZE))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        left -= len(chunk)
+
+
+def parse_address(address, default_host="127.0.0.1"):
+    host, _, port = address.rpartition(":")
+    return (host or default_host, int(port or DEFAULT_PORT))
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def auth_digest(token, nonce):
+    """ Return the worker proof of the shared token for the challenge """
+    return hmac.new(token.encode("utf-8"), nonce.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+# -----------------------------------------------------------------------------
+
+class Coordinator(object):
+    """ Serve the render tasks of one job to the connected workers """
+
+    def __init__(self, settings, in_files, out_files, host="127.0.0.1", port=DEFAULT_PORT, mode="shared",
+                 buffer_size=8192, pipeline_depth=4, picture=None, journal=None, on_event=None, logger=None,
+                 token=None, watchdog=None, durations=None):
+        assert mode in ("shared", "stream"), "Unknown transfer mode '%s'" % mode
+        assert token or is_loopback(host), "The shared token are required for the not loopback address '%s'" % host
+        self.settings = settings
+        self.fingerprint = job_fingerprint(settings, buffer_size)
+        self.mode = mode
+        self.address = (host, port)
+        self.buffer_size = buffer_size
+        self.pipeline_depth = pipeline_depth
+        self.picture = picture
+        self.journal = journal
+        self.on_event = on_event
+        self.logger = logger or logging.getLogger(__name__)
+        self.token = token
+        # the task time limit by the file duration and the progress heartbeat
+        self.watchdog = watchdog or Watchdog()
+        durations = durations or [ 0.0 ] * len(in_files)
+        self.pending = [ {"id": i, "in_file": in_files[i], "out_file": out_files[i], "duration": durations[i]}
+                         for i in range(len(in_files)) ]
+        self.total = len(self.pending)
+        self.finished = 0
+        self.lock = threading.Lock()
+        self.terminate_work = False
+        self.server = None
+
+    def _event(self, event, filepath, **kwargs):
+        if self.journal is not None and event in ("start", "done", "failed"):
+            try:
+                self.journal.update(filepath, "started" if event == "start" else event, out_file=kwargs.get("out_file"))
+            except OSError as e:
+                self.logger.warning("Batch journal write error - %s" % str(e))
+        if self.on_event is not None:
+            self.on_event(dict(event=event, file=filepath, time=time(), **kwargs))
+
+    def _task_take(self):
+        while True:
+            with self.lock:
+                task = self.pending.pop(0) if len(self.pending) else None
+            if task is None or os.path.exists(task["in_file"]):
+                return task
+            self._task_finished()
+            self._event("failed", task["in_file"], error="input file not found")
+
+    def _task_return(self, task):
+        """ Return the lost worker task to the queue, it are failed after
+            TASK_ATTEMPTS lost workers
+        """
+        task["attempts"] = task.get("attempts", 0) + 1
+        if task["attempts"] >= TASK_ATTEMPTS:
+            self._task_finished()
+            self._event("failed", task["in_file"], error="%d workers are lost on the file" % task["attempts"])
+            return
+        self.logger.warning("task returned to queue - %s" % os.path.basename(task["in_file"]))
+        with self.lock:
+            self.pending.insert(0, task)
+
+    def _task_finished(self):
+        with self.lock:
+            self.finished += 1
+
+    def _task_failed(self, task, name, error):
+        """ The task error of the file itself, the worker gets the next task """
+        self.logger.error("[ %s ] - %s - %s" % (name, os.path.basename(task["in_file"]), error))
+        self._task_finished()
+        self._event("failed", task["in_file"], worker=name, error=error)
+
+    def _tags(self, out_filepath):
+        """ Return the text tags of the out file, None without the metadata or
+            if the tags are failed - the file are rendered untagged then
+        """
+        from neil_vst_gui.tag_write import TagWriter
+
+        metadata = self.settings.get("metadata", ())
+        if not len(metadata):
+            return None
+        try:
+            return TagWriter(self.logger).tags(out_filepath, *metadata[:-1])
+        except Exception as e:
+            self.logger.warning("%s - tags are not written - %s" % (os.path.basename(out_filepath), str(e)))
+            return None
+
+    def _task_header(self, task):
+        if self.mode == "stream":
+            # the not readable input fails the task before the header are sent
+            os.path.getsize(task["in_file"])
+        return {
+            "type": "task",
+            "id": task["id"],
+            "fingerprint": self.fingerprint,
+            "mode": self.mode,
+            "in_file": task["in_file"],
+            "out_file": task["out_file"],
+            "tags": self._tags(task["out_file"]),
+            "buffer_size": self.buffer_size,
+            "pipeline_depth": self.pipeline_depth,
+            "heartbeat_sec": self.watchdog.heartbeat_sec
+        }
+
+    # -------------------------------------------------------------------------
+
+    def _await_result(self, conn, task):
+        """ Return the task result message, TimeoutError if the worker has no
+            progress for the heartbeat time or the task time are over
+        """
+        start = last = time()
+        deadline = start + self.watchdog.timeout(task.get("duration", 0.0))
+        heartbeat_sec = self.watchdog.heartbeat_sec
+        while True:
+            now = time()
+            if heartbeat_sec > 0 and (now - last) > heartbeat_sec:
+                raise TimeoutError("no progress for %.0f sec" % (now - last))
+            if now > deadline:
+                raise TimeoutError("render time over %.0f sec" % (deadline - start))
+            wait = deadline - now
+            if heartbeat_sec > 0:
+                wait = min(wait, last + heartbeat_sec - now)
+            ready, _, _ = select.select([conn], [], [], max(0.05, wait))
+            if not ready:
+                continue
+            message = recv_message(conn)
+            if message.get("type") != "progress":
+                return message
+            last = time()
+
+    def _serve_worker(self, conn, addr):
+        name = "%s:%d" % addr
+        task = None
+        try:
+            nonce = os.urandom(16).hex()
+            send_message(conn, {"type": "challenge", "version": PROTOCOL_VERSION, "nonce": nonce})
+            hello = recv_message(conn)
+            if hello.get("type") != "hello" or hello.get("version") != PROTOCOL_VERSION:
+                self.logger.error("[ %s ] - wrong protocol, disconnect" % name)
+                return
+            if self.token and not hmac.compare_digest(str(hello.get("auth", "")), auth_digest(self.token, nonce)):
+                self.logger.error("[ %s ] - wrong token, disconnect" % name)
+                send_message(conn, {"type": "bye", "error": "wrong token"})
+                return
+            name = hello.get("name", name)
+            known = set(hello.get("fingerprints", []))
+            self.logger.info("[ WORKER CONNECTED ] - %s" % name)
+            while True:
+                request = recv_message(conn)
+                if request.get("type") != "ready":
+                    break
+                task = self._task_take()
+                if task is None:
+                    if self.is_done() or self.terminate_work:
+                        send_message(conn, {"type": "bye"})
+                        break
+                    # the other workers tasks can be returned to the queue
+                    send_message(conn, {"type": "idle", "delay": 0.5})
+                    continue
+                try:
+                    header = self._task_header(task)
+                except Exception as e:
+                    self._task_failed(task, name, str(e))
+                    task = None
+                    send_message(conn, {"type": "idle", "delay": 0.0})
+                    continue
+                if self.fingerprint not in known:
+                    send_message(conn, {"type": "job", "fingerprint": self.fingerprint, "settings": self.settings, "picture": self.picture})
+                    known.add(self.fingerprint)
+                self._event("start", task["in_file"], worker=name)
+                send_message(conn, header, task["in_file"] if self.mode == "stream" else None)
+                result = self._await_result(conn, task)
+                self._task_result(conn, task, result, name)
+                task = None
+        except TimeoutError as e:
+            self.logger.warning("[ WATCHDOG ] %s - %s - %s, the task are returned" % (
+                name, os.path.basename(task["in_file"]) if task else "", str(e)))
+        except (OSError, ValueError, struct.error) as e:
+            self.logger.error("[ %s ] - connection error - %s" % (name, str(e)))
+        finally:
+            if task is not None:
+                # the lost worker task are rendered by the other one
+                self._task_return(task)
+            conn.close()
+            self.logger.info("[ WORKER DISCONNECTED ] - %s" % name)
+
+    def _task_result(self, conn, task, result, name):
+        in_file, out_file = task["in_file"], task["out_file"]
+        if not result.get("ok", False):
+            skip_payload(conn, result)
+            self._task_failed(task, name, result.get("error", ""))
+            return
+        if self.mode == "stream":
+            recv_payload(conn, result, temp_filepath(out_file))
+            os.replace(temp_filepath(out_file), out_file)
+        self._task_finished()
+        self.logger.info("[ %s ] - done - %s" % (name, os.path.basename(out_file)))
+        self._event("done", in_file, out_file=out_file, worker=name, metrics=result.get("metrics", {}))
+
+    # -------------------------------------------------------------------------
+
+    def is_done(self):
+        with self.lock:
+            return self.finished >= self.total
+
+    def serve(self):
+        """ Accept the workers until the all tasks are finished """
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(self.address)
+        self.server.listen()
+        self.server.settimeout(0.2)
+        self.logger.info("[ COORDINATOR ] - listen %s:%d, %d files, %s mode" % (self.address + (self.total, self.mode)))
+        threads = []
+        try:
+            while not self.is_done() and not self.terminate_work:
+                try:
+                    conn, addr = self.server.accept()
+                except socket.timeout:
+                    continue
+                # the not answering worker are lost, the render wait are limited by the watchdog
+                conn.settimeout(self.watchdog.heartbeat_sec if self.watchdog.heartbeat_sec > 0 else None)
+                t = threading.Thread(target=self._serve_worker, args=(conn, addr))
+                t.daemon = True
+                t.start()
+                threads.append(t)
+        finally:
+            self.server.close()
+        for t in threads:
+            t.join(1.0)
+
+    def stop(self):
+        self.terminate_work = True
+
+
+# -----------------------------------------------------------------------------
+
+class RemoteWorker(object):
+    """ Render the coordinator tasks, the job settings are cached by the job
+        fingerprint. The chain are loaded per file, so the output are the same
+        as the local render. With 'reuse_chain' the loaded chain are kept for
+        the job and 'flush_sec' of the silence are processed before the next
+        file, the plugins state are not reset exactly by it.
+    """
+
+    def __init__(self, address, name=None, work_folder=None, path_map=(), reuse_chain=False, logger=None, chain_stages=1,
+                 token=None, flush_sec=10.0):
+        self.address = address
+        self.name = name or "%s-%d" % (socket.gethostname(), os.getpid())
+        self.work_folder = work_folder
+        self.path_map = path_map
+        self.reuse_chain = reuse_chain
+        self.flush_sec = flush_sec
+        self.chain_stages = chain_stages
+        self.token = token
+        self.logger = logger or logging.getLogger(self.name)
+        self.jobs = {}
+        self.renderers = {}
+        self.send_lock = threading.Lock()
+
+    def _local_path(self, path):
+        for remote, local in self.path_map:
+            if path.startswith(remote):
+                return local + path[len(remote):]
+        return path
+
+    def _renderer(self, fingerprint, settings, in_filepath, buffer_size):
+        """ Return the reused chain of the job, None if the chain are loaded
+            per file (by default and with normalize, it changes the parameters)
+        """
+        import soundfile
+        from neil_vst_gui.chain_render import ChainRenderer
+
+        if not self.reuse_chain or settings.get("normalize", {}).get("enable", False):
+            return None
+        info = soundfile.info(in_filepath)
+        key = (fingerprint, info.samplerate, info.channels, buffer_size)
+        if key not in self.renderers:
+            self.renderers[key] = ChainRenderer.from_settings(
+                settings["plugins_list"], info.samplerate, info.channels, buffer_size, self.logger)
+        else:
+            self.renderers[key].flush(int(self.flush_sec * info.samplerate))
+        return self.renderers[key]
+
+    def _send(self, sock, header, payload_filepath=None):
+        with self.send_lock:
+            send_message(sock, header, payload_filepath)
+
+    def _progress_send(self, sock, stop, interval):
+        """ Send the progress while the render heartbeat are going """
+        last = heartbeat.value.value
+        while not stop.wait(interval):
+            if heartbeat.value.value == last:
+                continue
+            last = heartbeat.value.value
+            try:
+                self._send(sock, {"type": "progress"})
+            except OSError:
+                return
+
+    def _metrics(self, out_filepath, elapsed):
+        import numpy
+        import soundfile
+        from neil_vst_gui.memory_monitor import process_memory, MB
+
+        peak, square, frames = 0.0, 0.0, 0
+        with soundfile.SoundFile(out_filepath) as f:
+            duration = f.frames / f.samplerate
+            for block in f.blocks(blocksize=65536, dtype='float32', always_2d=True):
+                peak = max(peak, float(numpy.max(numpy.abs(block))) if len(block) else 0.0)
+                square += float(numpy.sum(numpy.square(block, dtype=numpy.float64)))
+                frames += block.size
+        rms = (square / frames) ** 0.5 if frames else 0.0
+        _, peak_rss = process_memory(os.getpid())
+        return {
+            "elapsed": elapsed,
+            "duration": duration,
+            "realtime": duration / elapsed if elapsed else 0.0,
+            "peak_db": 20 * numpy.log10(peak) if peak > 0 else None,
+            "rms_db": 20 * numpy.log10(rms) if rms > 0 else None,
+            "peak_rss_mb": peak_rss // MB if peak_rss else None
+        }
+
+    def _task(self, sock, task):
+        from neil_vst_gui.tag_write import TagWriter
+        from neil_vst_gui.chain_render import render_file
+
+        job = self.jobs[task["fingerprint"]]
+        folder = None
+        if task["mode"] == "stream":
+            folder = tempfile.mkdtemp(prefix="neil_vst_", dir=self.work_folder)
+            in_filepath = os.path.join(folder, os.path.basename(task["in_file"]))
+            out_filepath = os.path.join(folder, "out", os.path.basename(task["out_file"]))
+            os.makedirs(os.path.dirname(out_filepath))
+            recv_payload(sock, task, in_filepath)
+        else:
+            in_filepath = self._local_path(task["in_file"])
+            out_filepath = self._local_path(task["out_file"])
+        payload = None
+        stop = threading.Event()
+        progress = threading.Thread(target=self._progress_send, args=(sock, stop, task.get("heartbeat_sec", 0) / 4.0), daemon=True)
+        if task.get("heartbeat_sec", 0) > 0:
+            progress.start()
+        try:
+            start = time()
+            self.logger.info("[ TASK ] - %s" % os.path.basename(in_filepath))
+            renderer = self._renderer(task["fingerprint"], job["settings"], in_filepath, task["buffer_size"])
+            metadata = job["settings"].get("metadata", ())
+            tag_writer = TagWriter(self.logger)
+            # the coordinator image path are not local, the picture are sent with the job
+            encoder_tags = tag_writer.encoder_tags(out_filepath, task.get("tags"), None, job.get("picture"))
+            render_file(job["settings"], in_filepath, temp_filepath(out_filepath), task["buffer_size"], self.logger,
+                        tags=encoder_tags, pipeline_depth=task.get("pipeline_depth", 0), renderer=renderer,
+                        chain_stages=self.chain_stages)
+            if len(metadata):
+                tag_writer.picture_update(temp_filepath(out_filepath), task.get("tags"), None, job.get("picture"))
+            os.replace(temp_filepath(out_filepath), out_filepath)
+            result = {"type": "result", "id": task["id"], "ok": True, "metrics": self._metrics(out_filepath, time() - start)}
+            payload = out_filepath if task["mode"] == "stream" else None
+        except Exception as e:
+            self.logger.error("%s - %s" % (os.path.basename(in_filepath), str(e)))
+            result = {"type": "result", "id": task["id"], "ok": False, "error": str(e)}
+        # the progress after the result are not expected by the coordinator
+        stop.set()
+        if progress.is_alive():
+            progress.join()
+        try:
+            self._send(sock, result, payload)
+        finally:
+            if os.path.exists(temp_filepath(out_filepath)):
+                os.remove(temp_filepath(out_filepath))
+            if folder is not None:
+                shutil.rmtree(folder, ignore_errors=True)
+
+    def run(self, connect_timeout=30.0):
+        """ Connect to the coordinator and work until it says 'bye' """
+        start = time()
+        while True:
+            try:
+                sock = socket.create_connection(self.address)
+                break
+            except OSError:
+                if (time() - start) > connect_timeout:
+                    raise
+                sleep(0.5)
+        # the render blocks beat it, the progress are sent while it changes
+        heartbeat.attach(types.SimpleNamespace(value=0.0))
+        try:
+            challenge = recv_message(sock)
+            auth = auth_digest(self.token, challenge.get("nonce", "")) if self.token else ""
+            self._send(sock, {"type": "hello", "version": PROTOCOL_VERSION, "name": self.name, "auth": auth,
+                              "fingerprints": list(self.jobs.keys())})
+            while True:
+                self._send(sock, {"type": "ready"})
+                message = recv_message(sock)
+                if message["type"] == "job":
+                    self.jobs[message["fingerprint"]] = message
+                    self.logger.info("[ JOB ] - %s" % message["fingerprint"][:12])
+                    message = recv_message(sock)
+                if message["type"] == "task":
+                    self._task(sock, message)
+                elif message["type"] == "idle":
+                    sleep(message.get("delay", 0.5))
+                else:
+                    if message.get("error"):
+                        self.logger.error("Coordinator - %s" % message["error"])
+                    break
+        except ConnectionError as e:
+            self.logger.warning("Coordinator connection closed - %s" % str(e))
+        finally:
+            sock.close()
+
+
+def _worker_process(address, name, work_folder, path_map, reuse_chain, log_level, chain_stages, token, connect_timeout):
+    logger = _logger(name, log_level)
+    RemoteWorker(address, name, work_folder, path_map, reuse_chain, logger, chain_stages, token).run(connect_timeout)
+
+
+def _logger(name, log_level):
+    logger = logging.getLogger(name)
+    logger.setLevel(log_level)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt='%(name)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'))
+    logger.addHandler(handler)
+    return logger
+
+
+# -----------------------------------------------------------------------------
+
+def parse_args(argv=None):
+    from neil_vst_gui.batch import LOG_LEVELS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="serve the job files to the workers")
+    coord.add_argument('-j', '--job', type=str, required=True, help='JSON job file')
+    coord.add_argument('-o', '--output', type=str, required=True, help='output folder for audio files')
+    coord.add_argument('-l', '--list', type=str, default=None, help='text file with input files, one per line')
+    coord.add_argument('--listen', type=str, default="127.0.0.1:%d" % DEFAULT_PORT,
+                       help='listen address, the not loopback one requires --token (default: %(default)s)')
+    coord.add_argument('--mode', type=str, default="shared", choices=("shared", "stream"), help='files transfer mode (default: %(default)s)')
+    coord.add_argument('-b', '--buffersize', type=int, default=8192, help='VST buffer size [1024...65536] (default: %(default)s)')
+    coord.add_argument('-d', '--pipeline-depth', type=int, default=4, help='worker decode/DSP/encode buffers, 0 - serial (default: %(default)s)')
+    coord.add_argument('-c', '--cover-max-size', type=int, default=0, help='cover picture longest side, 0 - original (default: %(default)s)')
+    coord.add_argument('-r', '--resume', action="store_true", help='skip the files done by the interrupted run of the same job')
+    coord.add_argument('--heartbeat', type=float, default=120.0, help='task without the worker progress for this time are returned, sec (default: %(default)s)')
+    coord.add_argument('--timeout-factor', type=float, default=4.0, help='task time limit, x the file duration (default: %(default)s)')
+    coord.add_argument('inputs', nargs='*', help='input audio files or globs')
+
+    worker = sub.add_parser("worker", help="render the coordinator tasks")
+    worker.add_argument('--connect', type=str, default="127.0.0.1:%d" % DEFAULT_PORT, help='coordinator address (default: %(default)s)')
+    worker.add_argument('-n', '--workers', type=int, default=1, help='worker processes count (default: %(default)s)')
+    worker.add_argument('--name', type=str, default=None, help='worker name (default: host-pid)')
+    worker.add_argument('--work-folder', type=str, default=None, help='temp folder for the stream mode files')
+    worker.add_argument('--path-map', type=str, action="append", default=[], metavar="REMOTE=LOCAL",
+                        help='shared mode path prefix change, can be repeated')
+    worker.add_argument('--reuse-chain', action="store_true",
+                        help='keep the loaded chain for the job, the silence flush between the files does not reset '
+                             'the plugins state exactly, the output can differ from the local render')
+    worker.add_argument('--chain-stages', type=int, default=1, help='plugins chain pipeline threads per file (default: %(default)s)')
+    worker.add_argument('--connect-timeout', type=float, default=30.0, help='wait the coordinator, sec (default: %(default)s)')
+
+    for p in (coord, worker):
+        p.add_argument('--token', type=str, default=os.environ.get("NEIL_VST_NODE_TOKEN"),
+                       help='shared secret of the coordinator and the workers (default: $NEIL_VST_NODE_TOKEN)')
+        p.add_argument('--log-level', type=str, default="INFO", choices=LOG_LEVELS, help='log level (default: %(default)s)')
+    args = parser.parse_args(argv)
+    if args.role == "coordinator" and not args.token and not is_loopback(parse_address(args.listen)[0]):
+        parser.error('the not loopback listen address requires --token (or $NEIL_VST_NODE_TOKEN)')
+    return args
+
+
+def main(argv=None):
+    freeze_support()
+    args = parse_args(argv)
+    log_level = getattr(logging, args.log_level)
+
+    if args.role == "worker":
+        path_map = [ tuple(m.split("=", 1)) for m in args.path_map ]
+        address = parse_address(args.connect)
+        if args.workers == 1:
+            worker = RemoteWorker(address, args.name, args.work_folder, path_map, args.reuse_chain, _logger(args.name or "RemoteWorker", log_level),
+                                  args.chain_stages, args.token)
+            worker.run(args.connect_timeout)
+            return 0
+        processes = [ Process(target=_worker_process, args=(address, "%s-%d" % (args.name or socket.gethostname(), i),
+                                                            args.work_folder, path_map, args.reuse_chain, log_level, args.chain_stages,
+                                                            args.token, args.connect_timeout))
+                      for i in range(args.workers) ]
+        [ p.start() for p in processes ]
+        [ p.join() for p in processes ]
+        return 0 if all(p.exitcode == 0 for p in processes) else 1
+
+    from neil_vst_gui.batch import JsonLinesProgress, input_files
+    from neil_vst_gui.tag_write import TagWriter
+
+    logger = _logger("neil_vst_coordinator", log_level)
+    with open(args.job, "r") as f:
+        settings = json.load(f)
+    in_files = input_files(args.inputs, args.list)
+    out_folder = os.path.abspath(args.output)
+    os.makedirs(out_folder, exist_ok=True)
+    out_files = [ os.path.join(out_folder, os.path.basename(f)) for f in in_files ]
+
+    progress = JsonLinesProgress()
+    journal = BatchJournal(out_folder, job_fingerprint(settings, args.buffersize))
+    if args.resume:
+        journal.load()
+        done = [ journal.is_done(in_files[i], out_files[i]) for i in range(len(in_files)) ]
+        for i in [ i for i in range(len(in_files)) if done[i] ]:
+            progress({"event": "skipped", "file": in_files[i], "out_file": out_files[i], "time": time()})
+        in_files = [ in_files[i] for i in range(len(done)) if not done[i] ]
+        out_files = [ out_files[i] for i in range(len(done)) if not done[i] ]
+
+    # the longest files first, the long files are not left to the end
+    from neil_vst_gui.schedule import ProbeCache, longest_first
+
+    durations = { f: (info or {}).get("duration", 0.0) for f, info in zip(in_files, ProbeCache().probe(in_files)) }
+    order = longest_first(range(len(in_files)), lambda i: durations[in_files[i]])
+    in_files, out_files = [ in_files[i] for i in order ], [ out_files[i] for i in order ]
+    watchdog = Watchdog(heartbeat_sec=args.heartbeat, timeout_factor=args.timeout_factor)
+
+    picture = None
+    metadata = settings.get("metadata", ())
+    if len(metadata) and metadata[-1] and os.path.exists(metadata[-1]):
+        picture = TagWriter(logger).picture_write(metadata[-1], max_size=args.cover_max_size)
+
+    host, port = parse_address(args.listen)
+    coordinator = Coordinator(settings, in_files, out_files, host, port, args.mode, args.buffersize, args.pipeline_depth,
+                              picture, journal, progress, logger, token=args.token, watchdog=watchdog,
+                              durations=[ durations[f] for f in in_files ])
+    progress({"event": "batch_start", "files": len(in_files), "time": time()})
+    start = time()
+    try:
+        coordinator.serve()
+    except KeyboardInterrupt:
+        coordinator.stop()
+        progress({"event": "batch_stop", "time": time()})
+        return 130
+    progress({"event": "batch_end", "done": progress.done, "failed": progress.failed, "elapsed": time() - start, "time": time()})
+    return 1 if progress.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -50,50 +50,77 @@ class Job(object):
 
     # -------------------------------------------------------------------------
 
-    def update(self, normilize_params, metadata, filepath=None):
+    def plugins_settings(self, task=None):
+        plugins_list = {}
+        index = 0
+        plugins = list(self.__vst_chain.plugins())
+        # the parameters are read in the task thread too, the VST 2.4 getParameter
+        # are the automation value the plugins keep for the any thread
+        for plugin in plugins:
+            if task is not None:
+                task.progress(index, len(plugins), plugin.name)
+            plugins_list["%s (%d)" % (plugin.name, index)] = {
+                "path": plugin.path_to_lib,
+                "max_channels": 8,
+                "params": self.__vst_chain.parse_plugin_parameters(plugin)
+            }
+            index += 1
+        return plugins_list
+
+    def update(self, normilize_params, metadata, filepath=None, task=None):
+        """ Dump the job with the plugins parameters snapshot, return the
+            settings. The GUI values are taken by the caller in the GUI thread.
+        """
         #
         settings = self.__settings_init()
         # update normilize parameters
         if len(normilize_params.keys()):
             settings["normalize"] = normilize_params
         # update import files param
-        settings["in_files"] = self.__files.filelist
+        settings["in_files"] = list(self.__files.filelist)
         # update out_folder param
         settings["out_folder"] = self.__files.out_folder
         # update all other parameters
-        index = 0
-        for plugin in self.__vst_chain.plugins():
-            settings["plugins_list"]["%s (%d)" % (plugin.name, index)] = {
-                "path": plugin.path_to_lib,
-                "max_channels": 8,
-                "params": self.__vst_chain.parse_plugin_parameters(plugin)
-            }
-            index += 1
+        settings["plugins_list"] = self.plugins_settings(task)
         #
         settings["metadata"] = self.__metadata.data = metadata
+        # the cancelled task does not write the job
+        if task is not None:
+            task.check()
         # dump updated parameters
         self.dump(settings, filepath)
+        return settings
 
-    def load(self, filepath=None):
-        # update job json filepath
-        self.__update_job_filepath(filepath)
+    def load_prepare(self, filepath=None, task=None):
+        """ Read the job file and build its plugins, the job are not changed
+            until 'load_apply', so it runs in the background task
+        """
+        filepath = filepath or self.job_file
         # load data from filepath
-        f = open(self.job_file, "r")
-        data = f.read()
-        f.close()
-
+        with open(filepath, "r") as f:
+            data = f.read()
         settings = {**self.__settings_init(), **json.loads(data)}
+        plugins = self.__vst_chain.build(settings["plugins_list"], task)
+        return filepath, settings, plugins
+
+    def load_apply(self, prepared):
+        """ Set the prepared job, it runs in the GUI thread """
+        filepath, settings, (plugins, parameters) = prepared
+        # update job json filepath
+        self.__update_job_filepath(filepath)
         # set import file list
         self.__files.update(settings["in_files"])
         self.__files.out_folder_update(settings["out_folder"])
         #
         # self.settings["normalize"]
         # set VST chain
-        self.__vst_chain.clear()
-        self.__vst_chain.plugins_load(settings["plugins_list"])
+        self.__vst_chain.replace(plugins, parameters)
         #
         self.__metadata.data = settings["metadata"]
 
+    def load(self, filepath=None):
+        self.load_apply(self.load_prepare(filepath))
+
     def dump(self, settings, filepath=None):
         # update job json filepath
         self.__update_job_filepath(filepath)
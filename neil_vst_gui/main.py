@@ -1,28 +1,44 @@
 #!python3
 
+from time import time, sleep, perf_counter
+_startup_t0 = perf_counter()
+
 import os
 import sys
-from time import time, sleep
 import json
 import logging
 import threading
 from queue import Queue
 from multiprocessing import Pipe, freeze_support, current_process
 
-from PyQt5 import Qt, QtWidgets, QtCore, QtGui, uic
+from PyQt5 import Qt, QtWidgets, QtCore, QtGui
 
+from neil_vst_gui.startup_profile import StartupProfile
 from neil_vst_gui.ui_logging import MainLogHandler, ProcessLogEmitter
 from neil_vst_gui.ui_settings import UI_Settings
 from neil_vst_gui.main_worker import MainWorker
 from neil_vst_gui.job import Job
 from neil_vst_gui.play_chain import PlayPluginChain
+from neil_vst_gui.play_process import PlayProcessChain
 from neil_vst_gui.wave_widget import WaveWidget
 import neil_vst_gui.resources
 
+try:
+    from neil_vst_gui.main_ui import Ui_MainWindow
+except ImportError:
+    Ui_MainWindow = None
+
 
 __version__ = '0.5.8b2'
 
 
+startup_profile = StartupProfile(
+    enabled=("--profile-startup" in sys.argv or bool(os.environ.get("NEIL_VST_GUI_PROFILE"))),
+    t0=_startup_t0
+)
+startup_profile.mark("modules import")
+
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -36,7 +52,7 @@ def resource_path(relative_path):
 def terminate_sounddevice(sounddevice):
     sounddevice._terminate()
     del(sounddevice)
-    del(sys.modules["sounddevice"])
+    sys.modules.pop("sounddevice", None)
 
 
 class VSTPluginWindow(QtWidgets.QWidget):
@@ -69,8 +85,12 @@ class VSTPluginWindow(QtWidgets.QWidget):
 class neil_vst_gui_window(QtWidgets.QMainWindow):
 
     logging_signal = QtCore.pyqtSignal(str, str)
+    sound_devices_signal = QtCore.pyqtSignal(list)
+    memory_signal = QtCore.pyqtSignal(str)
+    buffer_size_signal = QtCore.pyqtSignal(int)
     progress_signal = QtCore.pyqtSignal(int)
     ready_signal = QtCore.pyqtSignal()
+    task_done_signal = QtCore.pyqtSignal(object, object)
 
     # constructor
     def __init__(self):
@@ -78,13 +98,22 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
 
         # Create the MainThread logging
         self._logger_init()
+        startup_profile.mark("logger init")
         #
         self.job = Job(logger=self.logger)
         #
-        self.main_worker = MainWorker(logger=self.logger)
+        self.main_worker = MainWorker(logger=self.logger, tag_threads=min(8, os.cpu_count() or 1))
+        self.metrics_server = None
+        # the background job task, one at a time
+        self.task = None
+        self.task_apply = None
+        startup_profile.mark("job and workers init")
         #
-        self.play_chain = PlayPluginChain(blocksize=1024, buffersize=8, logger=self.logger)
-
+        self.play_chain_thread = PlayPluginChain(blocksize=1024, buffersize=8, logger=self.logger)
+        self.play_chain_process = PlayProcessChain(blocksize=1024, pipe=self.child_pipe, logger=self.logger)
+        self.play_chain_process.file_changed_signal.connect(self.play_file_changed)
+        self.play_chain = self.play_chain_thread
+        startup_profile.mark("play chains init")
 
         # Init UI
         self._ui_init()
@@ -93,8 +122,13 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
 
         # self.play_chain.progress_signal.connect(self.play_progress_update)
 
-        self.play_chain.stop_signal.connect(self.play_stop_slot)
-        self.play_chain.progress_signal.connect(self.play_progress_update)
+        for play_chain in (self.play_chain_thread, self.play_chain_process):
+            play_chain.stop_signal.connect(self.play_stop_slot)
+            play_chain.progress_signal.connect(self.play_progress_update)
+        # the render process plugins get the parameters changes of the open editors while playing
+        self.play_parameters_timer = QtCore.QTimer(self)
+        self.play_parameters_timer.setInterval(500)
+        self.play_parameters_timer.timeout.connect(self._play_parameters_update)
         self.wave_widget.change_play_position_clicked.connect(self.play_position_change_end)
 
         self.action_open_job.triggered.connect(self._job_open)
@@ -127,6 +161,10 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         #
         self.progress_signal.connect(self._progress_slot)
         self.ready_signal.connect(self.end_work)
+        self.task_done_signal.connect(self._task_done)
+        self.memory_signal.connect(self.statusBar.showMessage)
+        self.buffer_size_signal.connect(lambda size: self.line_edit_buffer_size_bytes.setText(str(size)))
+        self.action_buffer_tune.triggered.connect(self._buffer_tune_click)
         #
         self.dockWidget.dockLocationChanged.connect(self._dock_window_lock_changed)
         #
@@ -136,36 +174,60 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         # window color style
         self.actionLightStyle.triggered.connect(self._ui_style_set)
         self.actionDarkStyle.triggered.connect(self._ui_style_set)
+        #
+        self.sound_devices_signal.connect(self._sound_devices_update)
+        startup_profile.mark("signals connect")
 
+        # available sound devices list are updated in the UI thread
+        self.nqueue.put('sound_devices')
         self._put_start_message()
 
     # -------------------------------------------------------------------------
 
+    def _ui_compiled(self):
+        """ The precompiled UI module are used if it are built from the same
+            'main.ui' content, the files times are changed by the checkout
+        """
+        if Ui_MainWindow is None:
+            return False
+        from neil_vst_gui.build_ui import ui_hash
+        import neil_vst_gui.main_ui as main_ui
+        try:
+            return getattr(main_ui, "UI_SOURCE_HASH", None) == ui_hash(resource_path('main.ui'))
+        except OSError:
+            return True
+
     def _ui_init(self):
-        # main ui from default
-        self.uic = uic.loadUi(resource_path('main.ui'), self)
+        # main ui from the precompiled module or from 'main.ui' file
+        compiled = self._ui_compiled()
+        if compiled:
+            self.uic = Ui_MainWindow()
+            self.uic.setupUi(self)
+            # all widgets as the window attributes, same as 'uic.loadUi' does
+            for k, v in vars(self.uic).items():
+                setattr(self, k, v)
+        else:
+            from PyQt5 import uic
+            self.uic = uic.loadUi(resource_path('main.ui'), self)
+        # the UI file icon path are relative, the package one does not depend on the CWD
+        self.setWindowIcon(QtGui.QIcon(resource_path("main.ico")))
+        startup_profile.mark("ui setup")
         self.setWindowTitle("NEIL-VST-GUI - %s - [ %s ]" % (__version__, "job default"))
         self._ui_load_settings()
+        startup_profile.mark("ui settings load")
+        if not compiled:
+            self.logger.warning("'main_ui.py' are not built from the current 'main.ui', it are loaded slow by uic - "
+                                "run 'python -m neil_vst_gui.build_ui'")
         #
         self.wave_widget = WaveWidget(parent=self)
         self.horizontalLayout_5.addWidget(self.wave_widget)
 
-        # available sound devices list
-        import sounddevice
-        devices = sounddevice.query_devices()
-        devices_str = str(sounddevice.query_devices()).split('\n')
-        for i in range(len(devices)):
-            if devices[i]['max_output_channels'] > 0:
-                self.combo_box_sound_device.addItem(devices_str[i], userData = devices[i]['name'])
-
-        devices_list = [d for d in str(sounddevice.query_devices()).split('\n') if 'Output' in d]
-        self.combo_box_sound_device.addItems(devices_list)
-        self.combo_box_sound_device.setCurrentIndex(self.combo_box_sound_device.last_used_index)
-        # unload sonddevice lib for future use in another thread
-        terminate_sounddevice(sounddevice)
+        # available sound devices list from the last scan, rescan in the UI thread
+        self._sound_devices_update(self.sound_devices_cache)
 
         # show self main window
         self.show()
+        startup_profile.mark("window show")
 
         # create and start the UI thread
         self.nqueue = Queue()
@@ -221,12 +283,55 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         }
         #
         self.combo_box_sound_device.__dict__["last_used_index"] = int(settings.get("sound_device_index", 0))
+        self.sound_devices_cache = settings.get("sound_devices_cache", [])
         # opes/save filepaths
         self.job.files().last_path = settings.get("files_last_path", "C://")
         self.job.files().out_folder = settings.get("files_out_last_path", "C://")
         self.line_edit_out_folder.setText(self.job.files().out_folder)
         self.job.vst_chain().last_path = settings.get("vst_last_path", "C://")
+        # idle plugins instances reused by the next jobs, memory 0 - limited by count only
+        self.vst_pool = settings.get("vst_pool", {"size": 16, "memory_mb": 0})
+        self.job.vst_chain().pool_size = int(self.vst_pool.get("size", 16))
+        self.job.vst_chain().pool_memory_mb = float(self.vst_pool.get("memory_mb", 0))
         self.job.last_path = settings.get("job_last_path", "C://")
+        # playback chain render mode
+        self.action_play_render_process.setChecked(settings.get("play_render_process", False))
+        self.action_play_playlist.setChecked(settings.get("play_playlist", False))
+        self.action_resume_batch.setChecked(settings.get("resume_batch", False))
+        self.action_buffer_auto.setChecked(settings.get("buffer_auto", False))
+        self.play_chain_process.render_ahead = float(settings.get("play_render_ahead_sec", 2.0))
+        # metadata cover picture longest side limit, 0 - keep original
+        self.cover_max_size = int(settings.get("cover_max_size", 0))
+        # worker decode/DSP/encode pipeline buffers count, 0 - serial work
+        self.worker_pipeline_depth = int(settings.get("worker_pipeline_depth", 4))
+        # plugins chain split to the pipelined threads per file, 1 - serial chain
+        self.worker_chain_stages = int(settings.get("worker_chain_stages", 1))
+        # the chain prefixes output cache, folder "" - user cache folder
+        self.prefix_cache = settings.get("prefix_cache", {"enable": False, "folder": "", "max_gb": 20.0, "points": 2})
+        # the batch timeline Chrome trace file, "" - not written
+        self.batch_trace_file = settings.get("batch_trace_file", "")
+        # the batch metrics HTTP endpoint and status file for the dashboards
+        self.metrics = settings.get("metrics", {
+            "enable": False, "host": "127.0.0.1", "port": 9108, "status_file": "", "interval": 5.0
+        })
+        # long files split to segments rendered on the several cores
+        self.split_long_files = settings.get("split_long_files", {
+            "enable": False, "split_long_sec": 1800.0, "segment_sec": 600.0, "preroll_sec": 5.0, "crossfade_sec": 0.05, "latency": 0
+        })
+        # workers are started while the memory budget allows, budget 0 - system available memory
+        self.memory_budget = settings.get("memory_budget", {
+            "enable": False, "budget_mb": 0, "reserve_mb": 1024, "worker_estimate_mb": 512
+        })
+        # the same content inputs are rendered once, mode "full" or "sample" hash, link "hardlink" or "copy"
+        self.dedup_inputs = settings.get("dedup_inputs", {"enable": False, "mode": "full", "link": "hardlink"})
+        # the hung workers are killed and retried, the time limit are the expected render time x factor
+        self.watchdog = settings.get("watchdog", {
+            "enable": False, "heartbeat_sec": 120.0, "timeout_factor": 4.0, "min_timeout_sec": 300.0, "retries": 2
+        })
+        # the workers leave the reserved cores to the GUI and the playback, throttled while the audition plays
+        self.cpu_policy = settings.get("cpu_policy", {
+            "enable": False, "reserve_cores": 1, "nice": 10, "throttle_on_play": True, "throttle_nice": 19, "throttle_share": 0.5
+        })
 
     def _ui_save_settings(self):
         # create settings dict
@@ -249,11 +354,30 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         ]
         #
         settings["sound_device_index"] = self.combo_box_sound_device.currentIndex()
+        settings["sound_devices_cache"] = self.sound_devices_cache
         # open/save filepaths
         settings["files_last_path"] = self.job.files().last_path
         settings["files_out_last_path"] = self.job.files().out_folder
         settings["vst_last_path"] = self.job.vst_chain().last_path
+        settings["vst_pool"] = self.vst_pool
         settings["job_last_path"] = self.job.last_path
+        # playback chain render mode
+        settings["play_render_process"] = self.action_play_render_process.isChecked()
+        settings["play_playlist"] = self.action_play_playlist.isChecked()
+        settings["resume_batch"] = self.action_resume_batch.isChecked()
+        settings["buffer_auto"] = self.action_buffer_auto.isChecked()
+        settings["play_render_ahead_sec"] = self.play_chain_process.render_ahead
+        settings["cover_max_size"] = self.cover_max_size
+        settings["worker_pipeline_depth"] = self.worker_pipeline_depth
+        settings["worker_chain_stages"] = self.worker_chain_stages
+        settings["prefix_cache"] = self.prefix_cache
+        settings["metrics"] = self.metrics
+        settings["batch_trace_file"] = self.batch_trace_file
+        settings["split_long_files"] = self.split_long_files
+        settings["memory_budget"] = self.memory_budget
+        settings["dedup_inputs"] = self.dedup_inputs
+        settings["watchdog"] = self.watchdog
+        settings["cpu_policy"] = self.cpu_policy
         # save all settings
         self.ui_settings.save(**settings)
 
@@ -271,10 +395,34 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         # self.anim.scene.setBackgroundBrush(self.palette().color(QtGui.QPalette.Background))
         # self.anim_2.scene.setBackgroundBrush(self.palette().color(QtGui.QPalette.Background))
 
+    def _sound_devices_scan(self):
+        """ Query the audio devices list, runs in the UI thread """
+        import sounddevice
+        devices = sounddevice.query_devices()
+        devices_str = str(devices).split('\n')
+        items = [ [devices_str[i], devices[i]['name']] for i in range(len(devices)) if devices[i]['max_output_channels'] > 0 ]
+        items += [ [d, None] for d in devices_str if 'Output' in d ]
+        # unload sonddevice lib for future use in another thread
+        terminate_sounddevice(sounddevice)
+        self.sound_devices_signal.emit(items)
+
+    def _sound_devices_update(self, items):
+        combo = self.combo_box_sound_device
+        index = combo.currentIndex() if combo.count() else combo.last_used_index
+        combo.clear()
+        for text, name in items:
+            combo.addItem(text, userData=name)
+        combo.setCurrentIndex(min(index, combo.count() - 1))
+        self.sound_devices_cache = items
+
     def _dock_window_lock_changed(self, arg):
         self.dock_window_location = arg
 
     def _put_start_message(self):
+        # the used modules versions are imported in the UI thread
+        self.nqueue.put('start_message')
+
+    def _start_message(self):
 
         import neil_vst
         import neil_vst_gui.tag_write as tag_write
@@ -282,7 +430,7 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         import sounddevice
         import numpy
 
-        self._start_msg = [
+        start_msg = [
             'VST2.4 Host/Plugins chain worker GUI build %s.' % __version__,
             '',
             'Used:',
@@ -304,8 +452,7 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
             'Wait start the working ...\n' ]
         # unload sonddevice lib for future use in another thread
         terminate_sounddevice(sounddevice)
-
-        self.nqueue.put('start_message')
+        return start_msg
 
     # -------------------------------------------------------------------------
 
@@ -318,10 +465,18 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         )
         if not json_file:
             return
+        # the plugins are loaded in the background, the job are changed at the end
+        self._task_start(
+            "JOB load '%s'" % os.path.basename(json_file),
+            lambda task: self.job.load_prepare(json_file, task),
+            self._job_open_apply
+        )
 
+    def _job_open_apply(self, prepared):
+        json_file = prepared[0]
         try:
             # load job settings
-            self.job.load(json_file)
+            self.job.load_apply(prepared)
             #
             self._files_table_update(self.job.files().filelist)
             self.line_edit_out_folder.setText(self.job.files().out_folder)
@@ -365,17 +520,19 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         self._job_update_dump(json_file)
 
     def _job_update_dump(self, json_file=None):
-        try:
-            self.job.update(
-                normilize_params=self._normilize_settings(),
-                metadata=self._get_metadata(),
-                filepath=json_file
-            )
+        # the GUI values are taken now, the plugins parameters in the background
+        normilize_params = self._normilize_settings()
+        metadata = self._get_metadata()
+
+        def saved(settings):
             self.logger.info("JOB saved to - %s [ SUCCESS ], set DEBUG level for details" % json_file)
-            self.logger.debug("out_folder - %s, normilize_params - %s, vst_plugins_chain - %s, metadata - %s, filepath - %s" % (self.line_edit_out_folder.text(), str(self._normilize_settings()), [p.name for p in self.job.vst_chain().plugins_list], self._get_metadata(), json_file))
-        except Exception as e:
-            self.logger.error("JOB save to - %s  [ ERROR ], set DEBUG level for details" % json_file)
-            self.logger.debug(str(e))
+            self.logger.debug("out_folder - %s, normilize_params - %s, vst_plugins_chain - %s, metadata - %s, filepath - %s" % (settings["out_folder"], str(normilize_params), list(settings["plugins_list"].keys()), metadata, json_file))
+
+        self._task_start(
+            "JOB save",
+            lambda task: self.job.update(normilize_params=normilize_params, metadata=metadata, filepath=json_file, task=task),
+            saved
+        )
 
     # -------------------------------------------------------------------------
 
@@ -396,7 +553,7 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
             self.table_widget_files.removeRow(0)
 
     def _files_table_update(self, filelist):
-        import soundfile
+        from neil_vst_gui.audio_map import audio_info
 
         self._files_table_clear()
 
@@ -413,7 +570,7 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
             self.table_widget_files.setItem(self.table_widget_files.rowCount()-1, 1, item)
             # description
             chs = ["Mono", "Stereo", "", "4 CH"]
-            load_file = soundfile.SoundFile(f, mode='r', closefd=True)
+            load_file = audio_info(f)
             decs_text = "%s kHz  %s  %s" % (load_file.samplerate/1000, chs[load_file.channels-1], load_file.subtype)
             item = QtWidgets.QTableWidgetItem(decs_text)
             item.setTextAlignment(QtCore.Qt.AlignHCenter)
@@ -445,17 +602,48 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         self.button_play_stop.setEnabled(True)
         self.table_widget_files.setEnabled(False)
 
+        # playlist are played only by the render process chain
+        if self.action_play_render_process.isChecked() or self.action_play_playlist.isChecked():
+            self.play_chain = self.play_chain_process
+        else:
+            self.play_chain = self.play_chain_thread
+
         self.play_start_pos = self.wave_widget.get_play_position()
         fileindex = self.table_widget_files.currentRow()
-        self.play_start_thread(self.play_start_pos, fileindex)
-
-    def play_start_thread(self, position=0, fileindex=-1):
-        self.play_thread = threading.Thread(target=self.play_start, args=(position,fileindex,))
+        # the batch workers give the cores to the playback
+        self.main_worker.throttle(True)
+        if self.play_chain is self.play_chain_process:
+            self.play_parameters_timer.start()
+        self.play_start_thread(self.play_start_pos, fileindex, self._play_playlist(fileindex))
+
+    def _play_playlist(self, fileindex):
+        """ Files to play after the current - selected rows or all next files """
+        if not self.action_play_playlist.isChecked() or fileindex < 0:
+            return []
+        filelist = self.job.files().filelist
+        rows = sorted(set(i.row() for i in self.table_widget_files.selectedIndexes()))
+        rows = [ r for r in rows if r > fileindex ]
+        if not len(rows):
+            rows = range(fileindex + 1, len(filelist))
+        return [ filelist[r] for r in rows if r < len(filelist) ]
+
+    def play_start_thread(self, position=0, fileindex=-1, playlist=()):
+        self.play_thread = threading.Thread(target=self.play_start, args=(position,fileindex,playlist,))
         self.play_thread.daemon = True  # thread dies when main thread exits.
         self.play_thread.start()
 
-    def play_start(self, position=0, fileindex=-1):
+    def play_start(self, position=0, fileindex=-1, playlist=()):
         try:
+            if self.play_chain is self.play_chain_process:
+                self.play_chain.start(
+                    filename=self.job.files().filelist[fileindex],
+                    audio_device=self.combo_box_sound_device.currentData(),
+                    channels=2,
+                    plugins_list=self.job.plugins_settings(),
+                    start=position,
+                    playlist=playlist
+                )
+                return
             self.play_chain.start(
                 filename=self.job.files().filelist[fileindex],
                 audio_device=self.combo_box_sound_device.currentData(),
@@ -474,7 +662,26 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
     def play_stop_click(self):
         self.play_chain.stop()
 
+    def _play_parameters_update(self):
+        """ Send the parameters of the plugins with the open editor, the other
+            plugins parameters are not changed and are not read
+        """
+        if self.play_chain is not self.play_chain_process or not self.play_chain_process.is_active():
+            return
+        editors = [ w.plugin for w in self.findChildren(VSTPluginWindow) if w.plugin is not None and w.isVisible() ]
+        if not len(editors):
+            return
+        vst_chain = self.job.vst_chain()
+        keys, edited = [], {}
+        for index, plugin in enumerate(vst_chain.plugins()):
+            keys.append("%s (%d)" % (plugin.name, index))
+            if any(plugin is p for p in editors):
+                edited[keys[-1]] = vst_chain.parse_plugin_parameters(plugin)
+        self.play_chain_process.parameters_update(keys, edited)
+
     def play_stop_slot(self):
+        self.play_parameters_timer.stop()
+        self.main_worker.throttle(False)
         self.button_play_start.setEnabled(True)
         self.button_play_stop.setEnabled(False)
         self.table_widget_files.setEnabled(True)
@@ -487,6 +694,11 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         self.wave_widget.set_wave_file(self.job.files().filelist[row])
         self.wave_widget.set_play_position(0)
 
+    def play_file_changed(self, filename):
+        row = self.job.files().filelist.index(filename)
+        self.table_widget_files.setCurrentCell(row, 0)
+        self.play_selected(row, 0)
+
     def play_progress_update(self, procent_value):
         self.wave_widget.set_play_position(procent_value)
 
@@ -644,15 +856,26 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         while True:
             item = self.nqueue.get()
             with threading.Lock():
+                if item == 'sound_devices':
+                    try:
+                        self._sound_devices_scan()
+                    except Exception as e:
+                        self.logger.error("Audio devices scan error - %s" % str(e))
                 if item == 'start_message':
                     import random
-                    for m in self._start_msg:
+                    for m in self._start_message():
                         self.logger.info(m)
                         sleep(random.uniform(0.1, 0.2))
                 if item == 'run':
                     start = time()
-                    while any(w.is_alive() for w in self.main_worker.processes):
+                    status_time = 0
+                    while self.main_worker.is_active():
+                        # the workers memory to the status bar
+                        if (time() - status_time) > 1.0:
+                            self.memory_signal.emit(self.main_worker.memory_status())
+                            status_time = time()
                         sleep(0.01)
+                    self.memory_signal.emit("")
                     if not self.main_worker.terminate_work:
                         import datetime
                         sleep(0.5)
@@ -660,6 +883,8 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
                         self.ready_signal.emit()
                 if item == 'play':
                     self._play_start()
+                if item == 'buffer_tune':
+                    self._buffer_tune()
 
             self.nqueue.task_done()
 
@@ -673,13 +898,6 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         self.button_stop_work.setEnabled(True)
         self.files_frame.setEnabled(False)
         self.vst_frame.setEnabled(False)
-        # block until all tasks are done
-        self.nqueue.join()
-        # update all job parameters
-        self.job.update(
-            normilize_params=self._normilize_settings(),
-            metadata=self._get_metadata()
-        )
 
         try:
             vst_buffer_size = int(self.line_edit_buffer_size_bytes.text())
@@ -691,21 +909,145 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
             )
             vst_buffer_size = 1024
 
+        self._metrics_start()
+        # the GUI values are taken now, the job update and the workers start are in the background
+        kwargs = dict(
+            normilize_params=self._normilize_settings(),
+            metadata=self._get_metadata(),
+            meas=("MEAS" in sender_name.text()),
+            vst_buffer_size=vst_buffer_size,
+            buffer_auto=self.action_buffer_auto.isChecked(),
+            resume=self.action_resume_batch.isChecked()
+        )
+        self._task_start(
+            "START",
+            lambda task: self._work_start(task, **kwargs),
+            # wait while all processes are done
+            lambda _: self.nqueue.put('run')
+        )
+
+    def _work_start(self, task, normilize_params, metadata, meas, vst_buffer_size, buffer_auto, resume):
+        # wait until all UI thread tasks are done
+        while self.nqueue.unfinished_tasks:
+            task.check()
+            sleep(0.05)
+        # update all job parameters
+        settings = self.job.update(normilize_params=normilize_params, metadata=metadata, task=task)
+        # the fastest size of the chain from the earlier tune
+        if buffer_auto:
+            vst_buffer_size = self._buffer_size_tuned(vst_buffer_size, settings["plugins_list"])
+        task.check()
         # start the work
         self.main_worker.start(
             pipe=self.child_pipe,
             job=self.job,
-            meas=("MEAS" in sender_name.text()),
+            meas=meas,
             vst_buffer_size=vst_buffer_size,
-            log_level=self.workers_logging_level
+            log_level=self.workers_logging_level,
+            cover_max_size=self.cover_max_size,
+            pipeline_depth=self.worker_pipeline_depth,
+            chain_stages=self.worker_chain_stages,
+            prefix_cache=self.prefix_cache,
+            split=self.split_long_files,
+            memory=self.memory_budget,
+            resume=resume,
+            trace_file=self.batch_trace_file or None,
+            dedup=self.dedup_inputs,
+            watchdog=self.watchdog,
+            cpu_policy=self.cpu_policy
         )
+        # the STOP while the workers start
+        if task.cancelled.is_set():
+            self.main_worker.stop()
+            task.check()
+
+    def _buffer_tune_click(self):
+        filelist = self.job.files().filelist
+        if not len(filelist) or not len(self.job.vst_chain().plugins_list):
+            self.logger.warning("Buffer tune needs the files and the VST chain")
+            return
+        row = self.table_widget_files.currentRow()
+        self.buffer_tune_file = filelist[row if 0 <= row < len(filelist) else 0]
 
-        # wait while all processes are done
-        self.nqueue.put('run')
+        def tune(settings):
+            self.buffer_tune_settings = settings
+            self.nqueue.put('buffer_tune')
+
+        self._task_start("BUFFER TUNE", lambda task: {"plugins_list": self.job.plugins_settings(task)}, tune)
+
+    def _buffer_tune(self):
+        from neil_vst_gui.buffer_tune import tune_buffer_size, BufferSizeStore
+        self.logger.info("[ BUFFER TUNE ] - %s" % os.path.basename(self.buffer_tune_file))
+        try:
+            best, _ = tune_buffer_size(self.buffer_tune_settings, self.buffer_tune_file, self.logger, store=BufferSizeStore())
+            self.buffer_size_signal.emit(best)
+        except Exception as e:
+            self.logger.error("Buffer tune error - %s" % str(e))
+
+    def _buffer_size_tuned(self, vst_buffer_size, plugins_list):
+        from neil_vst_gui.buffer_tune import chain_fingerprint, BufferSizeStore
+        tuned = BufferSizeStore().get(chain_fingerprint(plugins_list))
+        if tuned is None or tuned == vst_buffer_size:
+            return vst_buffer_size
+        self.logger.info("VST buffer size of the tuned chain - %d" % tuned)
+        self.buffer_size_signal.emit(tuned)
+        return tuned
+
+    def _metrics_start(self):
+        if self.metrics_server is not None:
+            return
+        from neil_vst_gui.metrics import MetricsServer
+        try:
+            self.metrics_server = MetricsServer.from_settings(self.main_worker, self.metrics, self.logger)
+            if self.metrics_server is not None:
+                self.metrics_server.start()
+        except OSError as e:
+            self.metrics_server = None
+            self.logger.warning("Metrics endpoint are not started - %s" % str(e))
+
+    # -------------------------------------------------------------------------
+
+    def _task_start(self, name, target, apply=None):
+        """ Run 'target(task)' in the background task with the progress in
+            the status bar, 'apply(result)' are called in the GUI thread.
+            The STOP button cancels the task.
+        """
+        from neil_vst_gui.tasks import BackgroundTask
+
+        if self.task is not None:
+            self.logger.warning("%s are running, wait or STOP it" % self.task.name)
+            return None
+        self.files_frame.setEnabled(False)
+        self.vst_frame.setEnabled(False)
+        self.button_start_work.setEnabled(False)
+        self.button_measurment.setEnabled(False)
+        self.button_stop_work.setEnabled(True)
+        self.task_apply = apply
+        self.task = BackgroundTask(name, target, self.memory_signal.emit, self.task_done_signal.emit)
+        return self.task.start()
+
+    def _task_done(self, result, error):
+        from neil_vst_gui.tasks import TaskCancelled
+
+        task, apply = self.task, self.task_apply
+        self.task, self.task_apply = None, None
+        self.memory_signal.emit("")
+        if isinstance(error, TaskCancelled):
+            self.logger.warning("%s [ CANCELLED ]" % task.name)
+        elif error is not None:
+            self.logger.error("%s [ ERROR ] - %s" % (task.name, str(error)))
+        elif apply is not None:
+            apply(result)
+        if not self.main_worker.is_active():
+            self.end_work()
 
     def stop_work_click(self):
         if not self.button_stop_work.isEnabled():
             return
+        if self.task is not None:
+            # the task ends at its next step, the done slot restores the buttons
+            self.task.cancel()
+            return
         self.main_worker.stop()
         self.logger.warning("[TERMINATED]",)
         self.end_work()
@@ -748,7 +1090,8 @@ class neil_vst_gui_window(QtWidgets.QMainWindow):
         self.logger.setLevel(levels[level_index])
         self.handler.setLevel(levels[level_index])
         self.workers_logging_level = levels[level_index]
-        self.play_chain.log_level = levels[level_index]
+        self.play_chain_thread.log_level = levels[level_index]
+        self.play_chain_process.log_level = levels[level_index]
 
     def _mt_update_log(self, text):
         """ Add text to the lineedit box. """
@@ -801,6 +1144,8 @@ def main():
     QtWidgets.QApplication.setStyle(QtWidgets.QStyleFactory.create('Fusion'))
     # QtWidgets.QApplication.setStyle(QtWidgets.QStyleFactory.create('Cleanlooks'))
     ex = neil_vst_gui_window()
+    # the first event loop iteration - the window are on the screen
+    QtCore.QTimer.singleShot(0, lambda: (startup_profile.mark("first event loop"), startup_profile.print_report(ex.logger)))
     sys.exit(app.exec_())
 
 
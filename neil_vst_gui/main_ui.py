@@ -0,0 +1,1109 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'main.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(986, 792)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Maximum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
+        MainWindow.setSizePolicy(sizePolicy)
+        MainWindow.setMinimumSize(QtCore.QSize(0, 0))
+        MainWindow.setMaximumSize(QtCore.QSize(65535, 65535))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setKerning(True)
+        font.setStyleStrategy(QtGui.QFont.PreferAntialias)
+        MainWindow.setFont(font)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap("main.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        MainWindow.setWindowIcon(icon)
+        MainWindow.setWindowOpacity(1.0)
+        MainWindow.setAutoFillBackground(False)
+        MainWindow.setStyleSheet("")
+        MainWindow.setToolButtonStyle(QtCore.Qt.ToolButtonFollowStyle)
+        MainWindow.setAnimated(True)
+        MainWindow.setDocumentMode(True)
+        MainWindow.setTabShape(QtWidgets.QTabWidget.Triangular)
+        MainWindow.setDockOptions(QtWidgets.QMainWindow.AllowNestedDocks|QtWidgets.QMainWindow.AllowTabbedDocks|QtWidgets.QMainWindow.AnimatedDocks|QtWidgets.QMainWindow.ForceTabbedDocks|QtWidgets.QMainWindow.VerticalTabs)
+        MainWindow.setUnifiedTitleAndToolBarOnMac(True)
+        self.centralWidget = QtWidgets.QWidget(MainWindow)
+        self.centralWidget.setObjectName("centralWidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.centralWidget)
+        self.gridLayout.setContentsMargins(10, 5, 10, 5)
+        self.gridLayout.setHorizontalSpacing(5)
+        self.gridLayout.setVerticalSpacing(2)
+        self.gridLayout.setObjectName("gridLayout")
+        self.line_10 = QtWidgets.QFrame(self.centralWidget)
+        self.line_10.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_10.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_10.setObjectName("line_10")
+        self.gridLayout.addWidget(self.line_10, 1, 0, 1, 1)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setContentsMargins(5, -1, 5, -1)
+        self.horizontalLayout_2.setSpacing(5)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.button_measurment = QtWidgets.QPushButton(self.centralWidget)
+        self.button_measurment.setMinimumSize(QtCore.QSize(75, 25))
+        self.button_measurment.setMaximumSize(QtCore.QSize(75, 25))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_measurment.setFont(font)
+        self.button_measurment.setAutoDefault(False)
+        self.button_measurment.setDefault(False)
+        self.button_measurment.setFlat(False)
+        self.button_measurment.setObjectName("button_measurment")
+        self.horizontalLayout_2.addWidget(self.button_measurment)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem)
+        self.button_start_work = QtWidgets.QPushButton(self.centralWidget)
+        self.button_start_work.setEnabled(True)
+        self.button_start_work.setMinimumSize(QtCore.QSize(75, 25))
+        self.button_start_work.setMaximumSize(QtCore.QSize(75, 25))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_start_work.setFont(font)
+        self.button_start_work.setAutoDefault(False)
+        self.button_start_work.setDefault(False)
+        self.button_start_work.setFlat(False)
+        self.button_start_work.setObjectName("button_start_work")
+        self.horizontalLayout_2.addWidget(self.button_start_work)
+        self.line_9 = QtWidgets.QFrame(self.centralWidget)
+        self.line_9.setMaximumSize(QtCore.QSize(16777215, 15))
+        self.line_9.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_9.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_9.setObjectName("line_9")
+        self.horizontalLayout_2.addWidget(self.line_9)
+        self.button_stop_work = QtWidgets.QPushButton(self.centralWidget)
+        self.button_stop_work.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.button_stop_work.sizePolicy().hasHeightForWidth())
+        self.button_stop_work.setSizePolicy(sizePolicy)
+        self.button_stop_work.setMinimumSize(QtCore.QSize(75, 25))
+        self.button_stop_work.setMaximumSize(QtCore.QSize(75, 25))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_stop_work.setFont(font)
+        self.button_stop_work.setAutoFillBackground(False)
+        self.button_stop_work.setAutoExclusive(False)
+        self.button_stop_work.setAutoDefault(False)
+        self.button_stop_work.setDefault(False)
+        self.button_stop_work.setFlat(False)
+        self.button_stop_work.setObjectName("button_stop_work")
+        self.horizontalLayout_2.addWidget(self.button_stop_work)
+        self.gridLayout.addLayout(self.horizontalLayout_2, 2, 0, 1, 1)
+        self.splitter = QtWidgets.QSplitter(self.centralWidget)
+        self.splitter.setOrientation(QtCore.Qt.Vertical)
+        self.splitter.setObjectName("splitter")
+        self.files_frame = QtWidgets.QFrame(self.splitter)
+        self.files_frame.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.files_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.files_frame.setObjectName("files_frame")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.files_frame)
+        self.verticalLayout_2.setContentsMargins(0, 5, 0, 8)
+        self.verticalLayout_2.setSpacing(2)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_9.setContentsMargins(0, -1, 0, 0)
+        self.horizontalLayout_9.setSpacing(4)
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
+        self.button_play_start = QtWidgets.QPushButton(self.files_frame)
+        self.button_play_start.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.button_play_start.sizePolicy().hasHeightForWidth())
+        self.button_play_start.setSizePolicy(sizePolicy)
+        self.button_play_start.setMinimumSize(QtCore.QSize(0, 0))
+        self.button_play_start.setMaximumSize(QtCore.QSize(60, 25))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_play_start.setFont(font)
+        self.button_play_start.setAutoFillBackground(False)
+        self.button_play_start.setStyleSheet("")
+        self.button_play_start.setText("")
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(":/buttons/res/start_btn.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.button_play_start.setIcon(icon1)
+        self.button_play_start.setAutoExclusive(False)
+        self.button_play_start.setAutoDefault(False)
+        self.button_play_start.setDefault(False)
+        self.button_play_start.setFlat(True)
+        self.button_play_start.setObjectName("button_play_start")
+        self.horizontalLayout_9.addWidget(self.button_play_start)
+        self.button_play_stop = QtWidgets.QPushButton(self.files_frame)
+        self.button_play_stop.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.button_play_stop.sizePolicy().hasHeightForWidth())
+        self.button_play_stop.setSizePolicy(sizePolicy)
+        self.button_play_stop.setMinimumSize(QtCore.QSize(0, 0))
+        self.button_play_stop.setMaximumSize(QtCore.QSize(60, 25))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_play_stop.setFont(font)
+        self.button_play_stop.setAutoFillBackground(False)
+        self.button_play_stop.setStyleSheet("")
+        self.button_play_stop.setText("")
+        icon2 = QtGui.QIcon()
+        icon2.addPixmap(QtGui.QPixmap(":/buttons/res/stop_btn.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.button_play_stop.setIcon(icon2)
+        self.button_play_stop.setAutoExclusive(False)
+        self.button_play_stop.setAutoDefault(False)
+        self.button_play_stop.setDefault(False)
+        self.button_play_stop.setFlat(True)
+        self.button_play_stop.setObjectName("button_play_stop")
+        self.horizontalLayout_9.addWidget(self.button_play_stop)
+        spacerItem1 = QtWidgets.QSpacerItem(100, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_9.addItem(spacerItem1)
+        self.combo_box_sound_device = QtWidgets.QComboBox(self.files_frame)
+        self.combo_box_sound_device.setMinimumSize(QtCore.QSize(250, 23))
+        self.combo_box_sound_device.setMaximumSize(QtCore.QSize(250, 23))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.combo_box_sound_device.setFont(font)
+        self.combo_box_sound_device.setFrame(True)
+        self.combo_box_sound_device.setObjectName("combo_box_sound_device")
+        self.combo_box_sound_device.addItem("")
+        self.horizontalLayout_9.addWidget(self.combo_box_sound_device)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_9)
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_5.setContentsMargins(0, -1, 0, -1)
+        self.horizontalLayout_5.setSpacing(6)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.verticalLayout_2.addLayout(self.horizontalLayout_5)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 6, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.verticalLayout_2.addItem(spacerItem2)
+        self.label_6 = QtWidgets.QLabel(self.files_frame)
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_6.setFont(font)
+        self.label_6.setObjectName("label_6")
+        self.verticalLayout_2.addWidget(self.label_6)
+        self.line_5 = QtWidgets.QFrame(self.files_frame)
+        self.line_5.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_5.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_5.setObjectName("line_5")
+        self.verticalLayout_2.addWidget(self.line_5)
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_5.setContentsMargins(4, -1, 4, -1)
+        self.verticalLayout_5.setSpacing(3)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.table_widget_files = QtWidgets.QTableWidget(self.files_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.table_widget_files.sizePolicy().hasHeightForWidth())
+        self.table_widget_files.setSizePolicy(sizePolicy)
+        self.table_widget_files.setMinimumSize(QtCore.QSize(0, 100))
+        self.table_widget_files.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.table_widget_files.setFont(font)
+        self.table_widget_files.setStyleSheet("")
+        self.table_widget_files.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.table_widget_files.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.table_widget_files.setProperty("showDropIndicator", False)
+        self.table_widget_files.setDragEnabled(False)
+        self.table_widget_files.setDragDropOverwriteMode(False)
+        self.table_widget_files.setDragDropMode(QtWidgets.QAbstractItemView.NoDragDrop)
+        self.table_widget_files.setDefaultDropAction(QtCore.Qt.IgnoreAction)
+        self.table_widget_files.setAlternatingRowColors(False)
+        self.table_widget_files.setSelectionMode(QtWidgets.QAbstractItemView.ContiguousSelection)
+        self.table_widget_files.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table_widget_files.setGridStyle(QtCore.Qt.DashLine)
+        self.table_widget_files.setRowCount(0)
+        self.table_widget_files.setObjectName("table_widget_files")
+        self.table_widget_files.setColumnCount(3)
+        item = QtWidgets.QTableWidgetItem()
+        item.setTextAlignment(QtCore.Qt.AlignHCenter|QtCore.Qt.AlignVCenter|QtCore.Qt.AlignCenter)
+        self.table_widget_files.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        item.setTextAlignment(QtCore.Qt.AlignHCenter|QtCore.Qt.AlignVCenter|QtCore.Qt.AlignCenter)
+        self.table_widget_files.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        item.setTextAlignment(QtCore.Qt.AlignHCenter|QtCore.Qt.AlignVCenter|QtCore.Qt.AlignCenter)
+        self.table_widget_files.setHorizontalHeaderItem(2, item)
+        self.table_widget_files.horizontalHeader().setVisible(True)
+        self.table_widget_files.horizontalHeader().setCascadingSectionResizes(True)
+        self.table_widget_files.horizontalHeader().setDefaultSectionSize(10)
+        self.table_widget_files.horizontalHeader().setHighlightSections(True)
+        self.table_widget_files.horizontalHeader().setMinimumSectionSize(10)
+        self.table_widget_files.horizontalHeader().setSortIndicatorShown(False)
+        self.table_widget_files.horizontalHeader().setStretchLastSection(False)
+        self.table_widget_files.verticalHeader().setVisible(True)
+        self.table_widget_files.verticalHeader().setCascadingSectionResizes(False)
+        self.table_widget_files.verticalHeader().setDefaultSectionSize(10)
+        self.table_widget_files.verticalHeader().setHighlightSections(True)
+        self.table_widget_files.verticalHeader().setMinimumSectionSize(10)
+        self.table_widget_files.verticalHeader().setSortIndicatorShown(False)
+        self.table_widget_files.verticalHeader().setStretchLastSection(False)
+        self.verticalLayout_5.addWidget(self.table_widget_files)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setSpacing(5)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.button_add_files = QtWidgets.QPushButton(self.files_frame)
+        self.button_add_files.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.button_add_files.sizePolicy().hasHeightForWidth())
+        self.button_add_files.setSizePolicy(sizePolicy)
+        self.button_add_files.setMinimumSize(QtCore.QSize(50, 23))
+        self.button_add_files.setMaximumSize(QtCore.QSize(50, 23))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_add_files.setFont(font)
+        self.button_add_files.setAutoFillBackground(False)
+        self.button_add_files.setAutoExclusive(False)
+        self.button_add_files.setAutoDefault(False)
+        self.button_add_files.setDefault(True)
+        self.button_add_files.setFlat(False)
+        self.button_add_files.setObjectName("button_add_files")
+        self.horizontalLayout.addWidget(self.button_add_files)
+        self.button_remove_all_files = QtWidgets.QPushButton(self.files_frame)
+        self.button_remove_all_files.setEnabled(True)
+        self.button_remove_all_files.setMinimumSize(QtCore.QSize(50, 23))
+        self.button_remove_all_files.setMaximumSize(QtCore.QSize(50, 23))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_remove_all_files.setFont(font)
+        self.button_remove_all_files.setAutoFillBackground(False)
+        self.button_remove_all_files.setStyleSheet("background-color: rgba(64, 0, 0, 192);\n"
+"color: rgb(255, 255, 255);\n"
+"")
+        self.button_remove_all_files.setAutoDefault(False)
+        self.button_remove_all_files.setDefault(True)
+        self.button_remove_all_files.setFlat(False)
+        self.button_remove_all_files.setObjectName("button_remove_all_files")
+        self.horizontalLayout.addWidget(self.button_remove_all_files)
+        spacerItem3 = QtWidgets.QSpacerItem(0, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem3)
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setContentsMargins(0, -1, 0, -1)
+        self.horizontalLayout_3.setSpacing(5)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.label_7 = QtWidgets.QLabel(self.files_frame)
+        self.label_7.setMinimumSize(QtCore.QSize(0, 20))
+        self.label_7.setMaximumSize(QtCore.QSize(16777215, 20))
+        font = QtGui.QFont()
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.label_7.setFont(font)
+        self.label_7.setObjectName("label_7")
+        self.horizontalLayout_3.addWidget(self.label_7)
+        self.line_edit_out_folder = QtWidgets.QLineEdit(self.files_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_out_folder.sizePolicy().hasHeightForWidth())
+        self.line_edit_out_folder.setSizePolicy(sizePolicy)
+        self.line_edit_out_folder.setMinimumSize(QtCore.QSize(225, 20))
+        self.line_edit_out_folder.setMaximumSize(QtCore.QSize(16777215, 20))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_out_folder.setFont(font)
+        self.line_edit_out_folder.setFrame(True)
+        self.line_edit_out_folder.setObjectName("line_edit_out_folder")
+        self.horizontalLayout_3.addWidget(self.line_edit_out_folder)
+        self.button_out_folder = QtWidgets.QPushButton(self.files_frame)
+        self.button_out_folder.setMinimumSize(QtCore.QSize(30, 23))
+        self.button_out_folder.setMaximumSize(QtCore.QSize(30, 23))
+        self.button_out_folder.setDefault(True)
+        self.button_out_folder.setObjectName("button_out_folder")
+        self.horizontalLayout_3.addWidget(self.button_out_folder)
+        self.push_button_open_out_folder = QtWidgets.QPushButton(self.files_frame)
+        self.push_button_open_out_folder.setMinimumSize(QtCore.QSize(50, 23))
+        self.push_button_open_out_folder.setMaximumSize(QtCore.QSize(50, 23))
+        self.push_button_open_out_folder.setIconSize(QtCore.QSize(16, 16))
+        self.push_button_open_out_folder.setDefault(True)
+        self.push_button_open_out_folder.setObjectName("push_button_open_out_folder")
+        self.horizontalLayout_3.addWidget(self.push_button_open_out_folder)
+        self.horizontalLayout.addLayout(self.horizontalLayout_3)
+        self.verticalLayout_5.addLayout(self.horizontalLayout)
+        self.verticalLayout_2.addLayout(self.verticalLayout_5)
+        self.vst_frame = QtWidgets.QFrame(self.splitter)
+        self.vst_frame.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.vst_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.vst_frame.setObjectName("vst_frame")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.vst_frame)
+        self.verticalLayout_3.setContentsMargins(0, 0, 0, 13)
+        self.verticalLayout_3.setSpacing(2)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.label_32 = QtWidgets.QLabel(self.vst_frame)
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_32.setFont(font)
+        self.label_32.setObjectName("label_32")
+        self.verticalLayout_3.addWidget(self.label_32)
+        self.line_11 = QtWidgets.QFrame(self.vst_frame)
+        self.line_11.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_11.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_11.setObjectName("line_11")
+        self.verticalLayout_3.addWidget(self.line_11)
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_4.setContentsMargins(4, -1, 4, -1)
+        self.verticalLayout_4.setSpacing(3)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.gridLayout_6 = QtWidgets.QGridLayout()
+        self.gridLayout_6.setContentsMargins(-1, 2, -1, 4)
+        self.gridLayout_6.setSpacing(6)
+        self.gridLayout_6.setObjectName("gridLayout_6")
+        self.check_box_normalize_enable = QtWidgets.QCheckBox(self.vst_frame)
+        self.check_box_normalize_enable.setMinimumSize(QtCore.QSize(0, 0))
+        self.check_box_normalize_enable.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.check_box_normalize_enable.setFont(font)
+        self.check_box_normalize_enable.setText("")
+        self.check_box_normalize_enable.setChecked(False)
+        self.check_box_normalize_enable.setObjectName("check_box_normalize_enable")
+        self.gridLayout_6.addWidget(self.check_box_normalize_enable, 0, 0, 1, 1)
+        self.label_17 = QtWidgets.QLabel(self.vst_frame)
+        self.label_17.setMaximumSize(QtCore.QSize(16777215, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_17.setFont(font)
+        self.label_17.setObjectName("label_17")
+        self.gridLayout_6.addWidget(self.label_17, 0, 8, 1, 1)
+        self.label_18 = QtWidgets.QLabel(self.vst_frame)
+        self.label_18.setMaximumSize(QtCore.QSize(16777215, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.label_18.setFont(font)
+        self.label_18.setObjectName("label_18")
+        self.gridLayout_6.addWidget(self.label_18, 0, 4, 1, 1)
+        self.line_edit_normalize_rms_level = QtWidgets.QLineEdit(self.vst_frame)
+        self.line_edit_normalize_rms_level.setMinimumSize(QtCore.QSize(35, 0))
+        self.line_edit_normalize_rms_level.setMaximumSize(QtCore.QSize(35, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.line_edit_normalize_rms_level.setFont(font)
+        self.line_edit_normalize_rms_level.setObjectName("line_edit_normalize_rms_level")
+        self.gridLayout_6.addWidget(self.line_edit_normalize_rms_level, 0, 3, 1, 1)
+        self.label_19 = QtWidgets.QLabel(self.vst_frame)
+        self.label_19.setMaximumSize(QtCore.QSize(16777215, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_19.setFont(font)
+        self.label_19.setObjectName("label_19")
+        self.gridLayout_6.addWidget(self.label_19, 0, 1, 1, 1)
+        self.label_20 = QtWidgets.QLabel(self.vst_frame)
+        self.label_20.setMaximumSize(QtCore.QSize(16777215, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.label_20.setFont(font)
+        self.label_20.setObjectName("label_20")
+        self.gridLayout_6.addWidget(self.label_20, 0, 2, 1, 1)
+        self.line_edit_normalize_error_db = QtWidgets.QLineEdit(self.vst_frame)
+        self.line_edit_normalize_error_db.setMinimumSize(QtCore.QSize(35, 0))
+        self.line_edit_normalize_error_db.setMaximumSize(QtCore.QSize(35, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.line_edit_normalize_error_db.setFont(font)
+        self.line_edit_normalize_error_db.setObjectName("line_edit_normalize_error_db")
+        self.gridLayout_6.addWidget(self.line_edit_normalize_error_db, 0, 5, 1, 1)
+        self.line_edit_buffer_size_bytes = QtWidgets.QLineEdit(self.vst_frame)
+        self.line_edit_buffer_size_bytes.setMinimumSize(QtCore.QSize(50, 0))
+        self.line_edit_buffer_size_bytes.setMaximumSize(QtCore.QSize(50, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.line_edit_buffer_size_bytes.setFont(font)
+        self.line_edit_buffer_size_bytes.setAlignment(QtCore.Qt.AlignCenter)
+        self.line_edit_buffer_size_bytes.setObjectName("line_edit_buffer_size_bytes")
+        self.gridLayout_6.addWidget(self.line_edit_buffer_size_bytes, 0, 9, 1, 1)
+        self.line_6 = QtWidgets.QFrame(self.vst_frame)
+        self.line_6.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_6.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_6.setObjectName("line_6")
+        self.gridLayout_6.addWidget(self.line_6, 0, 7, 1, 1)
+        self.label_21 = QtWidgets.QLabel(self.vst_frame)
+        self.label_21.setMaximumSize(QtCore.QSize(16777215, 15))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.label_21.setFont(font)
+        self.label_21.setObjectName("label_21")
+        self.gridLayout_6.addWidget(self.label_21, 0, 10, 1, 1)
+        spacerItem4 = QtWidgets.QSpacerItem(40, 15, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout_6.addItem(spacerItem4, 0, 11, 1, 1)
+        self.verticalLayout_4.addLayout(self.gridLayout_6)
+        self.table_widget_processes = QtWidgets.QTableWidget(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.table_widget_processes.sizePolicy().hasHeightForWidth())
+        self.table_widget_processes.setSizePolicy(sizePolicy)
+        self.table_widget_processes.setMinimumSize(QtCore.QSize(0, 100))
+        self.table_widget_processes.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(8)
+        self.table_widget_processes.setFont(font)
+        self.table_widget_processes.setStyleSheet("")
+        self.table_widget_processes.setProperty("showDropIndicator", False)
+        self.table_widget_processes.setDragDropMode(QtWidgets.QAbstractItemView.InternalMove)
+        self.table_widget_processes.setDefaultDropAction(QtCore.Qt.MoveAction)
+        self.table_widget_processes.setAlternatingRowColors(False)
+        self.table_widget_processes.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.table_widget_processes.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table_widget_processes.setGridStyle(QtCore.Qt.DashLine)
+        self.table_widget_processes.setRowCount(0)
+        self.table_widget_processes.setColumnCount(1)
+        self.table_widget_processes.setObjectName("table_widget_processes")
+        item = QtWidgets.QTableWidgetItem()
+        item.setTextAlignment(QtCore.Qt.AlignHCenter|QtCore.Qt.AlignVCenter|QtCore.Qt.AlignCenter)
+        self.table_widget_processes.setHorizontalHeaderItem(0, item)
+        self.table_widget_processes.horizontalHeader().setVisible(False)
+        self.table_widget_processes.horizontalHeader().setCascadingSectionResizes(True)
+        self.table_widget_processes.horizontalHeader().setDefaultSectionSize(32)
+        self.table_widget_processes.horizontalHeader().setHighlightSections(True)
+        self.table_widget_processes.horizontalHeader().setMinimumSectionSize(32)
+        self.table_widget_processes.horizontalHeader().setSortIndicatorShown(True)
+        self.table_widget_processes.horizontalHeader().setStretchLastSection(True)
+        self.table_widget_processes.verticalHeader().setVisible(False)
+        self.table_widget_processes.verticalHeader().setCascadingSectionResizes(True)
+        self.table_widget_processes.verticalHeader().setDefaultSectionSize(10)
+        self.table_widget_processes.verticalHeader().setHighlightSections(True)
+        self.table_widget_processes.verticalHeader().setMinimumSectionSize(10)
+        self.table_widget_processes.verticalHeader().setSortIndicatorShown(True)
+        self.table_widget_processes.verticalHeader().setStretchLastSection(False)
+        self.verticalLayout_4.addWidget(self.table_widget_processes)
+        self.horizontalLayout_11 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_11.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_11.setSpacing(5)
+        self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        self.button_add_vst = QtWidgets.QPushButton(self.vst_frame)
+        self.button_add_vst.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.button_add_vst.sizePolicy().hasHeightForWidth())
+        self.button_add_vst.setSizePolicy(sizePolicy)
+        self.button_add_vst.setMinimumSize(QtCore.QSize(50, 23))
+        self.button_add_vst.setMaximumSize(QtCore.QSize(50, 23))
+        self.button_add_vst.setAutoDefault(False)
+        self.button_add_vst.setDefault(True)
+        self.button_add_vst.setFlat(False)
+        self.button_add_vst.setObjectName("button_add_vst")
+        self.horizontalLayout_11.addWidget(self.button_add_vst)
+        self.button_remove_selected_vst = QtWidgets.QPushButton(self.vst_frame)
+        self.button_remove_selected_vst.setEnabled(True)
+        self.button_remove_selected_vst.setMinimumSize(QtCore.QSize(50, 23))
+        self.button_remove_selected_vst.setMaximumSize(QtCore.QSize(50, 23))
+        self.button_remove_selected_vst.setAutoDefault(False)
+        self.button_remove_selected_vst.setDefault(True)
+        self.button_remove_selected_vst.setFlat(False)
+        self.button_remove_selected_vst.setObjectName("button_remove_selected_vst")
+        self.horizontalLayout_11.addWidget(self.button_remove_selected_vst)
+        self.button_remove_all_vst = QtWidgets.QPushButton(self.vst_frame)
+        self.button_remove_all_vst.setEnabled(True)
+        self.button_remove_all_vst.setMinimumSize(QtCore.QSize(50, 23))
+        self.button_remove_all_vst.setMaximumSize(QtCore.QSize(50, 23))
+        self.button_remove_all_vst.setStyleSheet("background-color: rgba(64, 0, 0, 192);\n"
+"color: rgb(255, 255, 255);\n"
+"")
+        self.button_remove_all_vst.setAutoDefault(False)
+        self.button_remove_all_vst.setDefault(True)
+        self.button_remove_all_vst.setFlat(False)
+        self.button_remove_all_vst.setObjectName("button_remove_all_vst")
+        self.horizontalLayout_11.addWidget(self.button_remove_all_vst)
+        self.line_12 = QtWidgets.QFrame(self.vst_frame)
+        self.line_12.setMaximumSize(QtCore.QSize(16777215, 15))
+        self.line_12.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_12.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_12.setObjectName("line_12")
+        self.horizontalLayout_11.addWidget(self.line_12)
+        self.button_vst_up_in_chain = QtWidgets.QPushButton(self.vst_frame)
+        self.button_vst_up_in_chain.setMinimumSize(QtCore.QSize(35, 23))
+        self.button_vst_up_in_chain.setMaximumSize(QtCore.QSize(35, 23))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.button_vst_up_in_chain.setFont(font)
+        self.button_vst_up_in_chain.setDefault(True)
+        self.button_vst_up_in_chain.setObjectName("button_vst_up_in_chain")
+        self.horizontalLayout_11.addWidget(self.button_vst_up_in_chain)
+        self.button_vst_down_in_chain = QtWidgets.QPushButton(self.vst_frame)
+        self.button_vst_down_in_chain.setMinimumSize(QtCore.QSize(35, 23))
+        self.button_vst_down_in_chain.setMaximumSize(QtCore.QSize(35, 23))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.button_vst_down_in_chain.setFont(font)
+        self.button_vst_down_in_chain.setDefault(True)
+        self.button_vst_down_in_chain.setObjectName("button_vst_down_in_chain")
+        self.horizontalLayout_11.addWidget(self.button_vst_down_in_chain)
+        self.line_13 = QtWidgets.QFrame(self.vst_frame)
+        self.line_13.setMaximumSize(QtCore.QSize(16777215, 15))
+        self.line_13.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_13.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_13.setObjectName("line_13")
+        self.horizontalLayout_11.addWidget(self.line_13)
+        spacerItem5 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_11.addItem(spacerItem5)
+        self.verticalLayout_4.addLayout(self.horizontalLayout_11)
+        self.verticalLayout_3.addLayout(self.verticalLayout_4)
+        spacerItem6 = QtWidgets.QSpacerItem(506, 8, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.verticalLayout_3.addItem(spacerItem6)
+        self.label_31 = QtWidgets.QLabel(self.vst_frame)
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setItalic(False)
+        font.setWeight(75)
+        self.label_31.setFont(font)
+        self.label_31.setObjectName("label_31")
+        self.verticalLayout_3.addWidget(self.label_31)
+        self.line_8 = QtWidgets.QFrame(self.vst_frame)
+        self.line_8.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line_8.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_8.setObjectName("line_8")
+        self.verticalLayout_3.addWidget(self.line_8)
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_8.setSizeConstraint(QtWidgets.QLayout.SetFixedSize)
+        self.horizontalLayout_8.setSpacing(6)
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        self.gridLayout_4 = QtWidgets.QGridLayout()
+        self.gridLayout_4.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
+        self.gridLayout_4.setContentsMargins(4, -1, 4, -1)
+        self.gridLayout_4.setSpacing(6)
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.label_22 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_22.sizePolicy().hasHeightForWidth())
+        self.label_22.setSizePolicy(sizePolicy)
+        self.label_22.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_22.setFont(font)
+        self.label_22.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_22.setObjectName("label_22")
+        self.gridLayout_4.addWidget(self.label_22, 4, 0, 1, 1)
+        self.label_23 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_23.sizePolicy().hasHeightForWidth())
+        self.label_23.setSizePolicy(sizePolicy)
+        self.label_23.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_23.setFont(font)
+        self.label_23.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_23.setObjectName("label_23")
+        self.gridLayout_4.addWidget(self.label_23, 5, 0, 1, 1)
+        self.label_24 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_24.sizePolicy().hasHeightForWidth())
+        self.label_24.setSizePolicy(sizePolicy)
+        self.label_24.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_24.setFont(font)
+        self.label_24.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_24.setObjectName("label_24")
+        self.gridLayout_4.addWidget(self.label_24, 1, 0, 1, 1)
+        self.label_25 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_25.sizePolicy().hasHeightForWidth())
+        self.label_25.setSizePolicy(sizePolicy)
+        self.label_25.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_25.setFont(font)
+        self.label_25.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_25.setObjectName("label_25")
+        self.gridLayout_4.addWidget(self.label_25, 3, 0, 1, 1)
+        self.label_26 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_26.sizePolicy().hasHeightForWidth())
+        self.label_26.setSizePolicy(sizePolicy)
+        self.label_26.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_26.setFont(font)
+        self.label_26.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_26.setObjectName("label_26")
+        self.gridLayout_4.addWidget(self.label_26, 2, 0, 1, 1)
+        self.line_edit_metadata_album_book = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_album_book.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_album_book.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_album_book.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_album_book.setFont(font)
+        self.line_edit_metadata_album_book.setObjectName("line_edit_metadata_album_book")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_album_book, 3, 1, 1, 1)
+        self.line_edit_metadata_sound_designer = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_sound_designer.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_sound_designer.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_sound_designer.setMinimumSize(QtCore.QSize(115, 0))
+        self.line_edit_metadata_sound_designer.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_sound_designer.setFont(font)
+        self.line_edit_metadata_sound_designer.setObjectName("line_edit_metadata_sound_designer")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_sound_designer, 2, 1, 1, 1)
+        self.label_27 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_27.sizePolicy().hasHeightForWidth())
+        self.label_27.setSizePolicy(sizePolicy)
+        self.label_27.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_27.setFont(font)
+        self.label_27.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_27.setObjectName("label_27")
+        self.gridLayout_4.addWidget(self.label_27, 0, 0, 1, 1)
+        self.line_edit_metadata_artist = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_artist.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_artist.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_artist.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_artist.setFont(font)
+        self.line_edit_metadata_artist.setObjectName("line_edit_metadata_artist")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_artist, 1, 1, 1, 1)
+        self.line_edit_metadata_author = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_author.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_author.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_author.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_author.setFont(font)
+        self.line_edit_metadata_author.setObjectName("line_edit_metadata_author")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_author, 0, 1, 1, 1)
+        self.line_edit_metadata_year = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_year.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_year.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_year.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_year.setFont(font)
+        self.line_edit_metadata_year.setObjectName("line_edit_metadata_year")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_year, 5, 1, 1, 1)
+        self.line_edit_metadata_genre = QtWidgets.QLineEdit(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.line_edit_metadata_genre.sizePolicy().hasHeightForWidth())
+        self.line_edit_metadata_genre.setSizePolicy(sizePolicy)
+        self.line_edit_metadata_genre.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_genre.setFont(font)
+        self.line_edit_metadata_genre.setObjectName("line_edit_metadata_genre")
+        self.gridLayout_4.addWidget(self.line_edit_metadata_genre, 4, 1, 1, 1)
+        self.horizontalLayout_8.addLayout(self.gridLayout_4)
+        self.gridLayout_7 = QtWidgets.QGridLayout()
+        self.gridLayout_7.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
+        self.gridLayout_7.setSpacing(6)
+        self.gridLayout_7.setObjectName("gridLayout_7")
+        self.label_28 = QtWidgets.QLabel(self.vst_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_28.sizePolicy().hasHeightForWidth())
+        self.label_28.setSizePolicy(sizePolicy)
+        self.label_28.setMaximumSize(QtCore.QSize(220, 20))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_28.setFont(font)
+        self.label_28.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_28.setAlignment(QtCore.Qt.AlignBottom|QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft)
+        self.label_28.setObjectName("label_28")
+        self.gridLayout_7.addWidget(self.label_28, 2, 1, 1, 1)
+        self.horizontalLayout_10 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_10.setSpacing(6)
+        self.horizontalLayout_10.setObjectName("horizontalLayout_10")
+        self.label_29 = QtWidgets.QLabel(self.vst_frame)
+        self.label_29.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.label_29.setFont(font)
+        self.label_29.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.label_29.setObjectName("label_29")
+        self.horizontalLayout_10.addWidget(self.label_29)
+        self.line_edit_metadata_image = QtWidgets.QLineEdit(self.vst_frame)
+        self.line_edit_metadata_image.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.line_edit_metadata_image.setFont(font)
+        self.line_edit_metadata_image.setObjectName("line_edit_metadata_image")
+        self.horizontalLayout_10.addWidget(self.line_edit_metadata_image)
+        self.tool_button_metadata_image = QtWidgets.QToolButton(self.vst_frame)
+        self.tool_button_metadata_image.setMaximumSize(QtCore.QSize(16777215, 18))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.tool_button_metadata_image.setFont(font)
+        self.tool_button_metadata_image.setObjectName("tool_button_metadata_image")
+        self.horizontalLayout_10.addWidget(self.tool_button_metadata_image)
+        self.gridLayout_7.addLayout(self.horizontalLayout_10, 4, 1, 1, 1)
+        self.text_edit_metadata_description = QtWidgets.QTextEdit(self.vst_frame)
+        self.text_edit_metadata_description.setMinimumSize(QtCore.QSize(0, 85))
+        self.text_edit_metadata_description.setMaximumSize(QtCore.QSize(220, 88))
+        font = QtGui.QFont()
+        font.setPointSize(7)
+        font.setBold(False)
+        font.setWeight(50)
+        self.text_edit_metadata_description.setFont(font)
+        self.text_edit_metadata_description.setObjectName("text_edit_metadata_description")
+        self.gridLayout_7.addWidget(self.text_edit_metadata_description, 3, 1, 1, 1)
+        self.horizontalLayout_8.addLayout(self.gridLayout_7)
+        self.label_metadata_image_show = QtWidgets.QLabel(self.vst_frame)
+        self.label_metadata_image_show.setMinimumSize(QtCore.QSize(100, 0))
+        self.label_metadata_image_show.setText("")
+        self.label_metadata_image_show.setObjectName("label_metadata_image_show")
+        self.horizontalLayout_8.addWidget(self.label_metadata_image_show)
+        self.verticalLayout_3.addLayout(self.horizontalLayout_8)
+        self.gridLayout.addWidget(self.splitter, 0, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralWidget)
+        self.menuBar = QtWidgets.QMenuBar(MainWindow)
+        self.menuBar.setGeometry(QtCore.QRect(0, 0, 986, 21))
+        self.menuBar.setAutoFillBackground(False)
+        self.menuBar.setStyleSheet("background-color: rgba(54, 64, 74, 240);\n"
+"color: rgb(255, 255, 255);")
+        self.menuBar.setObjectName("menuBar")
+        self.menuFile = QtWidgets.QMenu(self.menuBar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuVisible_style = QtWidgets.QMenu(self.menuFile)
+        self.menuVisible_style.setObjectName("menuVisible_style")
+        self.menuOptions = QtWidgets.QMenu(self.menuBar)
+        self.menuOptions.setObjectName("menuOptions")
+        MainWindow.setMenuBar(self.menuBar)
+        self.dockWidget = QtWidgets.QDockWidget(MainWindow)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.dockWidget.sizePolicy().hasHeightForWidth())
+        self.dockWidget.setSizePolicy(sizePolicy)
+        self.dockWidget.setMinimumSize(QtCore.QSize(297, 171))
+        self.dockWidget.setBaseSize(QtCore.QSize(0, 500))
+        self.dockWidget.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.dockWidget.setStyleSheet("")
+        self.dockWidget.setFloating(False)
+        self.dockWidget.setFeatures(QtWidgets.QDockWidget.AllDockWidgetFeatures)
+        self.dockWidget.setAllowedAreas(QtCore.Qt.AllDockWidgetAreas)
+        self.dockWidget.setObjectName("dockWidget")
+        self.dockWidgetContents = QtWidgets.QWidget()
+        self.dockWidgetContents.setObjectName("dockWidgetContents")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.dockWidgetContents)
+        self.gridLayout_3.setContentsMargins(5, 5, 5, 0)
+        self.gridLayout_3.setSpacing(0)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setContentsMargins(-1, -1, -1, 3)
+        self.verticalLayout.setSpacing(2)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.textBrowser = QtWidgets.QTextBrowser(self.dockWidgetContents)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.textBrowser.sizePolicy().hasHeightForWidth())
+        self.textBrowser.setSizePolicy(sizePolicy)
+        self.textBrowser.setMinimumSize(QtCore.QSize(0, 0))
+        self.textBrowser.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        font = QtGui.QFont()
+        font.setFamily("Calibri Light")
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setWeight(75)
+        self.textBrowser.setFont(font)
+        self.textBrowser.setMouseTracking(True)
+        self.textBrowser.setToolTip("")
+        self.textBrowser.setStyleSheet("background-image: url(:/text_browser/res/Untitled_000000.png);")
+        self.textBrowser.setLocale(QtCore.QLocale(QtCore.QLocale.English, QtCore.QLocale.UnitedStates))
+        self.textBrowser.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.textBrowser.setFrameShadow(QtWidgets.QFrame.Plain)
+        self.textBrowser.setLineWidth(1)
+        self.textBrowser.setMidLineWidth(0)
+        self.textBrowser.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.textBrowser.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
+        self.textBrowser.setReadOnly(True)
+        self.textBrowser.setOverwriteMode(False)
+        self.textBrowser.setPlaceholderText("")
+        self.textBrowser.setObjectName("textBrowser")
+        self.verticalLayout.addWidget(self.textBrowser)
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_7.setContentsMargins(5, -1, -1, -1)
+        self.horizontalLayout_7.setSpacing(9)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.label_3 = QtWidgets.QLabel(self.dockWidgetContents)
+        self.label_3.setMinimumSize(QtCore.QSize(0, 23))
+        self.label_3.setMaximumSize(QtCore.QSize(16777215, 23))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.label_3.setFont(font)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout_7.addWidget(self.label_3)
+        self.combo_box_logging_level = QtWidgets.QComboBox(self.dockWidgetContents)
+        self.combo_box_logging_level.setMinimumSize(QtCore.QSize(0, 23))
+        self.combo_box_logging_level.setMaximumSize(QtCore.QSize(16777215, 23))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(8)
+        font.setBold(True)
+        font.setWeight(75)
+        self.combo_box_logging_level.setFont(font)
+        self.combo_box_logging_level.setStyleSheet("")
+        self.combo_box_logging_level.setFrame(False)
+        self.combo_box_logging_level.setObjectName("combo_box_logging_level")
+        self.combo_box_logging_level.addItem("")
+        self.combo_box_logging_level.addItem("")
+        self.combo_box_logging_level.addItem("")
+        self.combo_box_logging_level.addItem("")
+        self.horizontalLayout_7.addWidget(self.combo_box_logging_level)
+        self.line_3 = QtWidgets.QFrame(self.dockWidgetContents)
+        self.line_3.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_3.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_3.setObjectName("line_3")
+        self.horizontalLayout_7.addWidget(self.line_3)
+        self.button_clear_log = QtWidgets.QPushButton(self.dockWidgetContents)
+        self.button_clear_log.setMinimumSize(QtCore.QSize(0, 23))
+        self.button_clear_log.setMaximumSize(QtCore.QSize(16777215, 23))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(8)
+        font.setBold(False)
+        font.setWeight(50)
+        self.button_clear_log.setFont(font)
+        self.button_clear_log.setDefault(False)
+        self.button_clear_log.setFlat(True)
+        self.button_clear_log.setObjectName("button_clear_log")
+        self.horizontalLayout_7.addWidget(self.button_clear_log)
+        self.line_4 = QtWidgets.QFrame(self.dockWidgetContents)
+        self.line_4.setFrameShape(QtWidgets.QFrame.VLine)
+        self.line_4.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.line_4.setObjectName("line_4")
+        self.horizontalLayout_7.addWidget(self.line_4)
+        spacerItem7 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_7.addItem(spacerItem7)
+        self.verticalLayout.addLayout(self.horizontalLayout_7)
+        self.gridLayout_3.addLayout(self.verticalLayout, 0, 0, 1, 1)
+        self.dockWidget.setWidget(self.dockWidgetContents)
+        MainWindow.addDockWidget(QtCore.Qt.DockWidgetArea(2), self.dockWidget)
+        self.statusBar = QtWidgets.QStatusBar(MainWindow)
+        self.statusBar.setMaximumSize(QtCore.QSize(16777215, 2))
+        self.statusBar.setStyleSheet("background-color: rgba(54, 64, 74, 124);")
+        self.statusBar.setObjectName("statusBar")
+        MainWindow.setStatusBar(self.statusBar)
+        self.action_open_job = QtWidgets.QAction(MainWindow)
+        self.action_open_job.setObjectName("action_open_job")
+        self.action_save_job_as = QtWidgets.QAction(MainWindow)
+        self.action_save_job_as.setObjectName("action_save_job_as")
+        self.action_exit = QtWidgets.QAction(MainWindow)
+        self.action_exit.setObjectName("action_exit")
+        self.actionLightStyle = QtWidgets.QAction(MainWindow)
+        self.actionLightStyle.setObjectName("actionLightStyle")
+        self.actionDarkStyle = QtWidgets.QAction(MainWindow)
+        self.actionDarkStyle.setObjectName("actionDarkStyle")
+        self.action_show_logger_window = QtWidgets.QAction(MainWindow)
+        self.action_show_logger_window.setObjectName("action_show_logger_window")
+        self.action_save_job = QtWidgets.QAction(MainWindow)
+        self.action_save_job.setObjectName("action_save_job")
+        self.action_play_render_process = QtWidgets.QAction(MainWindow)
+        self.action_play_render_process.setCheckable(True)
+        self.action_play_render_process.setObjectName("action_play_render_process")
+        self.action_play_playlist = QtWidgets.QAction(MainWindow)
+        self.action_play_playlist.setCheckable(True)
+        self.action_play_playlist.setObjectName("action_play_playlist")
+        self.action_resume_batch = QtWidgets.QAction(MainWindow)
+        self.action_resume_batch.setCheckable(True)
+        self.action_resume_batch.setObjectName("action_resume_batch")
+        self.action_buffer_tune = QtWidgets.QAction(MainWindow)
+        self.action_buffer_tune.setObjectName("action_buffer_tune")
+        self.action_buffer_auto = QtWidgets.QAction(MainWindow)
+        self.action_buffer_auto.setCheckable(True)
+        self.action_buffer_auto.setObjectName("action_buffer_auto")
+        self.menuVisible_style.addAction(self.actionLightStyle)
+        self.menuVisible_style.addAction(self.actionDarkStyle)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.action_open_job)
+        self.menuFile.addAction(self.action_save_job)
+        self.menuFile.addAction(self.action_save_job_as)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.menuVisible_style.menuAction())
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.action_show_logger_window)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.action_exit)
+        self.menuFile.addSeparator()
+        self.menuOptions.addAction(self.action_play_render_process)
+        self.menuOptions.addAction(self.action_play_playlist)
+        self.menuOptions.addSeparator()
+        self.menuOptions.addAction(self.action_resume_batch)
+        self.menuOptions.addSeparator()
+        self.menuOptions.addAction(self.action_buffer_tune)
+        self.menuOptions.addAction(self.action_buffer_auto)
+        self.menuBar.addAction(self.menuFile.menuAction())
+        self.menuBar.addAction(self.menuOptions.menuAction())
+
+        self.retranslateUi(MainWindow)
+        self.combo_box_sound_device.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "neil-vst [ job default ] "))
+        self.button_measurment.setText(_translate("MainWindow", "MEAS RMS"))
+        self.button_start_work.setText(_translate("MainWindow", "START"))
+        self.button_stop_work.setText(_translate("MainWindow", "STOP"))
+        self.combo_box_sound_device.setCurrentText(_translate("MainWindow", "SYSTEM DEFAULT AUDIO OUT"))
+        self.combo_box_sound_device.setItemText(0, _translate("MainWindow", "SYSTEM DEFAULT AUDIO OUT"))
+        self.label_6.setText(_translate("MainWindow", " FILES: - "))
+        self.table_widget_files.setSortingEnabled(True)
+        item = self.table_widget_files.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "FILE"))
+        item = self.table_widget_files.horizontalHeaderItem(1)
+        item.setText(_translate("MainWindow", "SIZE"))
+        item = self.table_widget_files.horizontalHeaderItem(2)
+        item.setText(_translate("MainWindow", "DECSRIPTION"))
+        self.button_add_files.setText(_translate("MainWindow", "Add..."))
+        self.button_remove_all_files.setText(_translate("MainWindow", "Clear"))
+        self.label_7.setText(_translate("MainWindow", "OUT FOLDER:"))
+        self.button_out_folder.setText(_translate("MainWindow", "..."))
+        self.push_button_open_out_folder.setText(_translate("MainWindow", "Open"))
+        self.label_32.setText(_translate("MainWindow", " VST PLUGINS CHAIN:"))
+        self.label_17.setText(_translate("MainWindow", "VST BUFFER:"))
+        self.label_18.setText(_translate("MainWindow", "ERR"))
+        self.line_edit_normalize_rms_level.setText(_translate("MainWindow", "-19.0"))
+        self.label_19.setText(_translate("MainWindow", "PRE NORMALIZE (dB):"))
+        self.label_20.setText(_translate("MainWindow", "RMS"))
+        self.line_edit_normalize_error_db.setText(_translate("MainWindow", "0.25"))
+        self.line_edit_buffer_size_bytes.setText(_translate("MainWindow", "16192"))
+        self.label_21.setText(_translate("MainWindow", "BYTES(1024..65536)"))
+        self.table_widget_processes.setSortingEnabled(True)
+        item = self.table_widget_processes.horizontalHeaderItem(0)
+        item.setText(_translate("MainWindow", "NAME"))
+        self.button_add_vst.setText(_translate("MainWindow", "Add"))
+        self.button_remove_selected_vst.setText(_translate("MainWindow", "Remove"))
+        self.button_remove_all_vst.setText(_translate("MainWindow", "Clear"))
+        self.button_vst_up_in_chain.setText(_translate("MainWindow", "UP"))
+        self.button_vst_down_in_chain.setText(_translate("MainWindow", "DWN"))
+        self.label_31.setText(_translate("MainWindow", " METADATA:"))
+        self.label_22.setText(_translate("MainWindow", "Genre:"))
+        self.label_23.setText(_translate("MainWindow", "Year"))
+        self.label_24.setText(_translate("MainWindow", "Artist:"))
+        self.label_25.setText(_translate("MainWindow", "Album (book):"))
+        self.label_26.setText(_translate("MainWindow", "Sound designer:"))
+        self.line_edit_metadata_sound_designer.setText(_translate("MainWindow", "Владислав Каменев"))
+        self.label_27.setText(_translate("MainWindow", "Author:"))
+        self.line_edit_metadata_artist.setText(_translate("MainWindow", "Олег Шубин"))
+        self.line_edit_metadata_year.setText(_translate("MainWindow", "2021"))
+        self.line_edit_metadata_genre.setText(_translate("MainWindow", "Аудиокнига"))
+        self.label_28.setText(_translate("MainWindow", "Description:"))
+        self.label_29.setText(_translate("MainWindow", "Image:"))
+        self.tool_button_metadata_image.setText(_translate("MainWindow", "..."))
+        self.text_edit_metadata_description.setHtml(_translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
+"<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
+"p, li { white-space: pre-wrap; }\n"
+"</style></head><body style=\" font-family:\'MS Shell Dlg 2\'; font-size:7pt; font-weight:400; font-style:normal;\">\n"
+"<p style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\"><span style=\" font-size:9pt;\">Автор книги - {author}<br />Читает - {artist}<br />Звукорежиссер - {sound_designer}</span></p>\n"
+"<p style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\"><span style=\" font-size:9pt;\">Проект &quot;СВиД&quot; - Сказки для взрослых и детей\'</span></p></body></html>"))
+        self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuVisible_style.setTitle(_translate("MainWindow", "Visible style"))
+        self.menuOptions.setTitle(_translate("MainWindow", "Options"))
+        self.dockWidget.setWindowTitle(_translate("MainWindow", " LOGGING WINDOW"))
+        self.textBrowser.setDocumentTitle(_translate("MainWindow", "logging box"))
+        self.label_3.setText(_translate("MainWindow", "LOG LEVEL:"))
+        self.combo_box_logging_level.setCurrentText(_translate("MainWindow", "DEBUG"))
+        self.combo_box_logging_level.setItemText(0, _translate("MainWindow", "DEBUG"))
+        self.combo_box_logging_level.setItemText(1, _translate("MainWindow", "INFO"))
+        self.combo_box_logging_level.setItemText(2, _translate("MainWindow", "WARNING"))
+        self.combo_box_logging_level.setItemText(3, _translate("MainWindow", "ERROR"))
+        self.button_clear_log.setText(_translate("MainWindow", "CLEAR"))
+        self.action_open_job.setText(_translate("MainWindow", "Open job..."))
+        self.action_save_job_as.setText(_translate("MainWindow", "Save job as..."))
+        self.action_exit.setText(_translate("MainWindow", "Exit"))
+        self.actionLightStyle.setText(_translate("MainWindow", "Light"))
+        self.actionDarkStyle.setText(_translate("MainWindow", "Dark"))
+        self.action_show_logger_window.setText(_translate("MainWindow", "Show logger window"))
+        self.action_save_job.setText(_translate("MainWindow", "Save job"))
+        self.action_play_render_process.setText(_translate("MainWindow", "Play chain in separate process"))
+        self.action_play_playlist.setText(_translate("MainWindow", "Playlist mode (gapless play of selected files)"))
+        self.action_resume_batch.setText(_translate("MainWindow", "Resume interrupted work (skip done files)"))
+        self.action_buffer_tune.setText(_translate("MainWindow", "Tune VST buffer size (selected file excerpt)"))
+        self.action_buffer_auto.setText(_translate("MainWindow", "Use tuned VST buffer size of the chain"))
+
+
+UI_SOURCE_HASH = "e4eee7c6332d30456f108d060c5f68da3c13eb89"
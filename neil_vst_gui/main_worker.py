@@ -1,31 +1,76 @@
 
 import os
+import glob
+import json
+import math
+import shutil
 import logging
-from multiprocessing import Process, current_process
-from PyQt5.QtCore import pyqtSlot, pyqtSignal, QThread
+import threading
+from time import time, sleep
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Process, Value, current_process
 
-from neil_vst import VstChainWorker
 from neil_vst_gui.tag_write import TagWriter
-from neil_vst_gui.ui_logging import ProcessLogHandler
+from neil_vst_gui.chain_render import render_file, normalize_settings
+from neil_vst_gui.segment_render import plan_segments, render_segment, stitch_segments
+from neil_vst_gui.process_logging import ProcessLogHandler
+from neil_vst_gui.memory_monitor import MemoryAdmission, MB
+from neil_vst_gui.batch_journal import BatchJournal, temp_filepath, job_fingerprint
+from neil_vst_gui.schedule import ProbeCache, RealtimeHistory, longest_first
+from neil_vst_gui.buffer_tune import chain_fingerprint
+from neil_vst_gui.measure import measure_file, result_text
+from neil_vst_gui.prefix_cache import PrefixCache
+from neil_vst_gui.metrics import BatchMetrics
+from neil_vst_gui.trace import Tracer, tracer, now, merge_trace, parts_folder
+from neil_vst_gui.dedup import duplicate_groups
+from neil_vst_gui.watchdog import Watchdog, heartbeat
+from neil_vst_gui.cpu_policy import CpuPolicy, get_nice, set_affinity, set_nice
 
 
 class ProcessWorker(Process):
     """docstring for ProcessWorker"""
 
-    def __init__(self, pipe, job_file, in_file, out_file, buffer_size, meas=False, metadata={}, tag_only=False, daemon=True, log_level=logging.INFO):
+    def __init__(self, pipe, job_file, in_file, out_file, buffer_size, metadata={}, picture=None, pipeline_depth=0, chain_stages=1, prefix_cache=None, segment=None, settings=None, daemon=True, log_level=logging.INFO):
         super().__init__()
         self.pipe = pipe
         self.job_file = job_file
         self.in_file = in_file
         self.out_file = out_file
         self.buffer_size = buffer_size
-        self.meas = meas
         self.metadata = metadata
-        self.tag_only = tag_only
+        self.picture = picture
+        self.pipeline_depth = pipeline_depth
+        self.chain_stages = chain_stages
+        self.prefix_cache = prefix_cache
+        self.segment = segment
+        # the already normalized job settings of the segment, None - read from the job file
+        self.settings = settings
+        # the worker trace part are written to the folder if it is set
+        self.trace_folder = None
+        # the last progress time, the watchdog kills the worker without it
+        self.heartbeat = Value('d', 0.0, lock=False)
+        self.attempt = 0
+        self.killed = None
+        self.retry = None
+        self.finished = False
+        # (cpus, nice) of the worker process, None - inherited from the parent
+        self.cpu = None
         self.daemon=daemon
         self.log_level = log_level
 
+    def clone(self):
+        """ Return the new worker of the same work, the process are started once """
+        return ProcessWorker(self.pipe, self.job_file, self.in_file, self.out_file, self.buffer_size,
+                             metadata=self.metadata, picture=self.picture,
+                             pipeline_depth=self.pipeline_depth, chain_stages=self.chain_stages,
+                             prefix_cache=self.prefix_cache, segment=self.segment, settings=self.settings, daemon=self.daemon,
+                             log_level=self.log_level)
+
     def run(self):
+        # before the worker threads start, the started ones do not inherit it
+        if self.cpu is not None:
+            set_affinity(0, self.cpu[0])
+            set_nice(0, self.cpu[1])
         # Create logger for process and connect it to common pipe
         self.extra = {'ThreadName': current_process().name }
         self.logger = logging.getLogger(current_process().name)
@@ -35,22 +80,57 @@ class ProcessWorker(Process):
         formatter = logging.Formatter( fmt='%(name)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S' )
         self.handler.setFormatter(formatter)
         self.logger.addHandler(self.handler)
-        # TAG WRITE ONLY
-        if self.tag_only:
-            TagWriter(self.logger).write(self.in_file, *self.metadata)
+        heartbeat.attach(self.heartbeat)
+        if self.trace_folder is None:
+            self._work()
             return
-        # VST CHAIN WORK
-        self.vst_chain = VstChainWorker(buffer_size=self.buffer_size, logger=self.logger, display_info=False)
-        # Process measurment or work
+        tracer.enable("%s - %s" % (current_process().name, os.path.basename(self.in_file)))
+        # from the dispatcher start call to the worker code
+        tracer.add("spawn", getattr(self, "start_time", time()) * 1e6, now(), "process")
+        try:
+            with tracer.span("work", "process", file=os.path.basename(self.in_file)):
+                self._work()
+        finally:
+            try:
+                tracer.save(os.path.join(self.trace_folder, "%d.json" % os.getpid()))
+            except OSError as e:
+                self.logger.warning("Trace write error - %s" % str(e))
+
+    def _work(self):
         try:
-            if self.meas:
-                _, meas_rms_db, _, peak_max_db = self.vst_chain.rms_peak_measurment(self.in_file)
-                return (meas_rms_db, peak_max_db)
+            if self.segment is not None:
+                settings = self.settings
+                if settings is None:
+                    with tracer.span("job parse", "process"):
+                        with open(self.job_file, "r") as f:
+                            settings = json.load(f)
+                # one part of the long file, out file is the segment temp file
+                with tracer.span("segment render", "process"):
+                    render_segment(normalize_settings(settings, self.in_file, self.logger), self.in_file, self.out_file, self.segment, self.buffer_size, self.logger)
             else:
-                self.vst_chain.procces_file(self.job_file, self.in_file, self.out_file)
-                TagWriter(self.logger).write(self.out_file, *self.metadata)
+                with tracer.span("job parse", "process"):
+                    with open(self.job_file, "r") as f:
+                        settings = json.load(f)
+                # tags are known before encoding and written with the audio data
+                tag_writer = TagWriter(self.logger)
+                tags, encoder_tags = tag_writer.prepare(self.out_file, self.metadata, self.picture)
+                # the out file appears only complete
+                with tracer.span("render", "process"):
+                    render_file(settings, self.in_file, temp_filepath(self.out_file), self.buffer_size, self.logger, tags=encoder_tags,
+                                pipeline_depth=self.pipeline_depth, chain_stages=self.chain_stages,
+                                prefix_cache=PrefixCache.from_settings(self.prefix_cache))
+                if tags is not None:
+                    with tracer.span("tagging", "process"):
+                        tag_writer.complete(temp_filepath(self.out_file), tags, self.metadata[-1], self.picture)
+                os.replace(temp_filepath(self.out_file), self.out_file)
         except Exception as e:
             self.logger.error("%s - %s" % (os.path.basename(self.in_file), str(e)))
+            # the broken segment must not be joined, the broken out file are not kept
+            f = self.out_file if self.segment is not None else temp_filepath(self.out_file)
+            if os.path.exists(f):
+                os.remove(f)
+            # non zero exit code for the failed file
+            raise SystemExit(1)
 
 
 
@@ -58,43 +138,571 @@ class ProcessWorker(Process):
 class MainWorker(object):
     """docstring for MainWorker"""
 
-    def __init__(self, logger):
+    def __init__(self, logger, tag_threads=4, max_processes=None, on_event=None):
         self.processes = []
+        self.pending = []
+        self.running = []
+        self.dispatcher = None
+        self.thread_futures = []
+        self.thread_results = {}
+        self.tag_threads = tag_threads
+        self.stitch_threads = []
+        # {rendered in file: [(duplicate in file, out file)]}
+        self.duplicates = {}
+        self.duplicates_options = ((), None, True)
+        self.duplicates_executor = None
+        self.max_processes = max_processes
+        self.memory = None
+        self.watchdog = None
+        # the workers CPUs / priority, throttled while the audition plays
+        self.cpu_policy = None
+        self.throttled = False
+        self.cpu_throttled = False
+        self.journal = None
+        self.fingerprint = None
+        # the render history are kept by the plugins chain only
+        self.history_key = None
+        self.probe_cache = None
+        self.history = None
+        self.metrics = BatchMetrics()
+        self.trace = Tracer()
+        self.trace_file = None
+        self.on_event = on_event
         self.terminate_work = False
         self.logger = logger
 
-    def start(self, pipe, job, meas, vst_buffer_size, log_level):
+    def _event(self, event, filepath, **kwargs):
+        """ Report file work state to the journal and the 'on_event' callback """
+        if self.journal is not None and event in ("start", "done", "failed"):
+            try:
+                self.journal.update(filepath, "started" if event == "start" else event, out_file=kwargs.get("out_file"))
+            except OSError as e:
+                self.logger.warning("Batch journal write error - %s" % str(e))
+        self.metrics.event(event, filepath)
+        if self.on_event is not None:
+            self.on_event(dict(event=event, file=filepath, time=time(), **kwargs))
+
+    def _picture_prepare(self, metadata, cover_max_size):
+        """ Encode the cover picture once for all workers """
+        image = metadata[-1] if len(metadata) else None
+        if not image or not os.path.exists(image):
+            return None
+        try:
+            return TagWriter(self.logger).picture_write(image, max_size=cover_max_size)
+        except Exception as e:
+            self.logger.error("Cover image [%s] encode error - %s" % (os.path.basename(image), str(e)))
+            return None
+
+    # -------------------------------------------------------------------------
+
+    def _tag_file(self, filepath, metadata, picture):
+        """ Tag-only work for one file, runs in the tag threads pool """
+        if self.terminate_work:
+            return
+        self._event("start", filepath)
+        try:
+            TagWriter(self.logger).write(filepath, *metadata, picture=picture)
+            self.thread_results[filepath] = None
+            self._event("done", filepath)
+        except Exception as e:
+            self.thread_results[filepath] = str(e)
+            self.logger.error("%s - %s" % (os.path.basename(filepath), str(e)))
+            self._event("failed", filepath, error=str(e))
+
+    def _tag_only_start(self, in_files, metadata, picture):
+        self._threads_start(self._tag_file, [ (f, metadata, picture) for f in in_files ])
+
+    def _meas_file(self, filepath):
+        """ Loudness/peak measurement of one file, runs in the threads pool """
+        if self.terminate_work:
+            return
+        self._event("start", filepath)
+        try:
+            result = measure_file(filepath)
+            self.thread_results[filepath] = result
+            self.logger.info(result_text(filepath, result))
+            self._event("done", filepath, **{ k: (v if math.isfinite(v) else None) for k, v in result.items() })
+        except Exception as e:
+            self.thread_results[filepath] = str(e)
+            self.logger.error("%s - %s" % (os.path.basename(filepath), str(e)))
+            self._event("failed", filepath, error=str(e))
+
+    def _threads_start(self, target, args_list):
+        executor = ThreadPoolExecutor(max_workers=max(1, self.tag_threads))
+        self.thread_futures = [ executor.submit(target, *args) for args in args_list ]
+        # workers threads exit after the all queued files are done
+        executor.shutdown(wait=False)
+
+    # -------------------------------------------------------------------------
+
+    def _submit(self, worker, info, duration=None):
+        """ Queue the worker process, it are started by the dispatcher. The
+            worker cost are the render time estimate from the earlier runs
+        """
+        worker.info = info
+        worker.trace_folder = parts_folder(self.trace_file) if self.trace_file is not None else None
+        worker.duration = duration if duration is not None else (info["duration"] if info else 0.0)
+        worker.cost = worker.duration
+        if info and self.history_key is not None:
+            worker.cost = self.history.estimate(self.history_key, info["samplerate"], info["channels"], worker.duration)
+        self.pending.append(worker)
+
+    def _worker_done(self, worker):
+        name = os.path.basename(worker.in_file) + (" [%d]" % worker.segment["index"] if worker.segment is not None else "")
+        self.trace.add(name, worker.start_time * 1e6, now(), "worker", {"pid": worker.pid, "exitcode": worker.exitcode},
+                       lane="slot %d" % worker.slot)
+        memory = {}
+        if self.memory is not None:
+            peak = self.memory.release(worker)
+            if peak is not None:
+                memory["peak_rss_mb"] = peak // MB
+                self.logger.debug("[ MEMORY ] %s - peak %d MB" % (os.path.basename(worker.out_file), peak // MB))
+        if worker.killed is not None and self._retry(worker, name):
+            return
+        if worker.exitcode == 0 and worker.info and self.history_key is not None:
+            self.history.record(self.history_key, worker.info["samplerate"], worker.info["channels"],
+                                worker.duration, time() - worker.start_time)
+        if worker.segment is not None:
+            return
+        if worker.exitcode == 0:
+            self._event("done", worker.in_file, out_file=worker.out_file, **memory)
+        elif worker.killed is not None:
+            self._event("failed", worker.in_file, exitcode=worker.exitcode, error=worker.killed, **memory)
+        else:
+            self._event("failed", worker.in_file, exitcode=worker.exitcode, **memory)
+        self._duplicates_start(worker.in_file, worker.out_file, worker.exitcode == 0)
+
+    def _watch(self, running):
+        """ Kill the hung workers, the dead ones are done by the dispatcher """
+        for w in running:
+            if w.killed is not None or not w.is_alive():
+                continue
+            reason = self.watchdog.check(w)
+            if reason is None:
+                continue
+            w.killed = reason
+            self.logger.warning("[ WATCHDOG ] %s - %s, the worker are killed" % (os.path.basename(w.in_file), reason))
+            w.kill()
+
+    def _retry(self, worker, name):
+        """ Queue the killed worker work again, False if the retries are over """
+        # the killed worker out file are incomplete
+        f = worker.out_file if worker.segment is not None else temp_filepath(worker.out_file)
+        if os.path.exists(f):
+            os.remove(f)
+        if self.terminate_work or worker.attempt >= self.watchdog.retries:
+            return False
+        retry = worker.retry = worker.clone()
+        retry.attempt = worker.attempt + 1
+        self._submit(retry, worker.info, worker.duration)
+        self.logger.warning("[ WATCHDOG ] %s - retry %d of %d" % (name, retry.attempt, self.watchdog.retries))
+        if worker.segment is None:
+            self._event("retry", worker.in_file, attempt=retry.attempt, error=worker.killed)
+        return True
+
+    def _cpu_update(self, running):
+        """ Apply the changed throttle state to the running workers """
+        throttled = self.throttled
+        if throttled == self.cpu_throttled:
+            return
+        self.cpu_throttled = throttled
+        for w in running:
+            if w.is_alive() and w.pid is not None:
+                affinity, nice = self.cpu_policy.apply(w.pid, throttled)
+                if not nice:
+                    self.logger.warning("%s - priority are not changed, the worker runs at nice %s" % (
+                        os.path.basename(w.in_file), get_nice(w.pid)))
+        self.logger.info("[ CPU ] %s" % self.cpu_policy.status(throttled))
+
+    def throttle(self, on):
+        """ Throttle the batch workers while the interactive work (audition) runs,
+            it are applied by the dispatcher to the running and the new workers
+        """
+        self.throttled = bool(on)
+
+    def _admit(self, running):
+        if self.max_processes is not None and len(running) >= self.max_processes:
+            return False
+        return self.memory is None or self.memory.admit(running)
+
+    def _dispatch(self):
+        """ Start the queued workers while the running processes limit and
+            the memory budget allows
+        """
+        running = self.running = []
+        sampled = 0
+        while not self.terminate_work and (len(self.pending) or len(running)):
+            if self.memory is not None and (time() - sampled) > 0.25:
+                self.memory.update(running)
+                sampled = time()
+            if self.watchdog is not None:
+                self._watch(running)
+            if self.cpu_policy is not None:
+                self._cpu_update(running)
+            for w in [ w for w in running if not w.is_alive() ]:
+                running.remove(w)
+                self._worker_done(w)
+                w.finished = True
+            while len(self.pending) and not self.terminate_work and self._admit(running):
+                w = self.pending.pop(0)
+                # the trace lane of the worker, the free lanes are the idle cores
+                w.slot = min(set(range(len(running) + 1)) - { r.slot for r in running })
+                w.start_time = time()
+                if self.cpu_policy is not None:
+                    w.cpu = self.cpu_policy.settings(self.cpu_throttled)
+                w.start()
+                self.trace.add("process start", w.start_time * 1e6, now(), "dispatch")
+                running.append(w)
+                self.processes.append(w)
+                if w.segment is None:
+                    self._event("start", w.in_file)
+            sleep(0.02)
+        self._history_save()
+        if self.trace_file is not None:
+            self._trace_save()
+
+    def _trace_save(self):
+        # the long files are done after the segments are joined
+        for t in self.stitch_threads:
+            t.join()
+        try:
+            merge_trace(self.trace_file, parts_folder(self.trace_file), self.trace.events)
+            self.logger.info("Trace saved to %s" % self.trace_file)
+        except OSError as e:
+            self.logger.warning("Trace write error - %s" % str(e))
+
+    def _history_save(self):
+        if self.history_key is None or self.terminate_work:
+            return
+        try:
+            self.history.save()
+        except OSError as e:
+            self.logger.warning("Render history write error - %s" % str(e))
+
+    def _wait_workers(self, workers):
+        """ Wait the workers and their retries done by the dispatcher """
+        def last(w):
+            while w.retry is not None:
+                w = w.retry
+            return w
+
+        while not all(last(w).finished for w in workers) and not self.terminate_work:
+            sleep(0.05)
+
+    # -------------------------------------------------------------------------
+
+    def _stitch(self, workers, segments, in_file, out_file, buffer_size, metadata, picture):
+        """ Wait the all segments of the long file and join them to out file """
+        import soundfile
+
+        seg_files = [ w.out_file for w in workers ]
+        joined = False
+        try:
+            self._wait_workers(workers)
+            if self.terminate_work:
+                return
+            stitch_start = now()
+            if not all(os.path.exists(f) for f in seg_files):
+                self.logger.error("%s - segments render failed" % os.path.basename(in_file))
+                self._event("failed", in_file, error="segments render failed")
+                return
+            info = soundfile.info(in_file)
+            tag_writer = TagWriter(self.logger)
+            tags, encoder_tags = tag_writer.prepare(out_file, metadata, picture)
+            stitch_segments(segments, seg_files, temp_filepath(out_file), info.samplerate, info.channels, info.subtype, buffer_size,
+                            encoder_tags, self.logger)
+            tag_writer.complete(temp_filepath(out_file), tags, metadata[-1] if len(metadata) else None, picture)
+            os.replace(temp_filepath(out_file), out_file)
+            self.trace.add("stitch", stitch_start, now(), "dispatch", {"file": os.path.basename(in_file)})
+            self.logger.info("[ SEGMENTS JOINED ] - %s" % os.path.basename(out_file))
+            self._event("done", in_file, out_file=out_file)
+            joined = True
+        except Exception as e:
+            self.logger.error("%s - %s" % (os.path.basename(in_file), str(e)))
+            self._event("failed", in_file, error=str(e))
+        finally:
+            if not self.terminate_work:
+                self._duplicates_start(in_file, out_file, joined)
+            for f in seg_files + [temp_filepath(out_file)]:
+                if os.path.exists(f):
+                    os.remove(f)
+
+    def _segments_start(self, pipe, job_file, in_file, out_file, info, vst_buffer_size, metadata, picture, split, log_level):
+        """ Split the long file to segments rendered on the several cores """
+        # the stitch thread must not hold the import lock while the workers are forked
+        import soundfile
+
+        segments = plan_segments(
+            info["frames"], info["samplerate"],
+            segment_sec=split.get("segment_sec", 600.0),
+            preroll_sec=split.get("preroll_sec", 5.0),
+            crossfade_sec=split.get("crossfade_sec", 0.05),
+            latency=split.get("latency", 0)
+        )
+        # the file are measured once for the all segments, not by every segment worker
+        settings = None
+        with open(job_file, "r") as f:
+            job = json.load(f)
+        if job.get("normalize", {}).get("enable", False):
+            with self.trace.span("normalize measure", "dispatch", file=os.path.basename(in_file)):
+                settings = normalize_settings(job, in_file, self.logger)
+            settings["normalize"] = {}
+        workers = []
+        for segment in segments:
+            workers.append(
+                ProcessWorker(
+                    pipe,
+                    job_file,
+                    in_file,
+                    "%s.seg%03d.wav" % (out_file, segment["index"]),
+                    vst_buffer_size,
+                    segment=segment,
+                    settings=settings,
+                    log_level=log_level
+                )
+            )
+            self._submit(workers[-1], info, (segment["out_stop"] - segment["read_start"]) / info["samplerate"])
+        self._event("start", in_file, segments=len(segments))
+        t = threading.Thread(target=self._stitch, args=(workers, segments, in_file, out_file, vst_buffer_size, metadata, picture))
+        t.daemon = True
+        t.start()
+        self.stitch_threads.append(t)
+
+    def _is_long_file(self, info, split):
+        if not split or not split.get("enable", False) or not info:
+            return False
+        return info["duration"] > split.get("split_long_sec", 1800.0)
+
+    def _probe(self, in_files):
+        """ Return the files headers info, cached by the file size and mtime """
+        if self.probe_cache is None:
+            self.probe_cache = ProbeCache()
+        infos = self.probe_cache.probe(in_files)
+        try:
+            self.probe_cache.save()
+        except OSError as e:
+            self.logger.warning("Probe cache write error - %s" % str(e))
+        return infos
+
+    def _schedule_log(self):
+        total = sum(w.cost for w in self.pending)
+        if self.history_key is not None and len(self.pending):
+            rtf = self.history.realtime_factor(self.history_key, self.pending[0].info["samplerate"], self.pending[0].info["channels"]) \
+                if self.pending[0].info else None
+            if rtf is not None:
+                self.logger.info("[ SCHEDULE ] - %d tasks longest first, render time %.1f min at %.1fx realtime" % (len(self.pending), total / 60, rtf))
+                return
+        self.logger.info("[ SCHEDULE ] - %d tasks longest first, audio %.1f min" % (len(self.pending), total / 60))
+
+    # -------------------------------------------------------------------------
+
+    def _dedup(self, in_files, out_files, dedup, metadata, picture):
+        """ Keep one file of the same content inputs to render, the others
+            are the copies (or the hard links if the files are not tagged) of
+            its out file with own tags
+        """
+        self.duplicates = {}
+        with self.trace.span("dedup", "dispatch", files=len(in_files)):
+            groups = duplicate_groups(in_files, dedup.get("mode", "full"), self.tag_threads)
+        if not len(groups):
+            return in_files, out_files
+        duplicated = set()
+        for group in groups:
+            self.duplicates[in_files[group[0]]] = [ (in_files[i], out_files[i]) for i in group[1:] ]
+            duplicated.update(group[1:])
+        self.duplicates_options = (metadata, picture, dedup.get("link", "hardlink") == "hardlink")
+        if self.duplicates_executor is None:
+            self.duplicates_executor = ThreadPoolExecutor(max_workers=max(1, self.tag_threads))
+        self.logger.info("[ DEDUP ] - %d files are the duplicates of %d rendered files" % (len(duplicated), len(groups)))
+        keep = [ i for i in range(len(in_files)) if i not in duplicated ]
+        return [ in_files[i] for i in keep ], [ out_files[i] for i in keep ]
+
+    def _duplicates_start(self, in_file, out_file, ok):
+        """ The rendered file are done, make its duplicates out files """
+        for dup_in_file, dup_out_file in self.duplicates.pop(in_file, []):
+            if not ok:
+                self._event("failed", dup_in_file, error="duplicate of the not rendered %s" % os.path.basename(in_file))
+                continue
+            self.thread_futures.append(self.duplicates_executor.submit(self._duplicate_file, dup_in_file, dup_out_file, out_file))
+
+    def _duplicate_file(self, in_file, out_file, source):
+        if self.terminate_work:
+            return
+        metadata, picture, hardlink = self.duplicates_options
+        self._event("start", in_file, duplicate_of=source)
+        temp = temp_filepath(out_file)
+        try:
+            if os.path.exists(temp):
+                os.remove(temp)
+            linked = False
+            # the tags are written to the file, the tagged files can not share it
+            if hardlink and not len(metadata):
+                try:
+                    os.link(source, temp)
+                    linked = True
+                except OSError:
+                    pass
+            if not linked:
+                shutil.copyfile(source, temp)
+            if len(metadata):
+                TagWriter(self.logger).write(temp, *metadata, picture=picture)
+            os.replace(temp, out_file)
+            self.logger.info("[ DUPLICATE ] - %s %s from %s" % (os.path.basename(out_file), "linked" if linked else "copied", os.path.basename(source)))
+            self._event("done", in_file, out_file=out_file, duplicate_of=source)
+        except Exception as e:
+            self.logger.error("%s - %s" % (os.path.basename(in_file), str(e)))
+            self._event("failed", in_file, error=str(e))
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    # -------------------------------------------------------------------------
+
+    def _journal_start(self, in_files, out_files, out_folder, resume):
+        self.journal = BatchJournal(out_folder, self.fingerprint)
+        if resume:
+            self.journal.load()
+        done = [ self.journal.is_done(in_files[i], out_files[i]) for i in range(len(in_files)) ]
+        todo = [ i for i in range(len(in_files)) if not done[i] ]
+        if resume:
+            self.logger.info("[ RESUME ] - %d files are done, %d files left" % (len(in_files) - len(todo), len(todo)))
+            for i in range(len(in_files)):
+                if done[i]:
+                    self._event("skipped", in_files[i], out_file=out_files[i])
+        # the temp files and the long files segments after the crash
+        for i in todo:
+            for f in [ temp_filepath(out_files[i]) ] + glob.glob(glob.escape(out_files[i]) + ".seg[0-9][0-9][0-9].wav"):
+                if os.path.exists(f):
+                    os.remove(f)
+        return [ in_files[i] for i in todo ], [ out_files[i] for i in todo ]
+
+    # -------------------------------------------------------------------------
+
+    def start(self, pipe, job, meas, vst_buffer_size, log_level, **kwargs):
+        self.start_files(
+            pipe,
+            job.job_file,
+            job.files().filelist,
+            job.files().out_folder,
+            tuple(job.metadata().data),
+            len(job.vst_chain().plugins_list) == 0,
+            meas,
+            vst_buffer_size,
+            log_level,
+            **kwargs
+        )
+
+    def start_files(self, pipe, job_file, in_files, out_folder, metadata, tag_only, meas, vst_buffer_size, log_level,
+                    cover_max_size=0, pipeline_depth=0, chain_stages=1, prefix_cache=None, split=None, memory=None, resume=False, schedule=True,
+                    trace_file=None, dedup=None, watchdog=None, cpu_policy=None):
         # verify params
-        assert len(job.files().out_folder) and os.path.exists(job.files().out_folder), \
+        assert len(out_folder) and os.path.exists(out_folder), \
             "The output folder are not set or invalid path! Break work."
         assert vst_buffer_size >= (1024) and vst_buffer_size <= (1024*64), \
             "VST buffer size is incorrect! Please set value in range: [ 1024..65536 ] bytes"
         # determinate in/out files
-        in_files = job.files().filelist
-        out_files = [ os.path.abspath(os.path.join(job.files().out_folder, os.path.basename(f))) for f in in_files ]
+        out_files = [ os.path.abspath(os.path.join(out_folder, os.path.basename(f))) for f in in_files ]
         # reset terminate state and processes list
         self.terminate_work = False
         self.processes = []
-        # run the all processes
+        self.pending = []
+        self.thread_futures = []
+        self.thread_results = {}
+        self.stitch_threads = []
+        self.duplicates = {}
+        self.running = []
+        self.metrics.reset(in_files)
+        # the batch timeline of the dispatcher and the workers spans
+        self.trace_file = os.path.abspath(trace_file) if trace_file else None
+        self.trace = Tracer()
+        if self.trace_file is not None:
+            self.trace.enable("MainWorker")
+            os.makedirs(parts_folder(self.trace_file), exist_ok=True)
+        self.memory = None if meas else MemoryAdmission.from_settings(memory)
+        self.watchdog = Watchdog.from_settings(watchdog)
+        self.cpu_policy = None if meas else CpuPolicy.from_settings(cpu_policy)
+        self.cpu_throttled = self.throttled
+        if self.cpu_policy is not None:
+            self.logger.info("[ CPU ] %s" % self.cpu_policy.status(self.cpu_throttled))
+        self.journal = None
+        self.fingerprint = None
+        self.history_key = None
+        # measurement are NumPy work, in-process threads
+        if meas:
+            self._threads_start(self._meas_file, [ (f, ) for f in in_files ])
+            return
+        # tags data common for all files
+        picture = self._picture_prepare(metadata, cover_max_size)
+        # empty chain - tags only, in-process threads without the workers spawn
+        if tag_only:
+            self._tag_only_start(in_files, metadata, picture)
+            return
+        # the render files state journal in the out folder, skip the done files on resume
+        with open(job_file, "r") as f:
+            settings = json.load(f)
+        self.fingerprint = job_fingerprint(settings, vst_buffer_size)
+        self.history_key = chain_fingerprint(settings.get("plugins_list", {}))
+        if self.history is None:
+            self.history = RealtimeHistory()
+        with self.trace.span("journal", "dispatch"):
+            in_files, out_files = self._journal_start(in_files, out_files, out_folder, resume)
+        if dedup and dedup.get("enable", False):
+            in_files, out_files = self._dedup(in_files, out_files, dedup, metadata, picture)
+        with self.trace.span("probe", "dispatch", files=len(in_files)):
+            infos = self._probe(in_files)
+        self.metrics.infos(in_files, infos)
+        # queue the all processes
         for i in range(len(in_files)):
-            self.processes.append(
+            if self._is_long_file(infos[i], split):
+                self._segments_start(pipe, job_file, in_files[i], out_files[i], infos[i], vst_buffer_size, metadata, picture, split, log_level)
+                continue
+            self._submit(
                 ProcessWorker(
                     pipe,
-                    job.job_file,
+                    job_file,
                     in_files[i],
                     out_files[i],
                     vst_buffer_size,
-                    meas=meas,
-                    metadata=tuple(job.metadata().data),
-                    tag_only=(len(job.vst_chain().plugins_list) == 0),
+                    metadata=metadata,
+                    picture=picture,
+                    pipeline_depth=pipeline_depth,
+                    chain_stages=chain_stages,
+                    prefix_cache=prefix_cache,
                     log_level=log_level
-                )
+                ),
+                infos[i]
             )
-            self.processes[-1].start()
-            # self.processes.append(process)
+        # the longest processing time first, the long files are not left to the end
+        if schedule:
+            self.pending = longest_first(self.pending, lambda w: w.cost)
+            self._schedule_log()
+        # start the dispatcher
+        self.dispatcher = threading.Thread(target=self._dispatch)
+        self.dispatcher.daemon = True
+        self.dispatcher.start()
+
+    def memory_status(self):
+        """ Return the running workers memory text, empty if not tracked """
+        return self.memory.status() if self.memory is not None else ""
+
+    def is_active(self):
+        return (self.dispatcher is not None and self.dispatcher.is_alive()) or \
+            any(w.is_alive() for w in self.processes) or \
+            not all(f.done() for f in self.thread_futures) or \
+            any(t.is_alive() for t in self.stitch_threads)
 
     def stop(self):
+        self.terminate_work = True
+        self.pending = []
+        for f in self.thread_futures:
+            f.cancel()
         for w in self.processes:
             w.terminate()
-        self.terminate_work = True
-
+        # the terminated workers out files are incomplete
+        for w in self.processes:
+            w.join(1.0)
+            f = w.out_file if w.segment is not None else temp_filepath(w.out_file)
+            try:
+                if os.path.exists(f):
+                    os.remove(f)
+            except OSError as e:
+                self.logger.warning("%s - %s" % (os.path.basename(f), str(e)))
@@ -0,0 +1,324 @@
+#!python3
+""" Streaming block-wise audio measurement: RMS, sample peak, 4x oversampled
+    true peak, EBU R128 integrated loudness and loudness range. The files are
+    measured in one pass with the bounded memory, the NumPy/FFT work and the
+    decoding run without the GIL, so the files are measured on a thread pool.
+"""
+
+import os
+import sys
+import json
+import math
+import logging
+import argparse
+import functools
+import numpy
+from numpy.lib.stride_tricks import as_strided
+from concurrent.futures import ThreadPoolExecutor
+
+
+# the calibration of the py-neil-vst RMS for the limiter with 60ms attack/200ms release
+RMS_DB_CORRECTION = 5.25
+# py-neil-vst RMS window and hop, frames
+RMS_WINDOW = 10240
+RMS_HOP = 5120
+
+OVERSAMPLING = 4
+ABSOLUTE_GATE_LUFS = -70.0
+
+
+def _db(value):
+    return 20 * math.log10(value) if value > 0 else float("-inf")
+
+
+def _lufs(power):
+    return -0.691 + 10 * numpy.log10(power)
+
+
+# BS.1770 K-weighting biquads at 48 kHz - the high shelf and the RLB high pass
+K_SHELF_48K = ([ 1.53512485958697, -2.69169618940638, 1.19839281085285 ], [ 1.0, -1.69065929318241, 0.73248077421585 ])
+K_HIGH_PASS_48K = ([ 1.0, -2.0, 1.0 ], [ 1.0, -1.99004745483398, 0.99007225036621 ])
+
+
+def _biquad_rate(b, a, samplerate, reference_rate=48000):
+    """ Return the biquad (b, a) of the other sample rate: the analog filter
+        of the reference rate biquad (the inverse bilinear transform) are
+        transformed back at the sample rate, so the response below the
+        Nyquist stays the reference one
+    """
+    r = samplerate / reference_rate
+
+    def rate(p):
+        # (s / 2fs_ref)^2, s / 2fs_ref, 1 terms of the analog polynomial scaled to the new rate
+        s2, s1, s0 = (p[0] - p[1] + p[2]) * r * r, 2 * (p[0] - p[2]) * r, p[0] + p[1] + p[2]
+        return [ s2 + s1 + s0, 2 * (s0 - s2), s2 - s1 + s0 ]
+
+    b, a = rate(b), rate(a)
+    return [ v / a[0] for v in b ], [ v / a[0] for v in a ]
+
+
+@functools.lru_cache(maxsize=16)
+def _k_weighting_response(samplerate, length=None):
+    """ Return the impulse response of the BS.1770 K-weighting filter (the
+        high shelf and the RLB high pass biquads) for the sample rate
+    """
+    if length is None:
+        # the high pass decay are the same time, so the frames grow with the rate
+        length = 8192 * int(math.ceil(samplerate / 48000))
+    b1, a1 = _biquad_rate(*K_SHELF_48K, samplerate)
+    b2, a2 = _biquad_rate(*K_HIGH_PASS_48K, samplerate)
+
+    b = numpy.convolve(b1, b2)
+    a = numpy.convolve(a1, a2)
+    # the filter impulse response, decays below 1e-15 in 8192 frames at 48 kHz
+    h = numpy.zeros(length)
+    x = numpy.zeros(length)
+    x[0] = 1.0
+    for n in range(length):
+        acc = 0.0
+        for i in range(5):
+            if n - i < 0:
+                break
+            acc += b[i] * x[n - i]
+            if i:
+                acc -= a[i] * h[n - i]
+        h[n] = acc
+    return h
+
+
+@functools.lru_cache(maxsize=4)
+def _oversampling_phases(factor=OVERSAMPLING, taps_per_phase=32):
+    """ Return the windowed sinc interpolation filter split to the polyphase
+        (taps, factor - 1) matrix, the zero phase are the original samples
+    """
+    n = factor * taps_per_phase + 1
+    t = (numpy.arange(n) - (n - 1) / 2) / factor
+    h = numpy.sinc(t) * numpy.kaiser(n, 8.0)
+    return numpy.stack([ h[p::factor][:taps_per_phase] for p in range(1, factor) ], axis=1)[::-1].copy()
+
+
+def channel_weights(channels):
+    """ BS.1770 channel weights, the 5.1 order are L R C LFE Ls Rs """
+    if channels == 5:
+        return numpy.array([1.0, 1.0, 1.0, 1.41, 1.41])
+    if channels == 6:
+        return numpy.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    return numpy.ones(channels)
+
+
+class _FirStream(object):
+    """ Overlap-add FFT convolution of the (frames, channels) blocks stream """
+
+    def __init__(self, h, channels):
+        self.h = numpy.asarray(h, dtype=numpy.float64)
+        self.tail = numpy.zeros((len(self.h) - 1, channels))
+        self._spectrum = {}
+
+    def process(self, x):
+        n = len(x)
+        size = 1 << int(math.ceil(math.log2(n + len(self.h) - 1)))
+        if size not in self._spectrum:
+            self._spectrum[size] = numpy.fft.rfft(self.h, size)
+        y = numpy.fft.irfft(numpy.fft.rfft(x, size, axis=0) * self._spectrum[size][:, None], size, axis=0)
+        y = y[:n + len(self.tail)]
+        y[:len(self.tail)] += self.tail
+        # the convolution tail are added to the next blocks
+        self.tail = y[n:].copy()
+        return y[:n]
+
+
+class _TruePeak(object):
+    """ Peak of the oversampled signal, the polyphase filter are applied to the
+        sliding windows of the every channel by the matrix product
+    """
+
+    def __init__(self, channels):
+        self.phases = _oversampling_phases()
+        self.history = numpy.zeros((len(self.phases) - 1, channels))
+        self.peak = 0.0
+
+    def process(self, block):
+        x = numpy.concatenate((self.history, block))
+        taps = len(self.phases)
+        for ch in range(x.shape[1]):
+            c = numpy.ascontiguousarray(x[:, ch])
+            windows = as_strided(c, shape=(len(block), taps), strides=(c.strides[0], c.strides[0]), writeable=False)
+            self.peak = max(self.peak, float(numpy.max(numpy.abs(windows @ self.phases))))
+        self.history = x[len(block):]
+
+
+class _HopSums(object):
+    """ Sums of the per-frame values for the every complete hop of frames """
+
+    def __init__(self, hop):
+        self.hop = hop
+        self.rest = numpy.zeros(0)
+        self.sums = []
+
+    def add(self, values):
+        values = numpy.concatenate((self.rest, values)) if len(self.rest) else values
+        count = len(values) // self.hop
+        if count:
+            self.sums.append(values[:count * self.hop].reshape(count, self.hop).sum(axis=1))
+        self.rest = values[count * self.hop:]
+
+    def array(self, with_rest=False):
+        sums = self.sums + ([ numpy.array([self.rest.sum()]) ] if with_rest and len(self.rest) else [])
+        return numpy.concatenate(sums) if len(sums) else numpy.zeros(0)
+
+
+class LoudnessMeter(object):
+    """ Streaming meter of the float (frames, channels) blocks """
+
+    def __init__(self, samplerate, channels):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.frames = 0
+        self.peak = 0.0
+        self.true_peak = 0.0
+        self._weights = channel_weights(channels)
+        self._k_filter = _FirStream(_k_weighting_response(samplerate), channels)
+        self._true_peak = _TruePeak(channels)
+        self._rms = _HopSums(RMS_HOP)
+        self._loudness = _HopSums(int(round(samplerate * 0.1)))
+
+    def process(self, block):
+        block = numpy.asarray(block, dtype=numpy.float64)
+        if not len(block):
+            return
+        self.frames += len(block)
+        self.peak = max(self.peak, float(numpy.max(numpy.abs(block))))
+        # py-neil-vst compatible RMS
+        self._rms.add(numpy.sum(numpy.square(block), axis=1))
+        # true peak of the interpolated signal
+        self._true_peak.process(block)
+        self.true_peak = max(self.peak, self._true_peak.peak)
+        # K-weighted channels power for the loudness gating blocks
+        weighted = self._k_filter.process(block)
+        self._loudness.add(numpy.square(weighted) @ self._weights)
+
+    # -------------------------------------------------------------------------
+
+    def _rms_legacy(self):
+        """ Mean of the overlapped windows RMS, same as py-neil-vst measures """
+        sums = self._rms.array(with_rest=True)
+        if not len(sums):
+            return 0.0
+        # the window starts at the every hop while it has the new frames
+        count = max(1, int(math.ceil(self.frames / RMS_HOP)) - 1)
+        starts = numpy.arange(count) * RMS_HOP
+        lengths = numpy.minimum(RMS_WINDOW, self.frames - starts)
+        power = sums[:count] + numpy.append(sums[1:count + 1], numpy.zeros(count - len(sums[1:count + 1])))
+        return float(numpy.mean(numpy.sqrt(power / (lengths * self.channels))))
+
+    def _gated_blocks(self, hops):
+        """ Return the mean power of the 'hops' long blocks with 100 ms step """
+        sums = self._loudness.array()
+        if len(sums) < hops:
+            return numpy.zeros(0)
+        cumsum = numpy.concatenate(([0.0], numpy.cumsum(sums)))
+        return (cumsum[hops:] - cumsum[:-hops]) / (hops * self._loudness.hop)
+
+    def integrated_loudness(self):
+        power = self._gated_blocks(4)
+        power = power[_lufs(numpy.maximum(power, 1e-20)) > ABSOLUTE_GATE_LUFS]
+        if not len(power):
+            return float("-inf")
+        relative_gate = _lufs(numpy.mean(power)) - 10.0
+        power = power[_lufs(power) > relative_gate]
+        return float(_lufs(numpy.mean(power)))
+
+    def loudness_range(self):
+        power = self._gated_blocks(30)
+        power = power[_lufs(numpy.maximum(power, 1e-20)) > ABSOLUTE_GATE_LUFS]
+        if not len(power):
+            return 0.0
+        relative_gate = _lufs(numpy.mean(power)) - 20.0
+        loudness = _lufs(power)
+        loudness = loudness[loudness > relative_gate]
+        if not len(loudness):
+            return 0.0
+        low, high = numpy.percentile(loudness, [10, 95])
+        return float(high - low)
+
+    def result(self):
+        rms = self._rms_legacy()
+        return {
+            "duration": self.frames / self.samplerate,
+            "rms": rms,
+            "rms_db": _db(rms) + RMS_DB_CORRECTION,
+            "peak": self.peak,
+            "peak_db": _db(self.peak),
+            "true_peak_db": _db(self.true_peak),
+            "integrated_lufs": self.integrated_loudness(),
+            "lra_lu": self.loudness_range()
+        }
+
+
+def measure_file(filepath, block_size=65536):
+    """ Measure the audio file, return the result dict """
+    from neil_vst_gui.audio_map import open_blocks
+    from neil_vst_gui.watchdog import heartbeat
+
+    with open_blocks(filepath) as f:
+        meter = LoudnessMeter(f.samplerate, f.channels)
+        for block in f.blocks(block_size, dtype='float32'):
+            meter.process(block)
+            # the normalize measure of the worker are the progress too
+            heartbeat.beat()
+    return meter.result()
+
+
+def result_text(filepath, result):
+    return "Measured for '%s' - [ RMS: %.2f dB, Peak: %.2f dB, True peak: %.2f dBTP, Integrated: %.2f LUFS, LRA: %.2f LU ]" % (
+        os.path.basename(filepath), result["rms_db"], result["peak_db"], result["true_peak_db"], result["integrated_lufs"], result["lra_lu"])
+
+
+def measure_files(filepaths, threads=None, on_result=None, block_size=65536):
+    """ Measure the files on the thread pool, 'on_result(filepath, result, error)'
+        are called for the every file. Return {filepath: result or None}
+    """
+    results = {}
+
+    def measure(filepath):
+        try:
+            results[filepath] = measure_file(filepath, block_size)
+            error = None
+        except Exception as e:
+            results[filepath] = None
+            error = str(e)
+        if on_result is not None:
+            on_result(filepath, results[filepath], error)
+
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count() or 1) as executor:
+        list(executor.map(measure, filepaths))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-t', '--threads', type=int, default=os.cpu_count() or 1, help='measure threads (default: %(default)s)')
+    parser.add_argument('--json', action="store_true", help='print the results as JSON lines')
+    parser.add_argument('files', nargs='+', help='input audio files or globs')
+    args = parser.parse_args(argv)
+
+    from neil_vst_gui.batch import input_files
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logger = logging.getLogger("Measure")
+
+    def on_result(filepath, result, error):
+        if error is not None:
+            logger.error("%s - %s" % (os.path.basename(filepath), error))
+        elif args.json:
+            sys.stdout.write(json.dumps(dict(result, file=filepath)) + "\n")
+            sys.stdout.flush()
+        else:
+            logger.info(result_text(filepath, result))
+
+    results = measure_files(input_files(args.files), args.threads, on_result)
+    return 0 if all(r is not None for r in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import os
+import sys
+import ctypes
+
+
+MB = 1024 * 1024
+
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t)
+        ]
+
+    class _MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", wintypes.DWORD),
+            ("dwMemoryLoad", wintypes.DWORD),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)
+        ]
+
+
+def _proc_status_kb(path, keys):
+    values = {}
+    with open(path, "r") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in keys:
+                values[name] = int(value.split()[0]) * 1024
+    return values
+
+
+def process_memory(pid):
+    """ Return (rss, peak rss) of the process in bytes, (None, None) if unknown.
+        The peak are the OS high-water mark (Linux VmHWM, Windows peak working
+        set), None if the OS does not report it.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            values = _proc_status_kb("/proc/%d/status" % pid, ("VmRSS", "VmHWM"))
+            return values.get("VmRSS"), values.get("VmHWM")
+        if psutil is not None:
+            info = psutil.Process(pid).memory_info()
+            # the peak working set are reported on Windows only
+            return info.rss, getattr(info, "peak_wset", None)
+        if sys.platform == "win32":
+            # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+            handle = ctypes.windll.kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+            if not handle:
+                return None, None
+            counters = _PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            try:
+                if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                    return None, None
+            finally:
+                ctypes.windll.kernel32.CloseHandle(handle)
+            return counters.WorkingSetSize, counters.PeakWorkingSetSize
+    except Exception:
+        pass
+    return None, None
+
+
+def available_memory():
+    """ Return the system available physical memory in bytes, None if unknown """
+    try:
+        if psutil is not None:
+            return psutil.virtual_memory().available
+        if sys.platform == "win32":
+            status = _MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(status)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullAvailPhys
+        return _proc_status_kb("/proc/meminfo", ("MemAvailable",)).get("MemAvailable")
+    except Exception:
+        return None
+
+
+class MemoryAdmission(object):
+    """ Admit the new worker process only while the memory budget allows.
+        The worker cost are estimated by the maximum peak RSS of the already
+        measured workers, the just started workers are counted with the
+        estimate until they grow up to it.
+    """
+
+    def __init__(self, budget_mb=0, reserve_mb=1024, worker_estimate_mb=512):
+        # budget 0 - limited by the system available memory only
+        self.budget = int(budget_mb * MB)
+        self.reserve = int(reserve_mb * MB)
+        self.worker_estimate = int(worker_estimate_mb * MB)
+        self.peak_max = 0
+        self.workers = {}
+        self.available = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Create from the "memory_budget" settings dict, None if disabled """
+        if not settings or not settings.get("enable", False):
+            return None
+        return cls(
+            budget_mb=settings.get("budget_mb", 0),
+            reserve_mb=settings.get("reserve_mb", 1024),
+            worker_estimate_mb=settings.get("worker_estimate_mb", 512)
+        )
+
+    # -------------------------------------------------------------------------
+
+    def update(self, workers):
+        """ Sample the running workers memory """
+        for w in workers:
+            if w.pid is None:
+                continue
+            rss, peak = process_memory(w.pid)
+            if rss is None:
+                continue
+            state = self.workers.setdefault(w.pid, {"file": w.in_file, "rss": 0, "peak": 0})
+            state["rss"] = rss
+            # without the OS high-water mark it are the largest sampled RSS, the short spikes are missed
+            state["sampled"] = peak is None
+            state["peak"] = max(state["peak"], peak or 0, rss)
+            self.peak_max = max(self.peak_max, state["peak"])
+        self.available = available_memory()
+
+    def release(self, worker):
+        """ Forget the finished worker, return its peak RSS in bytes """
+        state = self.workers.pop(worker.pid, None)
+        return state["peak"] if state is not None else None
+
+    def estimate(self):
+        return max(self.peak_max, self.worker_estimate)
+
+    def admit(self, running):
+        """ Return True if one more worker fits to the budget """
+        if not len(running):
+            return True
+        need = self.estimate()
+        states = [ self.workers.get(w.pid, {"rss": 0, "peak": 0}) for w in running ]
+        if self.budget and sum(max(s["peak"], need) for s in states) + need > self.budget:
+            return False
+        if self.available is not None:
+            # the young workers memory growth are not yet seen in the available memory
+            growth = sum(max(need - s["rss"], 0) for s in states)
+            if self.available - growth - need < self.reserve:
+                return False
+        return True
+
+    def status(self):
+        """ Return the per-worker memory text for the UI """
+        items = [ "%s %d MB (%s %d MB)" % (os.path.basename(s["file"]), s["rss"] // MB,
+                                           "sampled peak" if s.get("sampled") else "peak", s["peak"] // MB)
+                  for s in list(self.workers.values()) ]
+        if self.available is not None:
+            items.append("available %d MB" % (self.available // MB))
+        return " | ".join(items)
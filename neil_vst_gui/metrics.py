@@ -0,0 +1,234 @@
+import os
+import json
+import threading
+from time import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from neil_vst_gui.memory_monitor import process_memory, MB
+
+
+DEFAULT_PORT = 9108
+
+
+class BatchMetrics(object):
+    """ Batch progress counters, updated by the MainWorker file events """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset([])
+
+    def reset(self, in_files):
+        with self.lock:
+            self.started = time()
+            self.files = { f: {"duration": 0.0, "frames": 0} for f in in_files }
+            self.states = {}
+            self.counts = {"done": 0, "failed": 0, "skipped": 0}
+            self.audio_seconds = 0.0
+            self.frames = 0
+
+    def infos(self, in_files, infos):
+        """ Set the files duration and frames from the probe infos """
+        with self.lock:
+            for f, info in zip(in_files, infos):
+                if info:
+                    self.files[f] = {"duration": info["duration"], "frames": info["frames"]}
+
+    def event(self, event, filepath):
+        with self.lock:
+            state = self.states.get(filepath)
+            if event == "start":
+                self.states[filepath] = "active"
+                return
+            if event not in self.counts or state in self.counts:
+                return
+            self.states[filepath] = event
+            self.counts[event] += 1
+            if event == "done":
+                info = self.files.get(filepath, {})
+                self.audio_seconds += info.get("duration", 0.0)
+                self.frames += info.get("frames", 0)
+
+    # -------------------------------------------------------------------------
+
+    def snapshot(self, worker=None):
+        """ Return the metrics dict, the queue and the workers are taken from
+            the MainWorker
+        """
+        now = time()
+        running = list(worker.running) if worker is not None else []
+        pending = len(worker.pending) if worker is not None else 0
+        with self.lock:
+            elapsed = max(now - self.started, 1e-6)
+            remaining = sum(self.files.get(f, {}).get("duration", 0.0)
+                            for f in self.files if self.states.get(f) not in self.counts)
+            realtime_factor = self.audio_seconds / elapsed
+            data = {
+                "time": now,
+                "started": self.started,
+                "elapsed": elapsed,
+                "files_total": len(self.files),
+                "files_done": self.counts["done"],
+                "files_failed": self.counts["failed"],
+                "files_skipped": self.counts["skipped"],
+                "files_active": sum(1 for s in self.states.values() if s == "active"),
+                "queue_depth": pending,
+                "workers_active": len(running),
+                "audio_seconds_done": self.audio_seconds,
+                "frames_done": self.frames,
+                "frames_per_second": self.frames / elapsed,
+                "realtime_factor": realtime_factor,
+                "eta_seconds": remaining / realtime_factor if realtime_factor > 0 else None,
+                "active": worker.is_active() if worker is not None else False
+            }
+        workers = []
+        for w in running:
+            if w.pid is None:
+                continue
+            rss, peak = process_memory(w.pid)
+            workers.append({
+                "pid": w.pid,
+                "file": os.path.basename(w.in_file),
+                "rss_mb": rss // MB if rss is not None else None,
+                "peak_rss_mb": peak // MB if peak is not None else None
+            })
+        data["workers"] = workers
+        return data
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text(data):
+    """ Return the metrics snapshot in the Prometheus text format """
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append("# HELP neil_vst_%s %s" % (name, help_text))
+        lines.append("# TYPE neil_vst_%s %s" % (name, kind))
+        for labels, value in samples:
+            if value is None:
+                continue
+            label_text = ",".join('%s="%s"' % (k, _label(v)) for k, v in labels.items())
+            lines.append("neil_vst_%s%s %s" % (name, "{%s}" % label_text if label_text else "", repr(float(value))))
+
+    metric("batch_files", "gauge", "Batch files by state.",
+           [ ({"state": s}, data["files_" + s]) for s in ("total", "done", "failed", "skipped", "active") ])
+    metric("batch_queue_depth", "gauge", "Queued worker processes.", [ ({}, data["queue_depth"]) ])
+    metric("batch_workers_active", "gauge", "Running worker processes.", [ ({}, data["workers_active"]) ])
+    metric("batch_audio_seconds_done", "counter", "Rendered audio duration, seconds.", [ ({}, data["audio_seconds_done"]) ])
+    metric("batch_frames_done", "counter", "Rendered audio frames.", [ ({}, data["frames_done"]) ])
+    metric("batch_frames_per_second", "gauge", "Rendered frames per wall second.", [ ({}, data["frames_per_second"]) ])
+    metric("batch_realtime_factor", "gauge", "Rendered audio seconds per wall second.", [ ({}, data["realtime_factor"]) ])
+    metric("batch_eta_seconds", "gauge", "Estimated time to the batch end, seconds.", [ ({}, data["eta_seconds"]) ])
+    metric("batch_elapsed_seconds", "gauge", "Batch wall time, seconds.", [ ({}, data["elapsed"]) ])
+    metric("worker_rss_bytes", "gauge", "Worker process resident memory.",
+           [ ({"pid": w["pid"], "file": w["file"]}, w["rss_mb"] * MB if w["rss_mb"] is not None else None) for w in data["workers"] ])
+    metric("worker_peak_rss_bytes", "gauge", "Worker process peak resident memory.",
+           [ ({"pid": w["pid"], "file": w["file"]}, w["peak_rss_mb"] * MB if w["peak_rss_mb"] is not None else None) for w in data["workers"] ])
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        data = self.server.metrics_server.snapshot()
+        if path == "/metrics":
+            body = prometheus_text(data).encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path in ("", "/status", "/status.json"):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # the requests are not logged to the batch log
+        pass
+
+
+class MetricsServer(object):
+    """ Local HTTP endpoint ('/metrics' - Prometheus text, '/status' - JSON)
+        and the periodically rewritten JSON status file of the MainWorker batch
+    """
+
+    def __init__(self, worker, host="127.0.0.1", port=DEFAULT_PORT, status_file=None, interval=5.0, logger=None):
+        self.worker = worker
+        self.host = host
+        self.port = port
+        self.status_file = status_file
+        self.interval = interval
+        self.logger = logger
+        self.httpd = None
+        self.threads = []
+        self.stop_event = threading.Event()
+
+    @classmethod
+    def from_settings(cls, worker, settings, logger=None):
+        """ Create from the "metrics" settings dict, None if disabled """
+        if not settings or not settings.get("enable", False):
+            return None
+        return cls(
+            worker,
+            host=settings.get("host", "127.0.0.1"),
+            port=settings.get("port", DEFAULT_PORT),
+            status_file=settings.get("status_file") or None,
+            interval=settings.get("interval", 5.0),
+            logger=logger
+        )
+
+    def snapshot(self):
+        return self.worker.metrics.snapshot(self.worker)
+
+    def write_status(self):
+        tmp = self.status_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent="    ", ensure_ascii=False)
+        os.replace(tmp, self.status_file)
+
+    def _status_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write_status()
+            except OSError as e:
+                if self.logger is not None:
+                    self.logger.warning("Status file write error - %s" % str(e))
+
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        if self.port is not None:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            self.httpd.daemon_threads = True
+            self.httpd.metrics_server = self
+            # the real port for the port 0
+            self.port = self.httpd.server_address[1]
+            self.threads.append(threading.Thread(target=self.httpd.serve_forever, daemon=True))
+            if self.logger is not None:
+                self.logger.info("Metrics on http://%s:%d/metrics" % (self.host, self.port))
+        if self.status_file:
+            self.threads.append(threading.Thread(target=self._status_loop, daemon=True))
+        for t in self.threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        for t in self.threads:
+            t.join(1.0)
+        # the final state stays in the status file
+        if self.status_file:
+            try:
+                self.write_status()
+            except OSError:
+                pass
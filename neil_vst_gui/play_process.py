@@ -0,0 +1,353 @@
+import os
+import threading
+import logging
+import numpy
+from time import sleep
+from multiprocessing import Process, Pipe, RawArray, RawValue, current_process
+
+from PyQt5 import QtCore
+
+from neil_vst_gui.play_chain import PlayPluginChain
+from neil_vst_gui.process_logging import ProcessLogHandler
+
+
+class SharedAudioRing(object):
+    """ Single producer / single consumer float32 ring buffer in shared memory.
+        The render process writes blocks, the audio callback reads them.
+    """
+
+    def __init__(self, frames, channels):
+        self.frames = frames
+        self.channels = channels
+        self._data = RawArray('f', frames * channels)
+        self._write_index = RawValue('Q', 0)
+        self._read_index = RawValue('Q', 0)
+        self._done = RawValue('b', 0)
+        self._stop = RawValue('b', 0)
+        self._view = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_view"] = None
+        return state
+
+    def _data_view(self):
+        if self._view is None:
+            self._view = numpy.frombuffer(self._data, dtype=numpy.float32).reshape(self.frames, self.channels)
+        return self._view
+
+    # -------------------------------------------------------------------------
+
+    def available(self):
+        return self._write_index.value - self._read_index.value
+
+    def played(self):
+        return self._read_index.value
+
+    def write(self, block):
+        """ Write block, wait while ring is full. Return False if stopped """
+        view = self._data_view()
+        block_len = len(block)
+        while (self.frames - self.available()) < block_len:
+            if self._stop.value:
+                return False
+            sleep(0.002)
+        if self._stop.value:
+            return False
+        pos = self._write_index.value % self.frames
+        first = min(block_len, self.frames - pos)
+        view[pos:pos+first] = block[:first]
+        view[:block_len-first] = block[first:]
+        self._write_index.value += block_len
+        return True
+
+    def read(self, outdata):
+        """ Read up to len(outdata) frames, zero fill the rest. Return frames count """
+        view = self._data_view()
+        count = min(self.available(), len(outdata))
+        pos = self._read_index.value % self.frames
+        first = min(count, self.frames - pos)
+        outdata[:first] = view[pos:pos+first]
+        outdata[first:count] = view[:count-first]
+        outdata[count:] = 0
+        self._read_index.value += count
+        return count
+
+    # -------------------------------------------------------------------------
+
+    def set_done(self):
+        self._done.value = 1
+
+    def is_done(self):
+        return bool(self._done.value)
+
+    def stop(self):
+        self._stop.value = 1
+
+    def is_stopped(self):
+        return bool(self._stop.value)
+
+
+class PlayRenderProcess(Process):
+    """ Render the files list through the plugins chain to the shared ring one
+        after another, the next file are pre-rendered while the current plays.
+        The process has own plugins instances, the GUI chain parameters changes
+        are received by the 'control' pipe and applied between the blocks.
+    """
+
+    def __init__(self, pipe, ring, filenames, plugins_list, start=0, control=None, daemon=True, log_level=logging.INFO):
+        super().__init__()
+        self.pipe = pipe
+        self.ring = ring
+        self.filenames = filenames
+        self.plugins_list = plugins_list
+        self.start_frame = start
+        self.control = control
+        self.daemon = daemon
+        self.log_level = log_level
+        # ring write positions of the every file start
+        self.boundaries = RawArray('Q', len(filenames))
+        self.started = RawValue('i', 0)
+
+    def _logger_init(self):
+        # Create logger for process and connect it to common pipe
+        self.logger = logging.getLogger(current_process().name)
+        self.logger.setLevel(self.log_level)
+        if self.pipe is not None:
+            handler = ProcessLogHandler(self.pipe)
+        else:
+            handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(fmt='%(name)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'))
+        self.logger.addHandler(handler)
+
+    def _parameters_receive(self):
+        """ Apply the parameters changes {plugin index: {name: parameter}} """
+        while self.control is not None and self.control.poll():
+            try:
+                changes = self.control.recv()
+            except EOFError:
+                self.control = None
+                return
+            plugins = self.vst_chain.plugins()
+            for index, parameters in changes.items():
+                if index < len(plugins):
+                    self.vst_chain.plugin_parameters_set(plugins[index], parameters)
+
+    def _write(self, data):
+        self._parameters_receive()
+        # the file channels to the ring (stream) channels, mono are played on the all channels
+        if data.shape[1] != self.ring.channels:
+            data = data[:, [ ch % data.shape[1] for ch in range(self.ring.channels) ]]
+        if not self.ring.write(data):
+            self.vst_host.process_chain_stop()
+
+    def file_index(self, position):
+        """ Return index of the file playing at the ring position """
+        index = 0
+        for i in range(self.started.value):
+            if self.boundaries[i] <= position:
+                index = i
+        return index
+
+    def run(self):
+        import soundfile
+        from neil_vst_gui.vst_chain import VSTChain
+
+        self._logger_init()
+        filename = self.filenames[0]
+        try:
+            vst_chain = self.vst_chain = VSTChain(logger=self.logger)
+            vst_chain.plugins_load(self.plugins_list)
+            self.vst_host = vst_chain.host()
+            start = self.start_frame
+            for i, filename in enumerate(self.filenames):
+                if self.ring.is_stopped():
+                    break
+                self.boundaries[i] = self.ring._write_index.value
+                self.started.value = i + 1
+                self.vst_host.process_chain_start(
+                    filename, soundfile.info(filename).channels, vst_chain.plugins(), soundfile.blocks, self._write,
+                    frames=-1, start=start, stop=None
+                )
+                start = 0
+        except Exception as e:
+            self.logger.error("%s - %s" % (os.path.basename(filename), str(e)))
+        finally:
+            self.ring.set_done()
+
+
+class PlayProcessChain(PlayPluginChain):
+    """ Play the file with the plugins chain rendered in a separate process.
+        The rendered audio are handed to the audio callback through a shared
+        memory ring buffer of "render_ahead" seconds. With a playlist the files
+        are played in order without gaps, a new audio stream are opened only
+        when the sample rate or channels count changes. The GUI chain parameters
+        changes are sent by 'parameters_update' and heard after the render
+        ahead time, the plugins added / removed while playing are not heard.
+    """
+
+    file_changed_signal = QtCore.pyqtSignal(str)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pipe = kwargs.get("pipe", None)
+        self.render_ahead = kwargs.get("render_ahead", 2.0)
+        self.render_process = None
+        self.ring = None
+        # the parameters sent to the render process and the pipe to it
+        self.plugins_list = {}
+        self.control = None
+        self.control_lock = threading.Lock()
+
+    def _play_callback(self, outdata, frames, time, status):
+        if status.output_underflow:
+            self.logger.debug('Audio stream buffer underflow: increase blocksize?')
+        count = self.ring.read(outdata)
+        if count < frames:
+            if self.ring.is_done():
+                raise self.sounddevice.CallbackStop
+            self.logger.debug('Audio stream buffer is empty: increase render ahead?')
+
+    @staticmethod
+    def _render_process_end(render_process):
+        render_process.join(1.0)
+        if render_process.is_alive():
+            render_process.terminate()
+
+    def _release(self):
+        if self.ring is not None:
+            self.ring.stop()
+        with self.control_lock:
+            control, self.control = self.control, None
+        if control is not None:
+            control.close()
+        render_process, self.render_process = self.render_process, None
+        if render_process is not None:
+            # the stopped process ends by itself, the GUI thread are not blocked by the join
+            threading.Thread(target=self._render_process_end, args=(render_process, ), daemon=True).start()
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+    def _play_files(self, filenames, infos, audio_device, channels, start):
+        # the end of this stream, the session 'play_event' are set by stop()
+        finished = threading.Event()
+        # the ring has the stream channels, the render process maps the file channels to them
+        self.ring = SharedAudioRing(max(int(infos[0].samplerate * self.render_ahead), self.blocksize * 4), channels)
+
+        start_frame = 0
+        if start > 0:
+            start_frame = int(infos[0].frames * start)
+        files_frames = [ max(info.frames, 1) for info in infos ]
+
+        control_receive, control_send = Pipe(duplex=False)
+        with self.control_lock:
+            render_process = self.render_process = PlayRenderProcess(
+                self.pipe, self.ring, filenames, self.plugins_list, start=start_frame, control=control_receive, log_level=self.log_level)
+            render_process.start()
+            self.control = control_send
+        control_receive.close()
+
+        self.stream = self.sounddevice.OutputStream(
+            samplerate=infos[0].samplerate,
+            blocksize=self.blocksize,
+            device=audio_device,
+            channels=channels,
+            dtype='float32',
+            callback=self._play_callback,
+            finished_callback=finished.set,
+            prime_output_buffers_using_stream_callback=True
+        )
+        # prefill render ahead window before the audio stream are started
+        while self.ring.available() < (self.ring.frames // 2) and not self.ring.is_done():
+            if self.play_event.wait(0.01):
+                break
+        # the stop while the setup could release before the process and the stream are set
+        if self.play_event.is_set():
+            self._release()
+            return
+        self.logger.info("START audio stream [ %s ]" % self.sounddevice.query_devices(self.stream.device, 'output')['name'])
+        self.stream.start()
+
+        file_index = 0
+        while not finished.wait(0.05) and not self.play_event.is_set():
+            played = self.ring.played()
+            index = render_process.file_index(played)
+            if index != file_index:
+                file_index = index
+                start_frame = 0
+                self.start_position = 0
+                self.file_changed_signal.emit(filenames[file_index])
+            position = start_frame + played - render_process.boundaries[file_index]
+            self.progress_signal.emit(position / files_frames[file_index])
+
+        self._release()
+
+    # -------------------------------------------------------------------------
+
+    def start(self, filename, audio_device, channels, plugins_list, start, playlist=()):
+        import sounddevice
+        import soundfile
+
+        self.sounddevice = sounddevice
+        self.start_position = start
+        self.filename = filename
+        # the stop of the whole playback, the gapless groups streams included
+        self.play_event = threading.Event()
+        self._is_active = True
+
+        filenames = [filename] + list(playlist)
+        infos = [ soundfile.info(f) for f in filenames ]
+        self.plugins_list = plugins_list
+
+        index = 0
+        while index < len(filenames) and not self.play_event.is_set():
+            # the files with the same format are played gapless by one stream
+            end = index + 1
+            while end < len(filenames) and \
+                    (infos[end].samplerate, infos[end].channels) == (infos[index].samplerate, infos[index].channels):
+                end += 1
+            if index:
+                self.file_changed_signal.emit(filenames[index])
+            self._play_files(filenames[index:end], infos[index:end], audio_device, channels, start)
+            start = 0
+            index = end
+
+        if not self.play_event.is_set():
+            self.stop()
+
+    def parameters_update(self, keys, plugins_params):
+        """ Send the changed parameters of the edited plugins {key: params} to
+            the render process, 'keys' are the GUI chain plugins keys - the
+            changed chain are not sent. Called from the GUI thread while playing.
+        """
+        if list(keys) != list(self.plugins_list.keys()):
+            return
+        changes = {}
+        for index, key in enumerate(keys):
+            if key not in plugins_params:
+                continue
+            sent = self.plugins_list[key]["params"]
+            changed = { k: v for k, v in plugins_params[key].items() if sent.get(k, {}).get("value") != v["value"] }
+            if len(changed):
+                changes[index] = changed
+                sent.update(changed)
+        if not len(changes):
+            return
+        with self.control_lock:
+            if self.control is None:
+                return
+            try:
+                self.control.send(changes)
+            except OSError:
+                # the render process are ended
+                pass
+
+    def stop(self):
+        self._is_active = False
+        if getattr(self, "play_event", None) is not None:
+            self.play_event.set()
+        self._release()
+        self.stop_signal.emit()
+        self.logger.info("STOP audio stream")
@@ -0,0 +1,133 @@
+import os
+import json
+import hashlib
+
+from neil_vst_gui.memory_monitor import MB
+
+
+def file_hash(filepath, chunk_size=MB):
+    """ Return sha1 of the file content """
+    h = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def prefix_fingerprints(plugins_list, buffer_size):
+    """ Return the fingerprints of the chain prefixes, the item K are of the
+        plugins 0..K with their parameters
+    """
+    h = hashlib.sha1(("buffer_size:%d" % buffer_size).encode("utf-8"))
+    fingerprints = []
+    for v in plugins_list.values():
+        entry = { k: v.get(k) for k in ("path", "shell_uid", "params") }
+        h.update(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        fingerprints.append(h.hexdigest())
+    return fingerprints
+
+
+class _CacheWriter(object):
+    """ Float32 RF64 writer of the one chain prefix output, the file appears
+        in the cache only complete
+    """
+
+    def __init__(self, filepath, samplerate, channels):
+        import soundfile
+
+        self.filepath = filepath
+        self.temp_filepath = "%s.%d.part" % (filepath, os.getpid())
+        self.file = soundfile.SoundFile(self.temp_filepath, mode='w', samplerate=samplerate, channels=channels,
+                                        format='RF64', subtype='FLOAT')
+
+    def write(self, block):
+        self.file.write(block)
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.temp_filepath, self.filepath)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_filepath):
+            os.remove(self.temp_filepath)
+
+
+class PrefixCache(object):
+    """ Disk cache of the chain prefixes output by the input file content and
+        the prefix plugins settings. The render starts from the deepest cached
+        prefix, so the change of the last plugins renders only them. The files
+        are evicted by the last use time while the cache are over the size.
+    """
+
+    def __init__(self, folder=None, max_gb=20.0, points=2):
+        if not folder:
+            from neil_vst_gui.schedule import cache_folder
+            folder = os.path.join(cache_folder(), "prefix_cache")
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.max_bytes = int(max_gb * 1024 * MB)
+        # the count of the deepest prefixes stored by the render
+        self.points = points
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Create from the "prefix_cache" settings dict, None if disabled """
+        if not settings or not settings.get("enable", False):
+            return None
+        return cls(
+            folder=settings.get("folder", ""),
+            max_gb=settings.get("max_gb", 20.0),
+            points=settings.get("points", 2)
+        )
+
+    def _path(self, input_hash, fingerprint):
+        return os.path.join(self.folder, "%s_%s.wav" % (input_hash[:20], fingerprint[:20]))
+
+    # -------------------------------------------------------------------------
+
+    def plan(self, in_filepath, plugins_list, buffer_size, frames):
+        """ Return (depth, cached file path or None, [(depth, file path)] to
+            store), the render runs the plugins from 'depth' to the end
+        """
+        import soundfile
+
+        input_hash = file_hash(in_filepath)
+        fingerprints = prefix_fingerprints(plugins_list, buffer_size)
+        depth, hit = 0, None
+        # the full chain output are the render output itself, it is not cached
+        for k in range(len(fingerprints) - 1, 0, -1):
+            path = self._path(input_hash, fingerprints[k - 1])
+            try:
+                if soundfile.info(path).frames != frames:
+                    continue
+                # the last use time for the eviction
+                os.utime(path)
+            except Exception:
+                continue
+            depth, hit = k, path
+            break
+        store = [ (k, self._path(input_hash, fingerprints[k - 1]))
+                  for k in range(max(depth + 1, len(fingerprints) - self.points), len(fingerprints)) ]
+        return depth, hit, store
+
+    def writer(self, filepath, samplerate, channels):
+        return _CacheWriter(filepath, samplerate, channels)
+
+    def trim(self):
+        """ Remove the least recently used files over the cache size """
+        files = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(f[1] for f in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                # the file are read by the other worker now
+                pass
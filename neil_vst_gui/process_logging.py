@@ -0,0 +1,13 @@
+import logging
+
+
+class ProcessLogHandler(logging.StreamHandler):
+    """docstring for ProcessLogHandler"""
+
+    def __init__(self, pipe, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pipe = pipe
+
+    def emit(self, record):
+        s = self.format(record)
+        self.pipe.send((s, record.levelname))
@@ -0,0 +1,166 @@
+import os
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+HISTORY_SAMPLES = 64
+
+
+def cache_folder():
+    """ Return the user folder for the probe cache and the render history """
+    folder = os.path.join(os.path.expanduser("~"), ".neil_vst_gui")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _json_load(filepath):
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _json_save(filepath, data):
+    """ Write the file by the replace of the unique temp file, the GUI and
+        the batch runs can save the same user cache file at once
+    """
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(filepath) + ".", suffix=".tmp", dir=os.path.dirname(filepath) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ProbeCache(object):
+    """ Audio files header info (duration, frames, format) cached by the file
+        path, size and mtime
+    """
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or os.path.join(cache_folder(), "probe_cache.json")
+        self.files = _json_load(self.filepath)
+        self.lock = threading.Lock()
+        self.changed = False
+
+    def info(self, path):
+        """ Return the file info dict, None if it is not an audio file """
+        from neil_vst_gui.audio_map import audio_info
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = "%d:%d" % (st.st_size, int(st.st_mtime))
+        with self.lock:
+            entry = self.files.get(path)
+        if entry is not None and entry.get("key") == key:
+            return entry
+        try:
+            info = audio_info(path)
+        except Exception:
+            return None
+        entry = {
+            "key": key,
+            "frames": info.frames,
+            "samplerate": info.samplerate,
+            "channels": info.channels,
+            "duration": info.duration
+        }
+        with self.lock:
+            self.files[path] = entry
+            self.changed = True
+        return entry
+
+    def probe(self, paths, threads=8):
+        """ Return the info list for the paths, the headers are read in threads """
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(self.info, paths))
+
+    def save(self):
+        if not self.changed:
+            return
+        with self.lock:
+            # the removed files are not kept
+            self.files = { k: v for k, v in self.files.items() if os.path.exists(k) }
+            _json_save(self.filepath, self.files)
+            self.changed = False
+
+
+class RealtimeHistory(object):
+    """ The render times of the earlier runs per plugins chain fingerprint
+        (buffer_tune.chain_fingerprint, the metadata and the buffer size are
+        not a part of it) and audio format, the file render time are
+        estimated as 'overhead + duration / speed'
+    """
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or os.path.join(cache_folder(), "realtime_history.json")
+        self.chains = _json_load(self.filepath)
+        self.lock = threading.Lock()
+
+    def _key(self, samplerate, channels):
+        return "%d:%d" % (samplerate, channels)
+
+    def record(self, fingerprint, samplerate, channels, duration, elapsed):
+        if duration <= 0 or elapsed <= 0:
+            return
+        with self.lock:
+            samples = self.chains.setdefault(fingerprint, {}).setdefault(self._key(samplerate, channels), [])
+            samples.append([duration, elapsed])
+            del samples[:-HISTORY_SAMPLES]
+
+    def _fit(self, samples):
+        """ Least squares 'elapsed = overhead + duration * k', return (overhead, k) """
+        n = len(samples)
+        sd = sum(s[0] for s in samples)
+        se = sum(s[1] for s in samples)
+        sdd = sum(s[0] * s[0] for s in samples)
+        sde = sum(s[0] * s[1] for s in samples)
+        den = n * sdd - sd * sd
+        if n > 1 and den > 1e-9 * sdd:
+            k = (n * sde - sd * se) / den
+            overhead = (se - k * sd) / n
+            if k > 0 and overhead >= 0:
+                return overhead, k
+        return 0.0, se / sd
+
+    def realtime_factor(self, fingerprint, samplerate, channels):
+        """ Return the audio seconds rendered per second, None if unknown """
+        with self.lock:
+            chain = self.chains.get(fingerprint, {})
+            samples = chain.get(self._key(samplerate, channels)) or sum(chain.values(), [])
+        if not len(samples):
+            return None
+        return 1.0 / self._fit(samples)[1]
+
+    def estimate(self, fingerprint, samplerate, channels, duration):
+        """ Return the render time estimate in seconds, the duration itself
+            (realtime) for the unknown chain
+        """
+        with self.lock:
+            chain = self.chains.get(fingerprint, {})
+            samples = chain.get(self._key(samplerate, channels)) or sum(chain.values(), [])
+        if not len(samples):
+            return duration
+        overhead, k = self._fit(samples)
+        return overhead + duration * k
+
+    def save(self):
+        with self.lock:
+            _json_save(self.filepath, self.chains)
+
+
+def longest_first(items, cost):
+    """ Return the items sorted by the 'cost(item)' descending - the longest
+        processing time first order keeps the parallel batch makespan short
+    """
+    return sorted(items, key=cost, reverse=True)
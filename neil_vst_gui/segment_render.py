@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+import argparse
+import numpy
+from concurrent.futures import ProcessPoolExecutor
+
+from neil_vst_gui.chain_render import ChainRenderer, normalize_settings, render_file
+from neil_vst_gui.watchdog import heartbeat
+
+
+def plan_segments(frames, samplerate, segment_sec=600.0, preroll_sec=5.0, crossfade_sec=0.05, latency=0):
+    """ Split file frames to the segments list. Every segment renders from the
+        'read_start' position, the warm-up frames before 'out_start' are
+        discarded, the output covers [out_start, out_stop) where the last
+        'crossfade' frames are overlapped with the next segment head.
+        The plugins latency are added to the pre-roll.
+    """
+    segment = max(int(segment_sec * samplerate), 1)
+    crossfade = int(crossfade_sec * samplerate)
+    preroll = int(preroll_sec * samplerate) + latency + crossfade
+    assert segment > (crossfade * 2), "Segment length must be more than two crossfades"
+
+    bounds = list(range(0, frames, segment)) + [frames]
+    # the last short segment are joined to the previous one
+    if len(bounds) > 2 and (bounds[-1] - bounds[-2]) <= crossfade * 2:
+        del bounds[-2]
+
+    segments = []
+    for i in range(len(bounds) - 1):
+        out_start = bounds[i]
+        out_stop = min(bounds[i+1] + crossfade, frames) if i < len(bounds) - 2 else frames
+        segments.append({
+            "index": i,
+            "read_start": max(out_start - preroll, 0),
+            "out_start": out_start,
+            "out_stop": out_stop,
+            "crossfade": crossfade if i else 0
+        })
+    return segments
+
+
+def render_segment(settings, in_filepath, seg_filepath, segment, buffer_size, logger=None):
+    """ Render one segment through its own chain instance to float WAV file """
+    import soundfile
+
+    logger = logger or logging.getLogger(__name__)
+    start = time.time()
+
+    in_file = soundfile.SoundFile(in_filepath, mode='r', closefd=True)
+    renderer = ChainRenderer.from_settings(settings["plugins_list"], in_file.samplerate, in_file.channels, buffer_size, logger)
+    seg_file = soundfile.SoundFile(
+        seg_filepath, mode='w', samplerate=in_file.samplerate, channels=in_file.channels, subtype='FLOAT', format='WAV', closefd=True)
+
+    position = segment["read_start"]
+    in_file.seek(position)
+    while position < segment["out_stop"]:
+        block = in_file.read(min(buffer_size, segment["out_stop"] - position), dtype='float32', always_2d=True)
+        if not len(block):
+            break
+        out = renderer.process(block)
+        # discard the warm-up region
+        skip = max(segment["out_start"] - position, 0)
+        if skip < len(out):
+            seg_file.write(out[skip:])
+        position += len(block)
+        heartbeat.beat()
+
+    in_file.close()
+    seg_file.close()
+    logger.info("[ SEGMENT %d ] - %s rendered in %.3f sec" % (segment["index"], os.path.basename(in_filepath), time.time() - start))
+
+
+def stitch_segments(segments, seg_filepaths, out_filepath, samplerate, channels, subtype, buffer_size, tags=None, logger=None):
+    """ Join the rendered segments with linear crossfade to the output file """
+    import soundfile
+
+    logger = logger or logging.getLogger(__name__)
+    out_file = soundfile.SoundFile(
+        out_filepath, mode='w', samplerate=samplerate, channels=channels, subtype=subtype, closefd=True)
+    for k, v in (tags or {}).items():
+        if not v:
+            continue
+        try:
+            setattr(out_file, k, v)
+        except RuntimeError as e:
+            logger.debug("tag '%s' are not supported for '%s' - %s" % (k, os.path.basename(out_filepath), str(e)))
+
+    tail = None
+    for i, segment in enumerate(segments):
+        seg_file = soundfile.SoundFile(seg_filepaths[i], mode='r', closefd=True)
+        crossfade = segment["crossfade"]
+        if crossfade and tail is not None:
+            head = seg_file.read(crossfade, dtype='float32', always_2d=True)
+            fade_in = numpy.linspace(0.0, 1.0, len(head), endpoint=False, dtype=numpy.float32)[:, None]
+            out_file.write(tail[:len(head)] * (1.0 - fade_in) + head * fade_in)
+        # the next segment crossfade frames are kept as the tail
+        next_crossfade = segments[i+1]["crossfade"] if i < len(segments) - 1 else 0
+        body = seg_file.frames - seg_file.tell() - next_crossfade
+        while body > 0:
+            block = seg_file.read(min(buffer_size, body), dtype='float32', always_2d=True)
+            if not len(block):
+                break
+            out_file.write(block)
+            body -= len(block)
+        tail = seg_file.read(next_crossfade, dtype='float32', always_2d=True) if next_crossfade else None
+        seg_file.close()
+
+    out_file.close()
+
+
+def _render_segment_job(settings, in_filepath, seg_filepath, segment, buffer_size):
+    render_segment(settings, in_filepath, seg_filepath, segment, buffer_size)
+    return seg_filepath
+
+
+def render_file_segmented(settings, in_filepath, out_filepath, buffer_size, logger, jobs=None, tags=None,
+                          segment_sec=600.0, preroll_sec=5.0, crossfade_sec=0.05, latency=0):
+    """ Render one long file on the several cores, segment per process """
+    import soundfile
+
+    start = time.time()
+    settings = normalize_settings(settings, in_filepath, logger)
+    settings["normalize"] = {}
+
+    info = soundfile.info(in_filepath)
+    segments = plan_segments(info.frames, info.samplerate, segment_sec, preroll_sec, crossfade_sec, latency)
+    seg_filepaths = [ "%s.seg%03d.wav" % (out_filepath, s["index"]) for s in segments ]
+    logger.info("[ SEGMENTS START ] - %s, %d segments" % (os.path.basename(in_filepath), len(segments)))
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [ executor.submit(_render_segment_job, settings, in_filepath, seg_filepaths[i], s, buffer_size)
+                        for i, s in enumerate(segments) ]
+            [ f.result() for f in futures ]
+        stitch_segments(segments, seg_filepaths, out_filepath, info.samplerate, info.channels, info.subtype, buffer_size, tags, logger)
+    finally:
+        for f in seg_filepaths:
+            if os.path.exists(f):
+                os.remove(f)
+
+    end_time = time.time() - start
+    logger.info("[ SEGMENTS COMPLITE ] - from %s - saved to - %s " % (os.path.basename(in_filepath), os.path.basename(out_filepath)))
+    logger.info("[ END ] - Elapsed time: [ %.3f | %.3f ]" % (end_time, end_time/60))
+
+
+def verify_segmented(settings, in_filepath, buffer_size, logger, **kwargs):
+    """ Render the file serial and segmented, return max absolute difference """
+    import soundfile
+
+    base = os.path.splitext(in_filepath)[0]
+    serial_filepath = base + ".verify_serial.wav"
+    segmented_filepath = base + ".verify_segmented.wav"
+    try:
+        render_file(settings, in_filepath, serial_filepath, buffer_size, logger)
+        render_file_segmented(settings, in_filepath, segmented_filepath, buffer_size, logger, **kwargs)
+        max_diff = 0.0
+        with soundfile.SoundFile(serial_filepath) as a, soundfile.SoundFile(segmented_filepath) as b:
+            if a.frames != b.frames:
+                logger.warning("Frames count differs: serial %d, segmented %d" % (a.frames, b.frames))
+            while True:
+                block_a = a.read(buffer_size, always_2d=True)
+                block_b = b.read(buffer_size, always_2d=True)
+                count = min(len(block_a), len(block_b))
+                if not count:
+                    break
+                max_diff = max(max_diff, float(numpy.max(numpy.abs(block_a[:count] - block_b[:count]))))
+    finally:
+        for f in (serial_filepath, segmented_filepath):
+            if os.path.exists(f):
+                os.remove(f)
+
+    max_diff_db = 20 * numpy.log10(max_diff) if max_diff > 0 else float("-inf")
+    logger.info("Segmented vs serial render max difference: %.9f (%.2f dB)" % (max_diff, max_diff_db))
+    return max_diff
+
+
+def main():
+    import json
+
+    parser = argparse.ArgumentParser(description="Verify the segmented render against the serial render")
+    parser.add_argument('-j', '--job', type=str, required=True, help='JSON job file')
+    parser.add_argument('-b', '--buffersize', type=int, default=8192, help='VST buffer size (default: %(default)s)')
+    parser.add_argument('-s', '--segment', type=float, default=600.0, help='segment length, sec (default: %(default)s)')
+    parser.add_argument('-p', '--preroll', type=float, default=5.0, help='segment pre-roll, sec (default: %(default)s)')
+    parser.add_argument('-x', '--crossfade', type=float, default=0.05, help='crossfade length, sec (default: %(default)s)')
+    parser.add_argument('-l', '--latency', type=int, default=0, help='plugins chain latency, frames (default: %(default)s)')
+    parser.add_argument('files', nargs='+', help='input audio files')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(name)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger("SegmentVerify")
+
+    with open(args.job, "r") as f:
+        settings = json.load(f)
+    for in_filepath in args.files:
+        verify_segmented(settings, in_filepath, args.buffersize, logger, segment_sec=args.segment,
+                         preroll_sec=args.preroll, crossfade_sec=args.crossfade, latency=args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import sys
+from time import perf_counter
+
+
+class StartupProfile(object):
+    """ Startup stages timings, enabled by '--profile-startup' argument or
+        NEIL_VST_GUI_PROFILE environment variable
+    """
+
+    def __init__(self, enabled=False, t0=None):
+        self.enabled = enabled
+        self.t0 = perf_counter() if t0 is None else t0
+        self.marks = []
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, perf_counter()))
+
+    def report(self):
+        lines = []
+        last = self.t0
+        for name, t in self.marks:
+            lines.append("%-32s +%8.1f ms  [ %8.1f ms ]" % (name, (t - last) * 1000, (t - self.t0) * 1000))
+            last = t
+        return lines
+
+    def print_report(self, logger=None):
+        if not self.enabled:
+            return
+        for line in ["STARTUP PROFILE:"] + self.report():
+            if logger is not None:
+                logger.info(line)
+            sys.stderr.write(line + "\n")
@@ -6,14 +6,86 @@ import logging
 import argparse
 import datetime
 import base64
+import functools
+from io import BytesIO
 from string import Formatter
-from mutagen.oggvorbis import OggVorbis
-from mutagen.flac import FLAC, Picture
-from mutagen.wave import WAVE
-from PIL import ImageFont, ImageDraw,  Image
 
 
-__version__ = "1.25"
+__version__ = "1.26"
+
+
+PICTURE_MIME = {
+    "PNG": u"image/png",
+    "JPEG": u"image/jpeg",
+    "BMP": u"image/bmp",
+    "GIF": u"image/gif"
+}
+
+PICTURE_DEPTH = {
+    "1": 1, "L": 8, "P": 8, "RGB": 24, "RGBA": 32, "CMYK": 32
+}
+
+# the encoder tag of the picture size placeholder, libsndfile writes only the known tags
+PICTURE_RESERVE_TAG = "license"
+
+# the WAV tags are the ID3 chunk (as the tag only jobs write it), not the encoder LIST/INFO
+ID3_FRAMES = {
+    "tracknumber": "TRCK",
+    "album": "TALB",
+    "title": "TIT2",
+    "artist": "TPE1",
+    "genre": "TCON",
+    "date": "TDRC"
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _picture_block(image_filepath, mtime, max_size, quality):
+    """ Encode image file to the base64 FLAC picture block, optionally downscaled
+        to 'max_size' pixels for the longest side. Cached by file path and mtime.
+    """
+    from mutagen.flac import Picture
+    from PIL import Image
+
+    h = open(image_filepath, "rb")
+    data = h.read()
+    h.close()
+
+    image = Image.open(BytesIO(data))
+    image_format = image.format if image.format in PICTURE_MIME else "PNG"
+
+    if max_size and max(image.size) > max_size:
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        if image_format not in ("PNG", "JPEG"):
+            image_format = "PNG"
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        out = BytesIO()
+        if image_format == "JPEG":
+            image.save(out, format="JPEG", quality=quality, optimize=True)
+        else:
+            image.save(out, format="PNG", optimize=True)
+        data = out.getvalue()
+    elif image_format != image.format:
+        # unknown format for the players, recompress it to png
+        out = BytesIO()
+        image.save(out, format="PNG", optimize=True)
+        data = out.getvalue()
+
+    width, height = image.size
+
+    picture = Picture()
+    picture.data = data
+    picture.type = 18
+    picture.desc = u"A bright coloured fish"
+    picture.mime = PICTURE_MIME[image_format]
+    picture.width = width
+    picture.height = height
+    picture.depth = PICTURE_DEPTH.get(image.mode, 24)
+
+    picture_data = picture.write()
+    encoded_data = base64.b64encode(picture_data)
+    return encoded_data.decode("ascii")
 
 
 class TagWriter(object):
@@ -28,40 +100,156 @@ class TagWriter(object):
             logger.addHandler(handler)
         self.logger = logger
 
-    def picture_write(self, image_filepath):
-        """ """
-        h = open(image_filepath, "rb")
-        data = h.read()
-        h.close()
+    def picture_write(self, image_filepath, max_size=0, quality=90):
+        """ Return the 'metadata_block_picture' value for image file, the image
+            work are done only once for the same file and parameters
+        """
+        return _picture_block(image_filepath, os.path.getmtime(image_filepath), max_size, quality)
 
-        width, height = ( Image.open(image_filepath).convert('RGBA') ).size
+    def tags(self, filepath, author, artist, sound_designer, album, genre, date, comment):
+        """ Return the text tags dict for file, known before the file are encoded """
+        file_basename = os.path.basename(filepath)
+        # the file name without the number gets the empty track number
+        numbers = re.findall(r"[-+]?\d*\.\d+|\d+", file_basename)
+        track_num = numbers[0].lstrip("0") if len(numbers) else ""
 
-        picture = Picture()
-        picture.data = data
-        picture.type = 18
-        picture.desc = u"A bright coloured fish"
-        picture.mime = u"image/png"
-        picture.width = width
-        picture.height = height
-        picture.depth = 32
+        class CommentDefault(dict):
+            def __missing__(self, key):
+                return ""
 
-        picture_data = picture.write()
-        encoded_data = base64.b64encode(picture_data)
-        vcomment_value = encoded_data.decode("ascii")
+        return {
+            'tracknumber': track_num,
+            'album': "",
+            'title': '[ глава %s ] - "%s" - %s' % (track_num, album, author),
+            'artist': artist,
+            'comment': comment.format_map(
+                CommentDefault(
+                    author=author,
+                    artist=artist,
+                    sound_designer=sound_designer
+                )
+            ),
+            'genre': genre,
+            'date': date
+        }
+
+    def prepare(self, filepath, metadata, picture=None):
+        """ Return (tags, encoder tags) of the out file for the job metadata,
+            (None, None) without the metadata or if the tags are failed - the
+            file are rendered untagged then
+        """
+        if not len(metadata):
+            return None, None
+        try:
+            tags = self.tags(filepath, *metadata[:-1])
+            return tags, self.encoder_tags(filepath, tags, metadata[-1], picture)
+        except Exception as e:
+            self.logger.warning("%s - tags are not written - %s" % (os.path.basename(filepath), str(e)))
+            return None, None
+
+    def complete(self, filepath, tags, image, picture=None):
+        """ The 'picture_update' of the rendered file, the tag error are logged
+            only, the rendered audio are kept
+        """
+        if tags is None:
+            return
+        try:
+            self.picture_update(filepath, tags, image, picture)
+        except Exception as e:
+            self.logger.warning("%s - tags are not written - %s" % (os.path.basename(filepath), str(e)))
+
+    def _picture(self, image, picture=None):
+        if picture is None and image is not None and os.path.exists(image):
+            picture = self.picture_write(image)
+        return picture
+
+    def encoder_tags(self, filepath, tags, image, picture=None):
+        """ Return the tags written by the encoder: the text tags and the
+            placeholder of the picture size (FLAC / OGG), 'picture_update'
+            replaces it in place. The WAV tags are written after the encoding
+            to the ID3 chunk at the file end, so None for WAV.
+        """
+        if tags is None or not filepath.endswith(('.ogg', '.flac')):
+            return None
+        picture = self._picture(image, picture)
+        if picture is None:
+            return tags
+        # the picture are the base64 comment of the same length
+        return dict(tags, **{PICTURE_RESERVE_TAG: "0" * (len(picture) + 64)})
+
+    def picture_update(self, filepath, tags, image, picture=None):
+        """ Write the picture to the just encoded file: over the encoder
+            placeholder of FLAC / OGG, the rest of the header are kept as the
+            padding so the audio data are not moved. The WAV file gets the ID3
+            chunk with the text tags and the picture.
+        """
+        file_basename = os.path.basename(filepath)
+        picture = self._picture(image, picture)
 
-        return vcomment_value
+        if filepath.endswith('.wav'):
+            if tags is not None:
+                self.id3_write(filepath, tags, picture)
+            return
+        if picture is None:
+            return
 
-    def write(self, filepath, author, artist, sound_designer, album, genre, date, comment, image):
+        from mutagen.oggvorbis import OggVorbis
+        from mutagen.flac import FLAC
 
         if filepath.endswith('.ogg'):
             tag = OggVorbis(filepath)
         elif filepath.endswith('.flac'):
             tag = FLAC(filepath)
         else:
-            tag = WAVE(filepath)
+            self.logger.warning("picture metadata for [%s] are not supported, skip it" % file_basename)
+            return
+
+        self.logger.info("write picture metadata to [%s] file...  " % file_basename)
+        if PICTURE_RESERVE_TAG in tag:
+            del tag[PICTURE_RESERVE_TAG]
+        tag["metadata_block_picture"] = picture
+        # the placeholder space are kept, without it the default padding
+        tag.save(padding=lambda info: info.padding if info.padding >= 0 else 1024)
+
+    def id3_write(self, filepath, tags, picture=None):
+        """ Write the text tags and the picture to the WAV ID3 chunk, it are
+            added to the file end, the audio data are not rewritten
+        """
+        from mutagen.wave import WAVE
+        from mutagen.flac import Picture
+        from mutagen import id3
+
+        wave = WAVE(filepath)
+        if wave.tags is None:
+            wave.add_tags()
+        for k, frame in ID3_FRAMES.items():
+            if tags.get(k):
+                wave.tags.setall(frame, [ getattr(id3, frame)(encoding=3, text=tags[k]) ])
+        if tags.get("comment"):
+            wave.tags.setall("COMM", [ id3.COMM(encoding=3, lang="XXX", desc="", text=tags["comment"]) ])
+        wave.tags.delall("APIC")
+        if picture is not None:
+            p = Picture(base64.b64decode(picture))
+            wave.tags.add(id3.APIC(encoding=3, mime=p.mime, type=p.type, desc=p.desc, data=p.data))
+        self.logger.info("write ID3 tags to [%s] file...  " % os.path.basename(filepath))
+        wave.save()
+
+    def write(self, filepath, author, artist, sound_designer, album, genre, date, comment, image, picture=None):
+        from mutagen.oggvorbis import OggVorbis
+        from mutagen.flac import FLAC
 
         file_basename = os.path.basename(filepath)
 
+        if filepath.endswith('.ogg'):
+            tag = OggVorbis(filepath)
+        elif filepath.endswith('.flac'):
+            tag = FLAC(filepath)
+        else:
+            self.logger.info( "TAG START [%s]" % file_basename )
+            self.id3_write(filepath, self.tags(filepath, author, artist, sound_designer, album, genre, date, comment), self._picture(image, picture))
+            self.logger.info( "TAG END [%s]"  % file_basename)
+            return
+
         self.logger.info( "TAG START [%s]" % file_basename )
         self.logger.info( "length: %s" % datetime.timedelta(seconds=tag.info.length) )
 
@@ -74,30 +262,13 @@ class TagWriter(object):
         self.logger.debug( "genre: %s" % tag.get('genre', '') )
         self.logger.debug( "date: %s" % tag.get('date', '') )
 
-        track_num = (re.findall(r"[-+]?\d*\.\d+|\d+", file_basename)[0]).lstrip("0")
-
-        tag['tracknumber'] = track_num
-        tag['album'] = ""
-        tag['title'] = '[ глава %s ] - "%s" - %s' % (track_num, album, author)
-        tag['artist'] = artist
-
-        class CommentDefault(dict):
-            def __missing__(self, key):
-                return ""
-
-        tag['comment'] = comment.format_map(
-            CommentDefault(
-                author=author,
-                artist=artist,
-                sound_designer=sound_designer
-            )
-        )
-
-        tag['genre'] = genre
-        tag['date'] = date
-
+        for k, v in self.tags(filepath, author, artist, sound_designer, album, genre, date, comment).items():
+            tag[k] = v
 
-        if image is None or not os.path.exists(image):
+        if picture is not None:
+            self.logger.info("write prepared [%s] image to picture metadata..." % image)
+            tag["metadata_block_picture"] = picture
+        elif image is None or not os.path.exists(image):
             self.logger.info("file picture is 'None', delete data..." )
             tag["metadata_block_picture"] = ""
         else:
@@ -0,0 +1,52 @@
+import threading
+
+
+class TaskCancelled(Exception):
+    """ The background task are cancelled """
+
+
+class BackgroundTask(object):
+    """ The 'target(task)' runs in the daemon thread, it reports the progress
+        by 'task.progress()' and stops at 'task.check()' after the cancel.
+        The 'on_progress(text)' and 'on_done(result, error)' are called in
+        the task thread, the GUI gets them by the Qt signals.
+    """
+
+    def __init__(self, name, target, on_progress=None, on_done=None):
+        self.name = name
+        self.target = target
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    def _run(self):
+        result, error = None, None
+        try:
+            result = self.target(self)
+        except BaseException as e:
+            error = e
+        if self.on_done is not None:
+            self.on_done(result, error)
+
+    # -------------------------------------------------------------------------
+
+    def progress(self, done, total, text=""):
+        self.check()
+        if self.on_progress is not None:
+            self.on_progress("%s [ %d / %d ] %s" % (self.name, done, total, text))
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise TaskCancelled(self.name)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+        return self
+
+    def is_alive(self):
+        return self.thread is not None and self.thread.is_alive()
@@ -0,0 +1,184 @@
+import os
+import json
+import threading
+from time import time
+
+
+# the block spans of one lane are joined to the slices of this length, us
+SLICE_US = 20000
+
+
+def now():
+    """ Return the trace time, us. The wall clock are the same for the all
+        batch processes
+    """
+    return time() * 1e6
+
+
+class _Span(object):
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = now()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, now(), self.cat, self.args)
+        return False
+
+
+class _NoSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Tracer(object):
+    """ Trace events of one process in the Chrome trace-event format. The
+        span are one complete event, the per-block stage spans are joined
+        to the lane slices with the busy time in args, so the long files
+        trace stays small.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.lock = threading.Lock()
+        self.lanes = {}
+        self.slices = {}
+        self.pid = os.getpid()
+
+    def enable(self, process_name=None):
+        self.enabled = True
+        self.pid = os.getpid()
+        # the forked worker gets the parent tracer state
+        self.events = []
+        self.lanes = {}
+        self.slices = {}
+        if process_name is not None:
+            self.events.append({"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": process_name}})
+        return self
+
+    def _tid(self, lane=None, thread=None):
+        """ Return the lane id, the lane are the thread or the thread stage """
+        thread = thread or threading.current_thread()
+        key = (thread.ident, lane)
+        tid = self.lanes.get(key)
+        if tid is None:
+            tid = self.lanes[key] = len(self.lanes) + 1
+            name = thread.name + (" " + lane if lane else "")
+            self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+        return tid
+
+    # -------------------------------------------------------------------------
+
+    def span(self, name, cat="batch", **args):
+        """ Return the context manager which records the span """
+        if not self.enabled:
+            return _NoSpan()
+        return _Span(self, name, cat, args)
+
+    def add(self, name, start, end, cat="batch", args=None, lane=None, thread=None):
+        if not self.enabled:
+            return
+        with self.lock:
+            event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": max(end - start, 0.0), "pid": self.pid,
+                     "tid": self._tid(lane, thread)}
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    def block(self, name, start, end, cat="render"):
+        """ Record the one block work of the stage, the stage has own lane """
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        key = (thread.ident, name)
+        s = self.slices.get(key)
+        if s is not None and (start - s[1]) < SLICE_US and (end - s[0]) < SLICE_US:
+            s[1] = end
+            s[2] += end - start
+            s[3] += 1
+            return
+        if s is not None:
+            self._slice_flush(name, s)
+        self.slices[key] = [start, end, end - start, 1, cat, thread]
+
+    def _slice_flush(self, name, s):
+        start, end, busy, count, cat, thread = s
+        args = {"blocks": count, "busy_pct": round(100.0 * busy / max(end - start, 1e-3), 1)}
+        self.add(name, start, end, cat, args, lane=name, thread=thread)
+
+    def flush(self):
+        """ Record the not finished block slices, the stage threads are done """
+        slices, self.slices = self.slices, {}
+        for (_, name), s in slices.items():
+            self._slice_flush(name, s)
+
+    def instant(self, name, cat="batch", **args):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.events.append({"name": name, "cat": cat, "ph": "i", "s": "p", "ts": now(), "pid": self.pid, "tid": self._tid(), "args": args})
+
+    # -------------------------------------------------------------------------
+
+    def save(self, filepath):
+        """ Write the process events as the trace part JSON file """
+        with self.lock:
+            events = list(self.events)
+        tmp = filepath + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(events, f, ensure_ascii=False)
+        os.replace(tmp, filepath)
+
+
+# the process tracer, enabled by the batch trace option
+tracer = Tracer()
+
+
+def parts_folder(filepath):
+    """ Return the workers trace parts folder for the trace file """
+    return filepath + ".parts"
+
+
+def merge_trace(filepath, parts_folder, events=()):
+    """ Write the Chrome trace JSON from the main process events and the
+        workers trace parts, the parts are removed
+    """
+    all_events = list(events)
+    if os.path.isdir(parts_folder):
+        for name in sorted(os.listdir(parts_folder)):
+            part = os.path.join(parts_folder, name)
+            try:
+                with open(part, "r", encoding="utf-8") as f:
+                    all_events.extend(json.load(f))
+            except (OSError, ValueError):
+                pass
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+        try:
+            os.rmdir(parts_folder)
+        except OSError:
+            pass
+    # the trace starts at zero time
+    start = min((e["ts"] for e in all_events if "ts" in e), default=0.0)
+    for e in all_events:
+        if "ts" in e:
+            e["ts"] = round(e["ts"] - start, 1)
+        if "dur" in e:
+            e["dur"] = round(e["dur"], 1)
+    tmp = filepath + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": all_events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    os.replace(tmp, filepath)
@@ -3,6 +3,9 @@
 import logging
 from PyQt5 import QtCore
 
+from neil_vst_gui.process_logging import ProcessLogHandler
+
+
 class MainLogHandler(logging.StreamHandler):
     """docstring for MainLogHandler"""
 
@@ -18,18 +21,6 @@ class MainLogHandler(logging.StreamHandler):
         self.signal.emit(s, record.levelname)
 
 
-class ProcessLogHandler(logging.StreamHandler):
-    """docstring for ProcessLogHandler"""
-
-    def __init__(self, pipe, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.pipe = pipe
-
-    def emit(self, record):
-        s = self.format(record)
-        self.pipe.send((s, record.levelname))
-
-
 class ProcessLogEmitter(QtCore.QThread):
     """ Emitter waits for data from the capitalization
         process and emits a signal for the UI to update its text
@@ -1,22 +1,48 @@
 
 import os
-from neil_vst import VstHost, VstPlugin
+import importlib
+from time import perf_counter
+from collections import OrderedDict
+
+
+def vst_module():
+    """ Return the VST host module with VstHost / VstPlugin, 'neil_vst' or the
+        one named by the NEIL_VST_MODULE environment (the tests fake plugins),
+        the workers processes inherit it
+    """
+    return importlib.import_module(os.environ.get("NEIL_VST_MODULE", "neil_vst"))
 
 
 class VSTChain(object):
-    """docstring for VSTChain"""
+    """ The plugins chain of the job. The removed plugins are kept in the idle
+        instances pool by the DLL path, the next job with the same DLLs gets
+        them back with only the parameters set instead of the DLL load.
+    """
 
-    def __init__(self, logger=None):
-        self.vst_host = VstHost(44100, logger=logger)
+    def __init__(self, logger=None, pool_size=16, pool_memory_mb=0):
+        self._vst_host = None
         self.plugins_list = []
         self.logger = logger
         self.last_path = ""
+        # idle instances, the least recently released first
+        self.pool = OrderedDict()
+        # the parameters of the just loaded plugins, reused plugins are reset to them
+        self.defaults = {}
+        self.pool_size = pool_size
+        self.pool_memory_mb = pool_memory_mb
+
+    @property
+    def vst_host(self):
+        # the host (and 'neil_vst' module) are created on the first use
+        if self._vst_host is None:
+            self._vst_host = vst_module().VstHost(44100, logger=self.logger)
+        return self._vst_host
 
     # -------------------------------------------------------------------------
 
     def _vst_dll_load(self, dll_path):
         # load and return plugin instance if success
-        return VstPlugin(
+        return vst_module().VstPlugin(
             host=self.vst_host,
             vst_path_lib=dll_path,
             sample_rate=self.vst_host.sample_rate,
@@ -26,32 +52,149 @@ class VSTChain(object):
             logger=self.vst_host.logger
         )
 
+    def _pool_key(self, dll_path):
+        return os.path.normcase(os.path.abspath(dll_path))
+
+    def _pool_get(self, dll_path):
+        key = self._pool_key(dll_path)
+        for k, plugin in self.pool.items():
+            if k[0] == key:
+                del self.pool[k]
+                return plugin
+        return None
+
+    def _pool_put(self, plugin):
+        self.pool[(self._pool_key(plugin.path_to_lib), id(plugin))] = plugin
+
+    def pool_trim(self):
+        """ Unload the oldest idle instances over the pool count or while the
+            process memory are over the pool memory limit. The unloaded plugin
+            memory can stay in the process heap, the trim stops when the RSS
+            does not drop, so the all pool are not unloaded for nothing.
+        """
+        from neil_vst_gui.memory_monitor import process_memory, MB
+
+        while len(self.pool) > max(0, self.pool_size):
+            self.pool.popitem(last=False)
+        if self.pool_memory_mb <= 0:
+            return
+        rss, _ = process_memory(os.getpid())
+        while len(self.pool) and rss is not None and rss > self.pool_memory_mb * MB:
+            self.pool.popitem(last=False)
+            last = rss
+            rss, _ = process_memory(os.getpid())
+            if rss is not None and rss >= last:
+                break
+
     # -------------------------------------------------------------------------
 
-    def add(self, dll_path, parameters={}):
-        try:
-            plugin = self._vst_dll_load(dll_path)
-            self.logger.info('Loaded "%s"' % os.path.basename(dll_path))
-            self.logger.debug(plugin.info())
-        except Exception as e:
-            self.logger.error('[ ERROR ] while load "%s"' % os.path.basename(dll_path))
-            self.logger.debug(str(e))
-            return
+    def _acquire(self, dll_path, parameters, plugin=None):
+        """ Return the plugin instance with the parameters, the given idle
+            instance, the pool one or the loaded one, None on error
+        """
+        start = perf_counter()
+        if plugin is None:
+            plugin = self._pool_get(dll_path)
+        if plugin is not None:
+            # the idle instance gets the job parameters over its load state
+            parameters = {**self.defaults.get(self._pool_key(dll_path), {}), **parameters}
+            self.logger.info('Reused "%s" [ %.1f ms ]' % (os.path.basename(dll_path), (perf_counter() - start) * 1000))
+        else:
+            try:
+                plugin = self._vst_dll_load(dll_path)
+                self.logger.info('Loaded "%s" [ %.1f ms ]' % (os.path.basename(dll_path), (perf_counter() - start) * 1000))
+                self.logger.debug(plugin.info())
+            except Exception as e:
+                self.logger.error('[ ERROR ] while load "%s"' % os.path.basename(dll_path))
+                self.logger.debug(str(e))
+                return None
+            self.defaults.setdefault(self._pool_key(dll_path), self.parse_plugin_parameters(plugin))
+        self.plugin_parameters_set(plugin, parameters)
+        return plugin
 
+    def add(self, dll_path, parameters={}):
+        plugin = self._acquire(dll_path, parameters)
+        if plugin is None:
+            return None
         self.plugins_list.append(plugin)
         self.last_path = dll_path
-        self.plugin_parameters_set(plugin, parameters)
         return plugin
 
+    def build(self, plugins_parameters_list, task=None):
+        """ Return (plugins, parameters) of the settings without the chain
+            change, it runs in the background task. The pool and the loaded
+            instances get the parameters here. The chain instances are reused
+            untouched, their 'parameters' by the instance id are set by
+            'replace' in the GUI thread, so the chain plays as is until it.
+        """
+        # the loads and the parameters set of the pool / loaded instances run in
+        # the task thread: until 'replace' only this thread uses them, they have
+        # no open editor and do not process audio, so the plugin calls are not
+        # concurrent (the effOpen of the DLL load are the same as the batch
+        # workers do, the setParameter are the VST 2.4 automation call)
+        spare = list(self.plugins_list)
+        parameters = {}
+        plugins = []
+        try:
+            values = list(plugins_parameters_list.values())
+            for i, v in enumerate(values):
+                if task is not None:
+                    task.progress(i, len(values), os.path.basename(v["path"]))
+                key = self._pool_key(v["path"])
+                # the settings are copied, the parameters set adds the keys
+                settings = { k: dict(s) for k, s in v["params"].items() }
+                plugin = next((p for p in spare if self._pool_key(p.path_to_lib) == key), None)
+                if plugin is not None:
+                    spare.remove(plugin)
+                    # the chain instance are reset to its load state by 'replace'
+                    parameters[id(plugin)] = {**self.defaults.get(key, {}), **settings}
+                    self.logger.info('Reused "%s" of the chain' % os.path.basename(v["path"]))
+                else:
+                    plugin = self._acquire(v["path"], settings)
+                if plugin is not None:
+                    plugins.append(plugin)
+            if task is not None:
+                task.progress(len(values), len(values))
+        except BaseException:
+            for plugin in plugins:
+                if id(plugin) not in parameters:
+                    self._pool_put(plugin)
+            raise
+        return plugins, parameters
+
+    def replace(self, plugins, parameters=None):
+        """ Set the built plugins list, the reused chain instances get their
+            'parameters' by the instance id, the not used instances go to the pool
+        """
+        parameters = parameters or {}
+        for plugin in plugins:
+            if id(plugin) in parameters:
+                self.plugin_parameters_set(plugin, parameters[id(plugin)])
+        used = set(id(p) for p in plugins)
+        for plugin in self.plugins_list:
+            if id(plugin) not in used:
+                self._pool_put(plugin)
+        self.plugins_list = list(plugins)
+        if plugins:
+            self.last_path = plugins[-1].path_to_lib
+        self.pool_trim()
+
     def remove(self, index):
-        self.plugins_list.remove(self.plugins_list[index])
+        self._pool_put(self.plugins_list.pop(index))
+        self.pool_trim()
 
     def swap(self, index_0, index_1):
         swap_plugins = self.plugins_list[index_0], self.plugins_list[index_1]
         self.plugins_list[index_1], self.plugins_list[index_0] = swap_plugins
 
     def clear(self):
+        for plugin in self.plugins_list:
+            self._pool_put(plugin)
         self.plugins_list.clear()
+        self.pool_trim()
+
+    def pool_clear(self):
+        self.pool.clear()
 
     def plugin(self, index):
         return self.plugins_list[index]
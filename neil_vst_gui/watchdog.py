@@ -0,0 +1,63 @@
+from time import time
+
+
+class Heartbeat(object):
+    """ The worker progress time in the shared memory value, the render and
+        measure loops beat after every block. It does nothing in the process
+        without the attached value.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    def attach(self, value):
+        self.value = value
+        self.beat()
+
+    def beat(self):
+        if self.value is not None:
+            self.value.value = time()
+
+
+# the worker process heartbeat, attached by the ProcessWorker
+heartbeat = Heartbeat()
+
+
+class Watchdog(object):
+    """ The hung worker are the one without the heartbeat for 'heartbeat_sec'
+        or rendering longer than its expected render time (the file duration
+        at the history realtime factor) x 'timeout_factor'. It are killed and
+        queued again up to 'retries' times, then the file are failed.
+    """
+
+    def __init__(self, heartbeat_sec=120.0, timeout_factor=4.0, min_timeout_sec=300.0, retries=2):
+        self.heartbeat_sec = heartbeat_sec
+        self.timeout_factor = timeout_factor
+        self.min_timeout_sec = min_timeout_sec
+        self.retries = retries
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Create from the "watchdog" settings dict, None if disabled """
+        if not settings or not settings.get("enable", False):
+            return None
+        return cls(
+            heartbeat_sec=settings.get("heartbeat_sec", 120.0),
+            timeout_factor=settings.get("timeout_factor", 4.0),
+            min_timeout_sec=settings.get("min_timeout_sec", 300.0),
+            retries=settings.get("retries", 2)
+        )
+
+    def timeout(self, cost):
+        """ Return the render time limit for the worker cost, sec """
+        return max(self.min_timeout_sec, cost * self.timeout_factor)
+
+    def check(self, worker, now=None):
+        """ Return the reason to kill the running worker, None if it works """
+        now = now or time()
+        elapsed = now - worker.start_time
+        if elapsed > self.timeout(worker.cost):
+            return "render time over %.0f sec" % self.timeout(worker.cost)
+        if self.heartbeat_sec > 0 and (now - max(worker.heartbeat.value, worker.start_time)) > self.heartbeat_sec:
+            return "no progress for %.0f sec" % (now - max(worker.heartbeat.value, worker.start_time))
+        return None
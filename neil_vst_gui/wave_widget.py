@@ -79,12 +79,13 @@ class WaveWidget(QtWidgets.QGraphicsView):
         if not len(self.wave_data):
             return
         #
-        block_size = width
+        # the short file has less peaks bins than the view pixels
+        block_size = min(width, len(self.wave_data))
         blocks = np.array_split(self.wave_data, block_size)
 
         lines = []
-        x = 0
-        for block in blocks:
+        for i, block in enumerate(blocks):
+            x = i * width / block_size
             y1 = np.min(block)
             y2 = np.max(block)
 
@@ -95,17 +96,16 @@ class WaveWidget(QtWidgets.QGraphicsView):
             line = QtWidgets.QGraphicsLineItem(x, y1, x, y2)
             line.setPen(self.line_pen)
             self.scene.addItem( line )
-            x += 1
         # update play position
         self.set_play_position(self.play_position)
 
     # -------------------------------------------------------------------------
 
     def set_wave_file(self, filepath):
-        import soundfile
+        from neil_vst_gui.audio_map import peaks
         try:
-            data, samplerate = soundfile.read(filepath, always_2d=True)
-            self.wave_data, _ = data[0::2], data[1::2]
+            # the min / max of the file parts, the view width are less
+            self.wave_data = peaks(filepath)
         except Exception as e:
             self.wave_data = []
             self.logger.warning('Error open "%s" file, set the empty list data for "wave_data"' % filepath)
@@ -37,6 +37,10 @@ setuptools.setup(
     entry_points={
         "console_scripts": [
             "neil_vst_gui=neil_vst_gui.main:main",
+            "neil_vst_batch=neil_vst_gui.batch:main",
+            "neil_vst_segment_verify=neil_vst_gui.segment_render:main",
+            "neil_vst_node=neil_vst_gui.distributed:main",
+            "neil_vst_measure=neil_vst_gui.measure:main",
         ]
     },
     include_package_data=True,
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+
+import numpy
+import pytest
+
+
+TESTS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+# the fake plugins module for this process and the workers processes
+sys.path[:0] = [ os.path.dirname(TESTS_FOLDER), TESTS_FOLDER ]
+os.environ["NEIL_VST_MODULE"] = "fake_vst"
+os.environ["PYTHONPATH"] = os.pathsep.join([ os.path.dirname(TESTS_FOLDER), TESTS_FOLDER, os.environ.get("PYTHONPATH", "") ])
+
+
+def noise(seconds, samplerate=44100, channels=2, seed=0, level=0.25):
+    frames = int(seconds * samplerate)
+    return (numpy.random.RandomState(seed).uniform(-level, level, (frames, channels))).astype(numpy.float32)
+
+
+def plugins_list(folder, *names, **params):
+    """ Return the job "plugins_list" of the fake plugins, the DLLs are in the folder """
+    plugins = {}
+    for i, name in enumerate(names):
+        path = os.path.join(str(folder), name + ".dll")
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        plugins["%s (%d)" % (name, i)] = {
+            "path": path,
+            "max_channels": 8,
+            "params": { k: {"value": v, "fullscale": 1.0, "normalized": True} for k, v in params.get(name, {}).items() }
+        }
+    return plugins
+
+
+@pytest.fixture(autouse=True)
+def user_home(tmp_path, monkeypatch):
+    """ The user cache folder (probe cache, render history) of the test """
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path / "home"))
+
+
+@pytest.fixture
+def wav_files(tmp_path):
+    """ Return the function writing the noise WAV files, 'in_<n>.wav' """
+    def make(count=2, seconds=1.0, samplerate=44100, channels=2, subtype="FLOAT"):
+        import soundfile
+
+        folder = tmp_path / "in"
+        folder.mkdir(exist_ok=True)
+        files = []
+        for i in range(count):
+            path = str(folder / ("in_%d.wav" % i))
+            soundfile.write(path, noise(seconds, samplerate, channels, seed=i), samplerate, subtype=subtype)
+            files.append(path)
+        return files
+    return make
+
+
+@pytest.fixture
+def job_file(tmp_path):
+    """ Return the function writing the job file of the fake plugins chain """
+    def make(*names, **params):
+        folder = tmp_path / "vst"
+        folder.mkdir(exist_ok=True)
+        settings = {"title": "test", "normalize": {"enable": False}, "plugins_list": plugins_list(folder, *names, **params)}
+        path = str(tmp_path / "job.json")
+        with open(path, "w") as f:
+            json.dump(settings, f)
+        return path, settings
+    return make
+
+
+def run_batch(*argv):
+    """ Run the headless batch in the subprocess, return (exit code, the progress events) """
+    import subprocess
+
+    process = subprocess.run([ sys.executable, "-m", "neil_vst_gui.batch" ] + [ str(a) for a in argv ],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=120)
+    events = [ json.loads(line) for line in process.stdout.decode("utf-8").splitlines() if line.startswith("{") ]
+    return process.returncode, events
+
+
+def read(path):
+    import soundfile
+
+    return soundfile.read(path, dtype="float32", always_2d=True)[0]
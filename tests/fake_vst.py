@@ -0,0 +1,92 @@
+""" The tests stand-in of the py-neil-vst module (NEIL_VST_MODULE=fake_vst).
+    The plugin kind are the DLL file name: 'gain*' - the 'Gain' parameter
+    (x 2 of the normalized value), 'echo*' - the gain and the delay line with
+    the 'Mix' parameter, its state goes over the blocks and the files. The
+    plugin with the '<dll>.hang' file near removes it and hangs the render.
+"""
+import os
+import time
+import ctypes
+import numpy
+
+
+__version__ = "0.0-test"
+
+ECHO_DELAY = 100
+
+# the plugins loads count of the process
+loads = 0
+
+
+class VstHost(object):
+
+    def __init__(self, sample_rate, block_size=1024, logger=None, **kwargs):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.logger = logger
+        self._stop = False
+
+    def process_chain_start(self, filename, channels, plugins, blocks, callback, frames=-1, start=0, stop=None):
+        """ Play the file blocks through the plugins to the callback until stopped """
+        self._stop = False
+        in_buffers = [ (ctypes.c_float * self.block_size)() for ch in range(channels) ]
+        for block in blocks(filename, blocksize=self.block_size, frames=frames, start=start, stop=stop, dtype="float32", always_2d=True):
+            if self._stop:
+                break
+            frames_count = len(block)
+            for ch in range(channels):
+                numpy.frombuffer(in_buffers[ch], dtype=numpy.float32)[:frames_count] = block[:, ch]
+            pointers = [ ctypes.addressof(b) for b in in_buffers ]
+            for plugin in plugins:
+                plugin.process_replacing(pointers, plugin.out_buffers[:channels], frames_count)
+                pointers = plugin.out_buffers[:channels]
+            callback(numpy.stack([ _view(p, frames_count) for p in pointers ], axis=1))
+
+    def process_chain_stop(self):
+        self._stop = True
+
+
+def _view(pointer, frames):
+    return numpy.ctypeslib.as_array(ctypes.cast(pointer, ctypes.POINTER(ctypes.c_float)), shape=(frames,))
+
+
+class VstPlugin(object):
+
+    def __init__(self, host, vst_path_lib, sample_rate=44100, block_size=1024, max_channels=8, self_buffers=True,
+                 shell_uid=-1, logger=None):
+        global loads
+        loads += 1
+        self.host = host
+        self.path_to_lib = vst_path_lib
+        self.name = os.path.splitext(os.path.basename(vst_path_lib))[0]
+        self.echo = self.name.startswith("echo")
+        self.input_channels = self.output_channels = max_channels
+        self.parameters_indexes_dict = {"Gain": 0, "Mix": 1} if self.echo else {"Gain": 0}
+        self.values = [ 0.5, 0.0 ]
+        self.history = numpy.zeros((max_channels, ECHO_DELAY), dtype=numpy.float32)
+        self._buffers = [ (ctypes.c_float * max(block_size, 65536))() for ch in range(max_channels) ]
+        self.out_buffers = [ ctypes.addressof(b) for b in self._buffers ]
+
+    def info(self):
+        return "%s - %s" % (self.name, self.path_to_lib)
+
+    def parameter_value(self, index=-1, name=None, value=None, normalized=True, fullscale=1.0):
+        if name is not None:
+            index = self.parameters_indexes_dict[name]
+        if value is None:
+            return self.values[index]
+        self.values[index] = value if normalized else value / fullscale
+
+    def process_replacing(self, in_buffers, out_buffers, frames):
+        if os.path.exists(self.path_to_lib + ".hang"):
+            os.remove(self.path_to_lib + ".hang")
+            time.sleep(3600)
+        gain = numpy.float32(2.0 * self.values[0])
+        for ch, (i, o) in enumerate(zip(in_buffers, out_buffers)):
+            x = _view(i, frames).copy()
+            y = x * gain
+            if self.echo:
+                line = numpy.concatenate((self.history[ch], x))
+                y += line[:frames] * numpy.float32(self.values[1])
+                self.history[ch] = line[-ECHO_DELAY:]
+            _view(o, frames)[:] = y
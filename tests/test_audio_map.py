@@ -0,0 +1,51 @@
+import numpy
+import pytest
+import soundfile
+
+from conftest import noise
+from neil_vst_gui.audio_map import audio_info, open_blocks, open_mapped, peaks
+
+
+FORMATS = [
+    ("WAV", "PCM_U8"), ("WAV", "PCM_16"), ("WAV", "PCM_24"), ("WAV", "PCM_32"), ("WAV", "FLOAT"), ("WAV", "DOUBLE"),
+    ("WAVEX", "PCM_24"), ("RF64", "FLOAT"), ("AIFF", "PCM_16"), ("AIFF", "PCM_24"), ("AIFF", "FLOAT")
+]
+
+
+def write(tmp_path, format, subtype, frames=10007, channels=3):
+    path = str(tmp_path / ("%s_%s.%s" % (format, subtype, "aiff" if format == "AIFF" else "wav")))
+    soundfile.write(path, noise(frames / 44100.0, channels=channels, level=0.9), 44100, subtype=subtype, format=format)
+    return path
+
+
+@pytest.mark.parametrize("format, subtype", FORMATS)
+def test_mapped_read_are_same_as_soundfile(tmp_path, format, subtype):
+    path = write(tmp_path, format, subtype)
+    expected = soundfile.read(path, dtype="float32", always_2d=True)[0]
+    info = audio_info(path)
+    assert (info.frames, info.channels, info.samplerate, info.subtype) == (10007, 3, 44100, subtype)
+    with open_mapped(path) as f:
+        assert numpy.array_equal(f.read(), expected)
+        blocks = list(f.blocks(4096, start=100, stop=9000))
+    assert [ len(b) for b in blocks ] == [ 4096, 4096, 708 ]
+    assert numpy.array_equal(numpy.concatenate(blocks), expected[100:9000])
+
+
+def test_compressed_file_are_read_by_soundfile(tmp_path):
+    path = str(tmp_path / "a.flac")
+    soundfile.write(path, noise(0.5), 44100, subtype="PCM_16")
+    assert open_mapped(path) is None
+    assert audio_info(path).frames == 22050
+    with open_blocks(path) as f:
+        data = numpy.concatenate(list(f.blocks(4096)))
+    assert numpy.array_equal(data, soundfile.read(path, dtype="float32", always_2d=True)[0])
+
+
+def test_peaks(tmp_path):
+    path = write(tmp_path, "WAV", "FLOAT", frames=100000, channels=2)
+    data = soundfile.read(path, dtype="float32", always_2d=True)[0]
+    result = peaks(path, bins=37, block_size=4096)
+    edges = numpy.linspace(0, len(data), 38).astype(numpy.int64)
+    for i in range(37):
+        part = data[edges[i]:edges[i + 1]]
+        assert result[i, 0] == part.min() and result[i, 1] == part.max()
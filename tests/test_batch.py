@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import logging
+import subprocess
+
+import numpy
+
+from conftest import read, run_batch
+from neil_vst_gui.chain_render import render_file
+
+
+def test_batch_output_are_same_as_render(tmp_path, wav_files, job_file):
+    in_files = wav_files(3)
+    job, settings = job_file("gain", "echo", gain={"Gain": 0.4}, echo={"Mix": 0.5})
+    code, events = run_batch("-j", job, "-o", tmp_path / "out", "-p", 2, *in_files)
+    assert code == 0
+    assert [ e["event"] for e in events ].count("done") == 3
+    assert events[-1]["event"] == "batch_end" and events[-1]["failed"] == 0
+    for f in in_files:
+        local = str(tmp_path / "local.wav")
+        render_file(settings, f, local, 8192, logging.getLogger("test_batch"))
+        assert numpy.array_equal(read(local), read(tmp_path / "out" / os.path.basename(f)))
+
+
+def test_batch_list_file_and_glob(tmp_path, wav_files, job_file):
+    in_files = wav_files(3)
+    job, _ = job_file("gain")
+    list_file = tmp_path / "list.txt"
+    list_file.write_text(in_files[0] + "\n")
+    code, events = run_batch("-j", job, "-o", tmp_path / "out", "-l", list_file, os.path.join(os.path.dirname(in_files[1]), "in_[12].wav"))
+    assert code == 0
+    assert sorted(os.listdir(str(tmp_path / "out"))) == [ ".neil_vst_journal.json", "in_0.wav", "in_1.wav", "in_2.wav" ]
+
+
+def test_batch_does_not_import_qt():
+    code = "import sys, neil_vst_gui.batch; sys.exit('PyQt5' in sys.modules)"
+    assert subprocess.run([ sys.executable, "-c", code ]).returncode == 0
+
+
+def test_batch_renders_the_file_name_without_number(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    names = [ os.path.join(os.path.dirname(f), n) for f, n in zip(in_files, ("ch_01.wav", "intro.wav")) ]
+    for f, n in zip(in_files, names):
+        os.rename(f, n)
+    job, settings = job_file("gain")
+    settings["metadata"] = [ "Author", "Artist", "Designer", "Book", "Genre", "2021", "{author}", "" ]
+    with open(job, "w") as f:
+        json.dump(settings, f)
+    code, events = run_batch("-j", job, "-o", tmp_path / "out", *names)
+    assert code == 0
+    assert [ e["event"] for e in events ].count("done") == 2
+    from mutagen.wave import WAVE
+    assert str(WAVE(str(tmp_path / "out" / "ch_01.wav")).tags["TRCK"]) == "1"
+    assert "TRCK" not in WAVE(str(tmp_path / "out" / "intro.wav")).tags
@@ -0,0 +1,62 @@
+import os
+import json
+
+import numpy
+import soundfile
+
+from conftest import noise, read, run_batch
+from neil_vst_gui.batch_journal import BatchJournal, JOURNAL_FILENAME, job_fingerprint, temp_filepath
+
+
+def states(events, event):
+    return sorted(os.path.basename(e["file"]) for e in events if e["event"] == event)
+
+
+def test_resume_renders_only_not_done_files(tmp_path, wav_files, job_file):
+    in_files = wav_files(3)
+    job, settings = job_file("gain", gain={"Gain": 0.25})
+    out = tmp_path / "out"
+    code, events = run_batch("-j", job, "-o", out, *in_files)
+    assert code == 0 and len(states(events, "done")) == 3
+
+    # the interrupted output of the changed input and the stale temp file
+    soundfile.write(in_files[1], noise(0.5, seed=7), 44100, subtype="FLOAT")
+    os.utime(in_files[1], (1, 1))
+    with open(temp_filepath(str(out / "in_1.wav")), "wb") as f:
+        f.write(b"partial")
+    mtime = os.stat(str(out / "in_0.wav")).st_mtime_ns
+
+    code, events = run_batch("-j", job, "-o", out, "-r", *in_files)
+    assert code == 0
+    assert states(events, "skipped") == [ "in_0.wav", "in_2.wav" ]
+    assert states(events, "done") == [ "in_1.wav" ]
+    assert os.stat(str(out / "in_0.wav")).st_mtime_ns == mtime
+    assert not os.path.exists(temp_filepath(str(out / "in_1.wav")))
+    assert numpy.array_equal(read(out / "in_1.wav"), read(in_files[1]) * numpy.float32(0.5))
+
+
+def test_changed_job_renders_all_files(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    job, settings = job_file("gain", gain={"Gain": 0.25})
+    out = tmp_path / "out"
+    run_batch("-j", job, "-o", out, *in_files)
+    settings["plugins_list"]["gain (0)"]["params"]["Gain"]["value"] = 0.5
+    with open(job, "w") as f:
+        json.dump(settings, f)
+    code, events = run_batch("-j", job, "-o", out, "-r", *in_files)
+    assert states(events, "done") == [ "in_0.wav", "in_1.wav" ]
+    assert numpy.array_equal(read(out / "in_0.wav"), read(in_files[0]))
+
+
+def test_journal_state(tmp_path, wav_files):
+    in_files = wav_files(1)
+    out_file = str(tmp_path / "out.wav")
+    journal = BatchJournal(str(tmp_path), job_fingerprint({"plugins_list": {}}, 8192))
+    journal.update(in_files[0], "started")
+    assert not BatchJournal(str(tmp_path), journal.fingerprint).load().is_done(in_files[0], out_file)
+    open(out_file, "wb").close()
+    journal.update(in_files[0], "done", out_file=out_file)
+    assert BatchJournal(str(tmp_path), journal.fingerprint).load().is_done(in_files[0], out_file)
+    # the other job settings journal are not used
+    assert not BatchJournal(str(tmp_path), job_fingerprint({"plugins_list": {}}, 4096)).load().is_done(in_files[0], out_file)
+    assert JOURNAL_FILENAME in os.listdir(str(tmp_path))
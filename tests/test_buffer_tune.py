@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+
+import neil_vst_gui.buffer_tune as buffer_tune
+from neil_vst_gui.buffer_tune import BufferSizeStore, chain_fingerprint, measure_throughput, tune_buffer_size
+from neil_vst_gui.batch import _tuned_buffer_size
+
+
+logger = logging.getLogger("test_buffer_tune")
+
+
+def test_measure_throughput(wav_files, job_file):
+    import soundfile
+
+    _, settings = job_file("gain", "echo")
+    data, samplerate = soundfile.read(wav_files(1)[0], dtype="float32", always_2d=True)
+    assert measure_throughput(settings["plugins_list"], samplerate, data, 1024) > 0
+
+
+def test_fastest_size_are_stored(tmp_path, wav_files, job_file, monkeypatch):
+    _, settings = job_file("gain")
+    speed = {1024: 1.0, 2048: 3.0, 4096: 2.0}
+    monkeypatch.setattr(buffer_tune, "measure_throughput", lambda plugins, samplerate, data, size, logger=None: speed[size])
+    store = BufferSizeStore(str(tmp_path / "sizes.json"))
+    best, results = tune_buffer_size(settings, wav_files(1)[0], logger, sizes=tuple(speed), store=store)
+    assert best == 2048 and results == speed
+    assert BufferSizeStore(store.filepath).get(chain_fingerprint(settings["plugins_list"])) == 2048
+
+
+def test_stop_cancels_tune(wav_files, job_file):
+    _, settings = job_file("gain")
+    assert tune_buffer_size(settings, wav_files(1)[0], logger, stop=lambda: True) == (None, {})
+
+
+def test_batch_uses_tuned_size(wav_files, job_file):
+    _, settings = job_file("gain")
+    in_filepath = wav_files(1)[0]
+    # the unknown chain are tuned on the first file, the known one are taken from the store
+    tuned = _tuned_buffer_size(settings, in_filepath, 8192, logger)
+    assert tuned in buffer_tune.BUFFER_SIZES
+    BufferSizeStore().set(chain_fingerprint(settings["plugins_list"]), 16384, {})
+    assert _tuned_buffer_size(settings, in_filepath, 8192, logger) == 16384
+
+
+def test_sizes_without_timed_blocks_are_skipped(tmp_path, wav_files, job_file):
+    _, settings = job_file("gain")
+    store = BufferSizeStore(str(tmp_path / "sizes.json"))
+    # 0.5 sec - 22050 frames, the sizes over 11025 time no block
+    best, results = tune_buffer_size(settings, wav_files(1, seconds=0.5)[0], logger, store=store)
+    assert sorted(results) == [ 1024, 2048, 4096, 8192 ] and best in results
+    with pytest.raises(ValueError):
+        tune_buffer_size(settings, wav_files(1, seconds=0.01)[0], logger, sizes=(4096, ))
+
+
+def test_empty_file_are_not_tuned(wav_files, job_file):
+    _, settings = job_file("gain")
+    with pytest.raises(ValueError, match="has no audio"):
+        tune_buffer_size(settings, wav_files(1, seconds=0.0)[0], logger)
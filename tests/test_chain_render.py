@@ -0,0 +1,88 @@
+import os
+import logging
+
+import numpy
+import pytest
+
+from conftest import read
+from neil_vst_gui.chain_render import ChainRenderer, render_file
+
+
+logger = logging.getLogger("test_chain_render")
+
+
+def render(settings, in_filepath, out_folder, name, **kwargs):
+    out_filepath = os.path.join(str(out_folder), name + ".wav")
+    render_file(settings, in_filepath, out_filepath, 4096, logger, **kwargs)
+    return read(out_filepath)
+
+
+@pytest.mark.parametrize("pipeline_depth, chain_stages", [(1, 1), (4, 1), (2, 2), (4, 3), (2, 8)])
+def test_pipelined_output_are_same_as_serial(tmp_path, wav_files, job_file, pipeline_depth, chain_stages):
+    in_filepath = wav_files(1, seconds=2.3)[0]
+    _, settings = job_file("gain", "echo", "echo2", "gain2", gain={"Gain": 0.4}, echo={"Mix": 0.5}, echo2={"Mix": 0.3})
+    serial = render(settings, in_filepath, tmp_path, "serial")
+    pipelined = render(settings, in_filepath, tmp_path, "pipelined", pipeline_depth=pipeline_depth, chain_stages=chain_stages)
+    assert numpy.array_equal(serial, pipelined)
+    assert serial.shape == read(in_filepath).shape
+
+
+def test_chain_output(tmp_path, wav_files, job_file):
+    in_filepath = wav_files(1, seconds=0.5)[0]
+    _, settings = job_file("gain", gain={"Gain": 0.25})
+    assert numpy.array_equal(render(settings, in_filepath, tmp_path, "out"), read(in_filepath) * numpy.float32(0.5))
+
+
+def test_split_keeps_the_plugins_order(tmp_path, job_file):
+    _, settings = job_file("gain", "echo", "gain2")
+    renderer = ChainRenderer.from_settings(settings["plugins_list"], 44100, 2, 1024)
+    chains = renderer.split(2)
+    assert [ p for c in chains for p in c.plugins ] == renderer.plugins
+    assert len(renderer.split(10)) == 3
+
+
+def test_flush_runs_out_the_tail(tmp_path, job_file):
+    _, settings = job_file("echo", echo={"Mix": 1.0})
+    renderer = ChainRenderer.from_settings(settings["plugins_list"], 44100, 2, 1024)
+    block = numpy.ones((1024, 2), dtype=numpy.float32)
+    first = renderer.process(block)
+    renderer.process(block)
+    renderer.flush(4096)
+    assert numpy.array_equal(renderer.process(block), first)
+
+
+class FailingRenderer(object):
+    """ The chain which fails on the 'fail_at' block """
+
+    def __init__(self, fail_at):
+        self.fail_at = fail_at
+        self.blocks = 0
+
+    def split(self, stages):
+        return [self]
+
+    def process(self, block, out=None):
+        self.blocks += 1
+        if self.blocks == self.fail_at:
+            raise RuntimeError("plugin failed")
+        if out is None:
+            out = numpy.empty_like(block)
+        out[:] = block
+        return out
+
+
+@pytest.mark.parametrize("pipeline_depth", [0, 1, 4])
+def test_chain_error_stops_the_render(tmp_path, wav_files, pipeline_depth):
+    in_filepath = wav_files(1, seconds=2.0)[0]
+    renderer = FailingRenderer(3)
+    # the pipelined stages are stopped and the error are raised in the caller
+    with pytest.raises(RuntimeError, match="plugin failed"):
+        render({}, in_filepath, tmp_path, "out", pipeline_depth=pipeline_depth, renderer=renderer)
+    assert renderer.blocks == 3
+
+
+def test_pipelined_render_of_the_whole_blocks(tmp_path, wav_files):
+    # the file of the whole blocks ends by the empty read
+    in_filepath = wav_files(1, seconds=4096 * 5 / 44100.0)[0]
+    out = render({}, in_filepath, tmp_path, "out", pipeline_depth=2, renderer=FailingRenderer(0))
+    assert numpy.array_equal(out, read(in_filepath))
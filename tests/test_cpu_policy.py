@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+from neil_vst_gui import cpu_policy
+from neil_vst_gui.cpu_policy import CpuPolicy, available_cpus, get_nice, set_affinity, set_nice
+
+
+def policy(cpus, floor=-20, **kwargs):
+    result = CpuPolicy(**kwargs)
+    result.cpus = cpus
+    result.nice_floor = floor
+    return result
+
+
+def test_from_settings():
+    assert CpuPolicy.from_settings(None) is None
+    assert CpuPolicy.from_settings({"enable": False, "nice": 5}) is None
+    result = CpuPolicy.from_settings({"enable": True, "reserve_cores": 2, "nice": 5})
+    assert (result.reserve_cores, result.nice, result.throttle_nice) == (2, 5, 19)
+
+
+def test_worker_cpus():
+    result = policy(list(range(8)), reserve_cores=1)
+    assert result.worker_cpus() == [ 1, 2, 3, 4, 5, 6, 7 ]
+    assert result.worker_cpus(throttled=True) == [ 1, 2, 3 ]
+    # at least one core are left
+    assert policy([ 0 ], reserve_cores=4).worker_cpus(throttled=True) == [ 0 ]
+    assert policy(list(range(8)), throttle_on_play=False).worker_cpus(throttled=True) == list(range(1, 8))
+
+
+def test_throttle_nice_only_when_it_can_be_restored():
+    assert policy(list(range(4))).settings(throttled=True) == ([ 1 ], 19)
+    unprivileged = policy(list(range(4)), floor=20)
+    assert unprivileged.settings() == ([ 1, 2, 3 ], 10)
+    assert unprivileged.settings(throttled=True) == ([ 1 ], 10)
+    assert "CPUs only" in unprivileged.status(throttled=True)
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid"), reason="POSIX only")
+def test_nice_floor(monkeypatch):
+    import resource
+    monkeypatch.setattr(os, "geteuid", lambda: 0)
+    assert cpu_policy.nice_floor() == -20
+    monkeypatch.setattr(os, "geteuid", lambda: 1000)
+    monkeypatch.setattr(resource, "getrlimit", lambda limit: (0, 0))
+    assert cpu_policy.nice_floor() == 20
+    monkeypatch.setattr(resource, "getrlimit", lambda limit: (25, 25))
+    assert cpu_policy.nice_floor() == -5
+
+
+def test_set_affinity_of_the_current_process():
+    cpus = available_cpus()
+    assert set_affinity(0, cpus[:1])
+    try:
+        if hasattr(os, "sched_getaffinity"):
+            assert os.sched_getaffinity(0) == set(cpus[:1])
+    finally:
+        set_affinity(0, cpus)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX only")
+def test_set_nice_not_permitted(monkeypatch):
+    def setpriority(which, who, nice):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, "setpriority", setpriority)
+    assert set_nice(0, 0) is False
+    assert get_nice(0) == os.getpriority(os.PRIO_PROCESS, 0)
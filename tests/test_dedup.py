@@ -0,0 +1,50 @@
+import os
+import shutil
+
+import numpy
+
+from conftest import read, run_batch
+from neil_vst_gui.dedup import duplicate_groups, sample_hash
+
+
+def test_duplicate_groups(tmp_path, wav_files):
+    in_files = wav_files(3)
+    copies = [ str(tmp_path / "copy_0.wav"), str(tmp_path / "copy_2.wav") ]
+    shutil.copyfile(in_files[0], copies[0])
+    shutil.copyfile(in_files[2], copies[1])
+    files = [ in_files[0], in_files[1], copies[0], in_files[2], copies[1] ]
+    for mode in ("full", "sample"):
+        assert sorted(duplicate_groups(files, mode)) == [ [0, 2], [3, 4] ]
+    assert duplicate_groups(in_files) == []
+
+
+def test_sample_hash_reads_the_size_and_parts(tmp_path):
+    a, b = str(tmp_path / "a.bin"), str(tmp_path / "b.bin")
+    data = bytearray(os.urandom(4 * 1024 * 1024))
+    with open(a, "wb") as f:
+        f.write(data)
+    data[-1] ^= 1
+    with open(b, "wb") as f:
+        f.write(data)
+    # the last chunk are sampled, the one byte change are found
+    assert sample_hash(a) != sample_hash(b)
+
+
+def test_batch_renders_duplicates_once(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    copy = str(tmp_path / "in" / "copy.wav")
+    shutil.copyfile(in_files[0], copy)
+    job, _ = job_file("gain", gain={"Gain": 0.25})
+    out = tmp_path / "out"
+    code, events = run_batch("-j", job, "-o", out, "--dedup", "full", copy, *in_files)
+    assert code == 0
+    done = [ e for e in events if e["event"] == "done" ]
+    assert len(done) == 3
+    assert len([ e for e in done if "duplicate_of" in e ]) == 1
+    assert os.path.samefile(str(out / "copy.wav"), str(out / "in_0.wav"))
+    assert numpy.array_equal(read(out / "copy.wav"), read(in_files[0]) * numpy.float32(0.5))
+
+    code, events = run_batch("-j", job, "-o", tmp_path / "out_copy", "--dedup", "sample", "--dedup-copy", copy, *in_files)
+    assert code == 0
+    assert not os.path.samefile(str(tmp_path / "out_copy" / "copy.wav"), str(tmp_path / "out_copy" / "in_0.wav"))
+    assert numpy.array_equal(read(tmp_path / "out_copy" / "copy.wav"), read(out / "copy.wav"))
@@ -0,0 +1,123 @@
+import os
+import socket
+import logging
+import threading
+
+import numpy
+import pytest
+
+from conftest import read
+from neil_vst_gui.chain_render import render_file
+from neil_vst_gui.distributed import Coordinator, RemoteWorker, parse_args, auth_digest
+from neil_vst_gui.watchdog import Watchdog
+
+
+logger = logging.getLogger("test_distributed")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_node(settings, in_files, out_folder, mode="shared", workers=1, token=None, worker_token=None, watchdog=None,
+             reuse_chain=False, timeout=60.0):
+    port = free_port()
+    out_files = [ os.path.join(str(out_folder), "out_" + os.path.basename(f)) for f in in_files ]
+    events = []
+    coordinator = Coordinator(settings, in_files, out_files, "127.0.0.1", port, mode, 4096, 2, on_event=events.append,
+                              logger=logger, token=token, watchdog=watchdog, durations=[ 1.0 ] * len(in_files))
+    server = threading.Thread(target=coordinator.serve)
+    server.start()
+    for i in range(workers):
+        worker = RemoteWorker(("127.0.0.1", port), "w%d" % i, work_folder=str(out_folder), reuse_chain=reuse_chain, logger=logger,
+                              token=token if worker_token is None else worker_token)
+        threading.Thread(target=worker.run, daemon=True).start()
+    server.join(timeout)
+    coordinator.stop()
+    server.join()
+    return out_files, events
+
+
+def render_local(settings, in_files, out_folder):
+    out_files = []
+    for f in in_files:
+        out_files.append(os.path.join(str(out_folder), "local_" + os.path.basename(f)))
+        render_file(settings, f, out_files[-1], 4096, logger)
+    return out_files
+
+
+@pytest.mark.parametrize("mode", ["shared", "stream"])
+def test_distributed_output_are_same_as_local(tmp_path, wav_files, job_file, mode):
+    in_files = wav_files(3)
+    _, settings = job_file("gain", "echo", gain={"Gain": 0.4}, echo={"Mix": 0.5})
+    local = render_local(settings, in_files, tmp_path)
+    remote, events = run_node(settings, in_files, tmp_path, mode)
+    assert [ e["event"] for e in events ].count("done") == 3
+    for a, b in zip(local, remote):
+        assert numpy.array_equal(read(a), read(b))
+
+
+def test_reused_chain_are_flushed_between_files(tmp_path, wav_files, job_file):
+    in_files = wav_files(2, seconds=0.5)
+    _, settings = job_file("echo", echo={"Mix": 0.9})
+    local = render_local(settings, in_files, tmp_path)
+    remote, _ = run_node(settings, in_files, tmp_path, reuse_chain=True)
+    # the fake echo line are shorter than the flush, so its tail are run out completely
+    for a, b in zip(local, remote):
+        assert numpy.array_equal(read(a), read(b))
+
+
+def test_wrong_token_are_rejected(tmp_path, wav_files, job_file):
+    in_files = wav_files(1)
+    _, settings = job_file("gain")
+    remote, events = run_node(settings, in_files, tmp_path, token="secret", worker_token="wrong", timeout=2.0)
+    assert not os.path.exists(remote[0])
+    remote, events = run_node(settings, in_files, tmp_path, token="secret")
+    assert os.path.exists(remote[0])
+
+
+def test_hung_worker_task_are_returned(tmp_path, wav_files, job_file):
+    in_files = wav_files(3)
+    _, settings = job_file("gain")
+    open(settings["plugins_list"]["gain (0)"]["path"] + ".hang", "w").close()
+    remote, events = run_node(settings, in_files, tmp_path, workers=2, watchdog=Watchdog(heartbeat_sec=1.0))
+    assert all(os.path.exists(f) for f in remote)
+    assert [ e["event"] for e in events ].count("done") == 3
+
+
+def test_not_loopback_listen_requires_token(monkeypatch):
+    monkeypatch.delenv("NEIL_VST_NODE_TOKEN", raising=False)
+    with pytest.raises(SystemExit):
+        parse_args(["coordinator", "-j", "job.json", "-o", "out", "--listen", "0.0.0.0:7878", "a.wav"])
+    args = parse_args(["coordinator", "-j", "job.json", "-o", "out", "--listen", "0.0.0.0:7878", "--token", "t", "a.wav"])
+    assert args.token == "t"
+    assert parse_args(["coordinator", "-j", "job.json", "-o", "out", "a.wav"]).listen.startswith("127.0.0.1:")
+    assert auth_digest("t", "00") != auth_digest("u", "00")
+
+
+def test_task_errors_do_not_drop_the_worker(tmp_path, wav_files, job_file, monkeypatch):
+    in_files = wav_files(3)
+    _, settings = job_file("gain")
+    settings["metadata"] = [ "Author", "Artist", "Designer", "Book", "Genre", "2021", "", "" ]
+    intro = os.path.join(os.path.dirname(in_files[0]), "intro.wav")
+    os.rename(in_files[0], intro)
+    in_files[0] = intro
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+    # the out file name without the number are rendered untagged
+    remote, events = run_node(settings, in_files, tmp_path / "a")
+    assert [ e["event"] for e in events ].count("done") == 3
+
+    original = Coordinator._tags
+
+    def tags(self, out_filepath):
+        if out_filepath.endswith("in_1.wav"):
+            raise ValueError("broken tags")
+        return original(self, out_filepath)
+
+    monkeypatch.setattr(Coordinator, "_tags", tags)
+    remote, events = run_node(settings, in_files, tmp_path / "b")
+    assert sorted(e["event"] for e in events if e["event"] in ("done", "failed")) == [ "done", "done", "failed" ]
+    assert not os.path.exists(remote[1]) and os.path.exists(remote[2])
@@ -0,0 +1,80 @@
+import os
+import logging
+import threading
+from time import sleep
+from multiprocessing import Pipe
+
+import numpy
+
+from conftest import noise, read
+from neil_vst_gui.chain_render import render_file
+from neil_vst_gui.job import Job
+from neil_vst_gui.main_worker import MainWorker, ProcessWorker
+
+
+logger = logging.getLogger("test_main_worker")
+
+METADATA = [ "Author", "Artist", "Designer", "Book", "Genre", "2021", "", "" ]
+
+
+def wait(worker, timeout=30.0):
+    while worker.is_active() and timeout > 0:
+        sleep(0.05)
+        timeout -= 0.05
+    assert not worker.is_active()
+
+
+def test_tag_only_job_runs_on_threads(tmp_path, monkeypatch):
+    import soundfile
+    from mutagen.flac import FLAC
+
+    files = [ str(tmp_path / ("ch_%02d.flac" % i)) for i in range(1, 4) ]
+    for f in files:
+        soundfile.write(f, noise(0.2), 44100)
+
+    def start(self):
+        raise AssertionError("the worker process are started")
+
+    # the empty chain job are tagged in place without the workers processes
+    monkeypatch.setattr(ProcessWorker, "start", start)
+    job = Job(logger)
+    job.files().add(files)
+    job.files().out_folder_update(str(tmp_path))
+    job.metadata().update(METADATA)
+    worker = MainWorker(logger, tag_threads=2)
+    worker.start(None, job, False, 8192, logging.INFO)
+    wait(worker)
+    assert worker.processes == []
+    assert [ FLAC(f)["tracknumber"] for f in files ] == [ [ "1" ], [ "2" ], [ "3" ] ]
+
+
+def log_pipe():
+    """ The workers log pipe, the log records are dropped """
+    receive, send = Pipe()
+
+    def reader():
+        try:
+            while True:
+                receive.recv()
+        except (EOFError, OSError):
+            pass
+
+    threading.Thread(target=reader, daemon=True).start()
+    return send
+
+
+def test_long_file_are_split_and_stitched(tmp_path, wav_files, job_file):
+    in_files = wav_files(2, seconds=2.5)
+    job, settings = job_file("echo", "gain", echo={"Mix": 0.5})
+    split = {"enable": True, "split_long_sec": 2.0, "segment_sec": 1.0, "preroll_sec": 0.1, "crossfade_sec": 0.05}
+    events = []
+    worker = MainWorker(logger, max_processes=2, on_event=events.append)
+    worker.start_files(log_pipe(), job, in_files, str(tmp_path), (), False, False, 1024, logging.INFO, split=split)
+    wait(worker)
+    assert [ e.get("segments") for e in events if e["event"] == "start" ] == [ 3, 3 ]
+    for f in in_files:
+        serial = str(tmp_path / "serial.wav")
+        render_file(settings, f, serial, 1024, logger)
+        out = read(tmp_path / os.path.basename(f))
+        assert out.shape == read(serial).shape and numpy.allclose(out, read(serial), atol=1e-6)
+    assert not [ f for f in os.listdir(str(tmp_path)) if ".seg" in f ]
@@ -0,0 +1,53 @@
+import math
+
+import numpy
+import pytest
+
+from neil_vst_gui.measure import LoudnessMeter, measure_file, measure_files
+
+
+def tone(samplerate, seconds=10.0, frequency=997.0, level_db=-20.0, channels=2, phase=0.0):
+    t = numpy.arange(int(samplerate * seconds)) / samplerate
+    x = 10 ** (level_db / 20) * numpy.sin(2 * math.pi * frequency * t + phase)
+    return numpy.repeat(x[:, None], channels, axis=1)
+
+
+def meter(x, samplerate, block_size=65536):
+    m = LoudnessMeter(samplerate, x.shape[1])
+    for i in range(0, len(x), block_size):
+        m.process(x[i:i + block_size])
+    return m
+
+
+@pytest.mark.parametrize("samplerate", [44100, 48000, 96000, 192000])
+def test_reference_tone_loudness(samplerate):
+    # BS.1770: the 997 Hz sine at -20 dBFS in the both stereo channels reads -20 LUFS
+    result = meter(tone(samplerate), samplerate).result()
+    assert result["integrated_lufs"] == pytest.approx(-20.0, abs=0.005)
+    assert result["peak_db"] == pytest.approx(-20.0, abs=0.001)
+    assert result["lra_lu"] == pytest.approx(0.0, abs=0.01)
+
+
+def test_block_size_does_not_change_result():
+    x = tone(48000, seconds=5.0, level_db=-12.0) + numpy.random.RandomState(0).uniform(-0.01, 0.01, (240000, 2))
+    a = meter(x, 48000, 65536).result()
+    b = meter(x, 48000, 1000).result()
+    for k in a:
+        assert a[k] == pytest.approx(b[k], abs=1e-9)
+
+
+def test_true_peak_between_samples():
+    # the fs/4 sine at 45 degrees has the samples at -3 dB of its peak
+    result = meter(tone(48000, seconds=1.0, frequency=12000.0, level_db=0.0, channels=1, phase=math.pi / 4), 48000).result()
+    assert result["peak_db"] == pytest.approx(-3.01, abs=0.01)
+    assert result["true_peak_db"] == pytest.approx(0.0, abs=0.1)
+
+
+def test_measure_files(wav_files):
+    files = wav_files(3, seconds=1.0)
+    results = {}
+    measure_files(files, threads=2, on_result=lambda f, r, e: results.update({f: r}))
+    assert set(results) == set(files)
+    for f in files:
+        assert results[f] == measure_file(f)
+        assert results[f]["duration"] == pytest.approx(1.0)
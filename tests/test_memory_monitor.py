@@ -0,0 +1,66 @@
+import os
+import sys
+import types
+
+import pytest
+
+from neil_vst_gui import memory_monitor
+from neil_vst_gui.memory_monitor import MB, MemoryAdmission, process_memory
+
+
+def worker(pid, name="a.wav"):
+    return types.SimpleNamespace(pid=pid, in_file="/in/" + name)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux VmHWM")
+def test_peak_are_the_high_water_mark():
+    _, before = process_memory(os.getpid())
+    data = bytearray(256 * MB)
+    data[::4096] = b"x" * len(data[::4096])
+    del data
+    rss, peak = process_memory(os.getpid())
+    # the freed spike are kept by the kernel peak, the sampled RSS misses it
+    assert peak >= before and peak - rss >= 200 * MB
+
+
+def test_admission_by_budget(monkeypatch):
+    memory = { 1: (600 * MB, 700 * MB), 2: (100 * MB, 100 * MB) }
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: memory[pid])
+    monkeypatch.setattr(memory_monitor, "available_memory", lambda: None)
+    admission = MemoryAdmission(budget_mb=2000, worker_estimate_mb=512)
+    assert admission.admit([])
+    admission.update([ worker(1) ])
+    # the estimate are the largest measured peak
+    assert admission.estimate() == 700 * MB
+    assert admission.admit([ worker(1) ])
+    admission.update([ worker(1), worker(2) ])
+    assert not admission.admit([ worker(1), worker(2) ])
+    assert admission.release(worker(1)) == 700 * MB
+    assert admission.admit([ worker(2) ])
+
+
+def test_admission_by_available_memory(monkeypatch):
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: (100 * MB, 100 * MB))
+    monkeypatch.setattr(memory_monitor, "available_memory", lambda: 2000 * MB)
+    admission = MemoryAdmission(reserve_mb=1024, worker_estimate_mb=400)
+    admission.update([ worker(1) ])
+    # the young worker grows to the estimate, it are not yet seen in the available memory
+    assert admission.admit([ worker(1) ])
+    assert not admission.admit([ worker(1), worker(2) ])
+
+
+def test_sampled_peak_are_labelled(monkeypatch):
+    monkeypatch.setattr(memory_monitor, "available_memory", lambda: None)
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: (300 * MB, None))
+    admission = MemoryAdmission()
+    admission.update([ worker(1) ])
+    assert admission.status() == "a.wav 300 MB (sampled peak 300 MB)"
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: (200 * MB, 500 * MB))
+    admission.update([ worker(1) ])
+    assert admission.status() == "a.wav 200 MB (peak 500 MB)"
+
+
+def test_from_settings():
+    assert MemoryAdmission.from_settings({"enable": False}) is None
+    admission = MemoryAdmission.from_settings({"enable": True, "budget_mb": 4096})
+    assert (admission.budget, admission.reserve) == (4096 * MB, 1024 * MB)
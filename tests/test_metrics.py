@@ -0,0 +1,74 @@
+import json
+import urllib.request
+
+import pytest
+
+from conftest import run_batch
+from neil_vst_gui.metrics import BatchMetrics, MetricsServer, prometheus_text
+
+
+class Worker(object):
+    """ The MainWorker state the metrics read """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.running = []
+        self.pending = [ object() ]
+
+    def is_active(self):
+        return True
+
+
+def metrics_of(files):
+    metrics = BatchMetrics()
+    metrics.reset(list(files))
+    metrics.infos(list(files), [ {"duration": d, "frames": int(d * 44100)} for d in files.values() ])
+    return metrics
+
+
+def test_counters():
+    metrics = metrics_of({"a": 10.0, "b": 20.0, "c": 30.0})
+    for event, f in (("start", "a"), ("done", "a"), ("done", "a"), ("start", "b"), ("failed", "b"), ("skipped", "c")):
+        metrics.event(event, f)
+    data = metrics.snapshot()
+    assert (data["files_done"], data["files_failed"], data["files_skipped"], data["files_active"]) == (1, 1, 1, 0)
+    assert data["audio_seconds_done"] == 10.0
+    assert data["frames_done"] == 441000
+
+
+def test_prometheus_text():
+    metrics = metrics_of({"a": 10.0, "b": 20.0})
+    metrics.event("start", "a")
+    text = prometheus_text(metrics.snapshot(Worker(metrics)))
+    assert 'neil_vst_batch_files{state="total"} 2.0' in text
+    assert 'neil_vst_batch_files{state="active"} 1.0' in text
+    assert "neil_vst_batch_queue_depth 1.0" in text
+    # the unknown ETA are not exported
+    assert "\nneil_vst_batch_eta_seconds " not in text
+    assert "# TYPE neil_vst_batch_frames_done counter" in text
+
+
+def test_server_endpoints(tmp_path):
+    metrics = metrics_of({"a": 10.0})
+    server = MetricsServer(Worker(metrics), port=0, status_file=str(tmp_path / "status.json"), interval=60.0).start()
+    try:
+        url = "http://127.0.0.1:%d" % server.port
+        status = json.loads(urllib.request.urlopen(url + "/status", timeout=5).read().decode("utf-8"))
+        assert status["files_total"] == 1 and status["queue_depth"] == 1
+        text = urllib.request.urlopen(url + "/metrics", timeout=5).read().decode("utf-8")
+        assert "neil_vst_batch_workers_active 0.0" in text
+    finally:
+        server.stop()
+    with open(str(tmp_path / "status.json")) as f:
+        assert json.load(f)["files_total"] == 1
+
+
+def test_batch_status_file(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    job, _ = job_file("gain")
+    status_file = tmp_path / "status.json"
+    code, _ = run_batch("-j", job, "-o", tmp_path / "out", "--status-file", status_file, *in_files)
+    assert code == 0
+    with open(str(status_file)) as f:
+        status = json.load(f)
+    assert status["files_done"] == 2 and status["audio_seconds_done"] == pytest.approx(2.0)
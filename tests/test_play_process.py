@@ -0,0 +1,165 @@
+import sys
+import logging
+import types
+import threading
+from time import time, sleep
+from multiprocessing import Pipe
+
+import numpy
+import pytest
+import soundfile
+
+from conftest import noise, plugins_list
+from neil_vst_gui.play_process import PlayProcessChain, PlayRenderProcess, SharedAudioRing
+
+
+def test_ring_wraps_around():
+    ring = SharedAudioRing(10, 2)
+    data = numpy.arange(32, dtype=numpy.float32).reshape(16, 2)
+    out = numpy.ones((8, 2), dtype=numpy.float32)
+    assert ring.write(data[:6]) and ring.read(out[:4]) == 4
+    assert ring.write(data[6:14])
+    assert ring.available() == 10
+    assert ring.read(out) == 8 and numpy.array_equal(out, data[4:12])
+    # the rest are zero filled
+    assert ring.read(out) == 2 and numpy.array_equal(out[:2], data[12:14]) and not out[2:].any()
+    ring.stop()
+    assert not ring.write(data)
+
+
+def render(ring, filenames, settings, start=0, control=None):
+    process = PlayRenderProcess(None, ring, filenames, settings, start=start, control=control)
+    process.start()
+    blocks = []
+    while not (ring.is_done() and ring.available() == 0):
+        out = numpy.zeros((4096, ring.channels), dtype=numpy.float32)
+        count = ring.read(out)
+        blocks.append(out[:count])
+        if not count:
+            sleep(0.001)
+    process.join(10.0)
+    return process, numpy.concatenate(blocks)
+
+
+def write(tmp_path, name, seconds, samplerate=44100, channels=2, seed=0):
+    path = str(tmp_path / name)
+    soundfile.write(path, noise(seconds, samplerate, channels, seed=seed), samplerate, subtype="FLOAT")
+    return path
+
+
+def test_playlist_are_rendered_gapless(tmp_path):
+    files = [ write(tmp_path, "a.wav", 0.5), write(tmp_path, "b.wav", 0.3, channels=1, seed=1) ]
+    ring = SharedAudioRing(8192, 2)
+    process, played = render(ring, files, plugins_list(tmp_path, "gain", gain={"Gain": 0.25}))
+    a, b = [ soundfile.read(f, dtype="float32", always_2d=True)[0] * numpy.float32(0.5) for f in files ]
+    # the mono file are played on the both stream channels
+    assert numpy.array_equal(played, numpy.concatenate((a, numpy.repeat(b, 2, axis=1))))
+    assert list(process.boundaries) == [ 0, len(a) ]
+
+
+def test_parameters_are_received_while_playing(tmp_path):
+    files = [ write(tmp_path, "a.wav", 2.0) ]
+    control_receive, control_send = Pipe(duplex=False)
+    # the small ring holds the render until the change are sent
+    ring = SharedAudioRing(4096, 2)
+    control_send.send({0: {"Gain": {"value": 0.0, "fullscale": 1.0, "normalized": True}}})
+    _, played = render(ring, files, plugins_list(tmp_path, "gain", gain={"Gain": 0.25}), control=control_receive)
+    assert len(played) == 88200 and not played[-4096:].any()
+
+
+# -----------------------------------------------------------------------------
+
+class FakeStream(object):
+    """ The sounddevice output stream, the callback runs in own thread """
+    streams = []
+    on_create = None
+
+    def __init__(self, samplerate, blocksize, device, channels, dtype, callback, finished_callback, **kwargs):
+        self.samplerate, self.blocksize, self.channels = samplerate, blocksize, channels
+        self.device = device
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.stopped = False
+        self.frames = 0
+        self.thread = None
+        FakeStream.streams.append(self)
+        if FakeStream.on_create is not None:
+            FakeStream.on_create(self)
+
+    def _run(self):
+        status = types.SimpleNamespace(output_underflow=False)
+        while not self.stopped:
+            out = numpy.zeros((self.blocksize, self.channels), dtype=numpy.float32)
+            try:
+                self.callback(out, self.blocksize, None, status)
+            except CallbackStop:
+                break
+            self.frames += self.blocksize
+            # the real time pace, the file change are seen by the progress loop
+            sleep(self.blocksize / float(self.samplerate))
+        self.finished_callback()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped = True
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(5.0)
+
+    def close(self):
+        pass
+
+
+class CallbackStop(Exception):
+    pass
+
+
+@pytest.fixture
+def sounddevice(monkeypatch):
+    FakeStream.streams = []
+    FakeStream.on_create = None
+    module = types.SimpleNamespace(OutputStream=FakeStream, CallbackStop=CallbackStop,
+                                   query_devices=lambda device, kind: {"name": "fake"})
+    monkeypatch.setitem(sys.modules, "sounddevice", module)
+    return module
+
+
+def test_playlist_groups_by_format(tmp_path, sounddevice):
+    files = [ write(tmp_path, "a.wav", 0.3), write(tmp_path, "b.wav", 0.3, seed=1),
+              write(tmp_path, "c.wav", 0.3, samplerate=48000, seed=2) ]
+    chain = PlayProcessChain(blocksize=1024, render_ahead=0.2, logger=logging.getLogger("test_play_process"))
+    changed = []
+    chain.file_changed_signal.connect(changed.append)
+    chain.start(files[0], None, 2, plugins_list(tmp_path, "gain"), 0, playlist=files[1:])
+    # the same format files are played by one stream
+    assert [ s.samplerate for s in FakeStream.streams ] == [ 44100, 48000 ]
+    assert changed == files[1:]
+    assert not chain.is_active() and chain.render_process is None
+
+
+def test_stop_while_setup_are_not_lost(tmp_path, sounddevice):
+    files = [ write(tmp_path, "a.wav", 5.0), write(tmp_path, "b.wav", 5.0, samplerate=48000, seed=1) ]
+    chain = PlayProcessChain(blocksize=1024, render_ahead=1.0, logger=logging.getLogger("test_play_process"))
+    # the stop lands after the render process start, before the stream start
+    FakeStream.on_create = lambda stream: chain.stop()
+    start = time()
+    chain.start(files[0], None, 2, plugins_list(tmp_path, "gain"), 0, playlist=files[1:])
+    assert time() - start < 5.0
+    assert len(FakeStream.streams) == 1 and FakeStream.streams[0].thread is None
+    assert chain.render_process is None and chain.stream is None and chain.ring.is_stopped()
+
+
+def test_only_changed_parameters_are_sent(tmp_path):
+    chain = PlayProcessChain(blocksize=1024, logger=logging.getLogger("test_play_process"))
+    chain.plugins_list = plugins_list(tmp_path, "gain", "echo", gain={"Gain": 0.25}, echo={"Gain": 0.5, "Mix": 0.1})
+    keys = list(chain.plugins_list.keys())
+    receive, chain.control = Pipe(duplex=False)
+    echo = {"Gain": {"value": 0.5, "fullscale": 1.0, "normalized": True}, "Mix": {"value": 0.3, "fullscale": 1.0, "normalized": True}}
+    chain.parameters_update(keys, {keys[1]: echo})
+    assert receive.recv() == {1: {"Mix": echo["Mix"]}}
+    # the same values and the changed chain are not sent
+    chain.parameters_update(keys, {keys[1]: echo})
+    chain.parameters_update(keys[:1], {keys[0]: {"Gain": echo["Mix"]}})
+    assert not receive.poll(0.1)
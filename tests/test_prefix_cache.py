@@ -0,0 +1,56 @@
+import os
+import copy
+import logging
+
+import numpy
+
+import fake_vst
+from conftest import read
+from neil_vst_gui.chain_render import render_file
+from neil_vst_gui.prefix_cache import PrefixCache
+from neil_vst_gui.memory_monitor import MB
+
+
+logger = logging.getLogger("test_prefix_cache")
+
+
+def render(settings, in_filepath, out_filepath, cache=None):
+    render_file(settings, in_filepath, out_filepath, 4096, logger, prefix_cache=cache, pipeline_depth=2)
+    return read(out_filepath)
+
+
+def test_cached_prefix_render_are_same_as_full(tmp_path, wav_files, job_file):
+    in_filepath = wav_files(1, seconds=1.5)[0]
+    _, settings = job_file("gain", "echo", "gain2", gain={"Gain": 0.4}, echo={"Mix": 0.5}, gain2={"Gain": 0.3})
+    cache = PrefixCache(str(tmp_path / "cache"))
+    out = str(tmp_path / "out.wav")
+
+    first = render(settings, in_filepath, out, cache)
+    assert numpy.array_equal(first, render(settings, in_filepath, out))
+    assert len(os.listdir(cache.folder)) == 2
+
+    # the last plugin change renders only it from the cached prefix
+    changed = copy.deepcopy(settings)
+    changed["plugins_list"]["gain2 (2)"]["params"]["Gain"]["value"] = 0.7
+    loads = fake_vst.loads
+    cached = render(changed, in_filepath, out, cache)
+    assert fake_vst.loads - loads == 1
+    assert numpy.array_equal(cached, render(changed, in_filepath, out))
+
+    # the middle plugin change starts from the first prefix
+    changed["plugins_list"]["echo (1)"]["params"]["Mix"]["value"] = 0.1
+    loads = fake_vst.loads
+    cached = render(changed, in_filepath, out, cache)
+    assert fake_vst.loads - loads == 2
+    assert numpy.array_equal(cached, render(changed, in_filepath, out))
+
+
+def test_trim_removes_least_recently_used(tmp_path):
+    cache = PrefixCache(str(tmp_path / "cache"), max_gb=2.5 / 1024)
+    for i, name in enumerate(("old.wav", "mid.wav", "new.wav")):
+        path = os.path.join(cache.folder, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * MB)
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.trim()
+    assert sorted(os.listdir(cache.folder)) == [ "mid.wav", "new.wav" ]
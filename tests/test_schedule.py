@@ -0,0 +1,70 @@
+import os
+import json
+import threading
+
+import pytest
+
+from neil_vst_gui.schedule import ProbeCache, RealtimeHistory, longest_first, _json_save, _json_load
+from neil_vst_gui.buffer_tune import chain_fingerprint
+from neil_vst_gui.batch_journal import job_fingerprint
+from conftest import plugins_list
+
+
+def test_longest_first():
+    assert longest_first([ 3.0, 10.0, 1.0 ], lambda d: d) == [ 10.0, 3.0, 1.0 ]
+
+
+def test_history_estimate_fits_the_overhead(tmp_path):
+    history = RealtimeHistory(str(tmp_path / "history.json"))
+    assert history.estimate("chain", 44100, 2, 60.0) == 60.0
+    for duration in (10.0, 20.0, 40.0):
+        history.record("chain", 44100, 2, duration, 2.0 + duration / 10.0)
+    assert history.estimate("chain", 44100, 2, 100.0) == pytest.approx(12.0)
+    assert history.realtime_factor("chain", 44100, 2) == pytest.approx(10.0)
+    # the other format of the known chain uses its all samples
+    assert history.estimate("chain", 48000, 1, 100.0) == pytest.approx(12.0)
+    history.save()
+    assert RealtimeHistory(history.filepath).estimate("chain", 44100, 2, 100.0) == pytest.approx(12.0)
+
+
+def test_history_key_are_the_plugins_chain(tmp_path):
+    plugins = plugins_list(tmp_path, "gain", "echo", echo={"Mix": 0.5})
+    key = chain_fingerprint(plugins)
+    # the job metadata and the buffer size change the job, not the chain key
+    assert job_fingerprint({"plugins_list": plugins, "metadata": ["a"]}, 4096) != \
+        job_fingerprint({"plugins_list": plugins, "metadata": ["b"]}, 8192)
+    assert key == chain_fingerprint(json.loads(json.dumps(plugins)))
+    plugins["echo (1)"]["params"]["Mix"]["value"] = 0.6
+    assert key != chain_fingerprint(plugins)
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    filepath = str(tmp_path / "cache.json")
+    errors = []
+
+    def save(n):
+        try:
+            for i in range(50):
+                _json_save(filepath, {"writer": n, "i": i})
+        except OSError as e:
+            errors.append(e)
+
+    threads = [ threading.Thread(target=save, args=(n, )) for n in range(4) ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert _json_load(filepath)["i"] == 49
+    assert os.listdir(str(tmp_path)) == [ "cache.json" ]
+
+
+def test_probe_cache(tmp_path, wav_files):
+    files = wav_files(2, seconds=0.5, samplerate=48000, channels=1)
+    cache = ProbeCache(str(tmp_path / "probe.json"))
+    infos = cache.probe(files + [ str(tmp_path / "missing.wav") ])
+    assert [ i["duration"] for i in infos[:2] ] == [ 0.5, 0.5 ]
+    assert infos[0]["samplerate"] == 48000 and infos[0]["channels"] == 1
+    assert infos[2] is None
+    cache.save()
+    assert set(_json_load(cache.filepath)) == set(files)
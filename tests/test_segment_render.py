@@ -0,0 +1,45 @@
+import os
+import logging
+
+import numpy
+import pytest
+
+from conftest import read
+from neil_vst_gui.segment_render import plan_segments, render_file_segmented, verify_segmented
+
+
+logger = logging.getLogger("test_segment_render")
+
+
+def test_plan_segments():
+    # the pre-roll are 2 sec + the latency + the crossfade
+    segments = plan_segments(1000, 10, segment_sec=30.0, preroll_sec=2.0, crossfade_sec=1.0, latency=5)
+    assert [ (s["read_start"], s["out_start"], s["out_stop"], s["crossfade"]) for s in segments ] == [
+        (0, 0, 310, 0), (265, 300, 610, 10), (565, 600, 910, 10), (865, 900, 1000, 10) ]
+    # the short last segment are joined to the previous one
+    segments = plan_segments(915, 10, segment_sec=30.0, preroll_sec=2.0, crossfade_sec=1.0)
+    assert [ (s["out_start"], s["out_stop"]) for s in segments ] == [ (0, 310), (300, 610), (600, 915) ]
+    assert len(plan_segments(100, 10, segment_sec=30.0)) == 1
+    with pytest.raises(AssertionError):
+        plan_segments(1000, 10, segment_sec=1.0, crossfade_sec=1.0)
+
+
+@pytest.mark.parametrize("names, params, tolerance", [
+    (("gain", ), {"gain": {"Gain": 0.25}}, 1e-6),
+    # the delay line state are warmed up by the pre-roll
+    (("echo", "gain"), {"echo": {"Mix": 0.5}}, 1e-6),
+])
+def test_segmented_render_are_same_as_serial(tmp_path, wav_files, job_file, names, params, tolerance):
+    in_filepath = wav_files(1, seconds=3.0)[0]
+    _, settings = job_file(*names, **params)
+    assert verify_segmented(settings, in_filepath, 1024, logger, jobs=2, segment_sec=1.0, preroll_sec=0.1,
+                            crossfade_sec=0.05) < tolerance
+
+
+def test_segments_are_removed(tmp_path, wav_files, job_file):
+    in_filepath = wav_files(1, seconds=2.5)[0]
+    _, settings = job_file("gain", gain={"Gain": 0.25})
+    out_filepath = str(tmp_path / "out.wav")
+    render_file_segmented(settings, in_filepath, out_filepath, 1024, logger, jobs=2, segment_sec=1.0, preroll_sec=0.1)
+    assert read(out_filepath).shape == read(in_filepath).shape
+    assert not [ f for f in os.listdir(str(tmp_path)) if ".seg" in f ]
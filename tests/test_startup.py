@@ -0,0 +1,58 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+import neil_vst_gui
+from neil_vst_gui.build_ui import build, ui_hash
+from neil_vst_gui.startup_profile import StartupProfile
+
+
+UI_FILEPATH = os.path.join(os.path.dirname(neil_vst_gui.__file__), "main.ui")
+
+
+def test_compiled_ui_are_current():
+    import neil_vst_gui.main_ui as main_ui
+    # 'python -m neil_vst_gui.build_ui' must be run after the 'main.ui' changes
+    assert main_ui.UI_SOURCE_HASH == ui_hash(UI_FILEPATH)
+
+
+def test_ui_hash_of_the_line_endings(tmp_path):
+    unix, windows = tmp_path / "unix.ui", tmp_path / "windows.ui"
+    unix.write_bytes(b"<ui>\n<widget/>\n</ui>\n")
+    windows.write_bytes(b"<ui>\r\n<widget/>\r\n</ui>\r\n")
+    assert ui_hash(str(unix)) == ui_hash(str(windows))
+    windows.write_bytes(b"<ui>\r\n<widget name='x'/>\r\n</ui>\r\n")
+    assert ui_hash(str(unix)) != ui_hash(str(windows))
+
+
+def test_build_ui(tmp_path):
+    pytest.importorskip("PyQt5.uic")
+    py_filepath = str(tmp_path / "main_ui.py")
+    build(UI_FILEPATH, py_filepath)
+    with open(py_filepath, "r", encoding="utf-8") as f:
+        code = f.read()
+    assert "main_rc" not in code and 'UI_SOURCE_HASH = "%s"' % ui_hash(UI_FILEPATH) in code
+    assert "class Ui_MainWindow" in code
+    compile(code, py_filepath, "exec")
+
+
+def test_startup_profile():
+    profile = StartupProfile(enabled=False)
+    profile.mark("modules import")
+    assert profile.report() == []
+    profile = StartupProfile(enabled=True, t0=0.0)
+    profile.mark("modules import")
+    profile.mark("window show")
+    lines = profile.report()
+    assert [ l.split()[0] for l in lines ] == [ "modules", "window" ]
+
+
+def test_vst_and_tags_modules_are_imported_on_first_use():
+    code = ("import sys\n"
+            "from neil_vst_gui.vst_chain import VSTChain\n"
+            "import neil_vst_gui.tag_write, neil_vst_gui.main_worker\n"
+            "VSTChain()\n"
+            "sys.exit(len({'mutagen', 'PIL', 'neil_vst', 'fake_vst'} & set(sys.modules)))")
+    assert subprocess.run([ sys.executable, "-c", code ]).returncode == 0
@@ -0,0 +1,93 @@
+import os
+import base64
+import logging
+
+import numpy
+
+from neil_vst_gui.chain_render import render_file
+from neil_vst_gui.tag_write import TagWriter, _picture_block
+
+
+def image(tmp_path, name="cover.png", size=(600, 400)):
+    from PIL import Image
+
+    path = str(tmp_path / name)
+    Image.new("RGB", size, (200, 80, 20)).save(path)
+    return path
+
+
+def picture(block):
+    from mutagen.flac import Picture
+
+    return Picture(base64.b64decode(block))
+
+
+def test_picture_downscale(tmp_path):
+    path = image(tmp_path)
+    original = picture(TagWriter().picture_write(path))
+    assert (original.width, original.height, original.mime) == (600, 400, "image/png")
+    small = picture(TagWriter().picture_write(path, max_size=150))
+    assert (small.width, small.height) == (150, 100)
+    jpeg = picture(TagWriter().picture_write(image(tmp_path, "cover.jpg"), max_size=150))
+    assert (jpeg.width, jpeg.mime) == (150, "image/jpeg")
+
+
+def test_picture_are_encoded_once(tmp_path):
+    path = image(tmp_path)
+    hits = _picture_block.cache_info().hits
+    first = TagWriter().picture_write(path, max_size=200)
+    assert TagWriter().picture_write(path, max_size=200) is first
+    assert _picture_block.cache_info().hits == hits + 1
+
+
+METADATA = [ "Author", "Artist", "Designer", "Book", "Genre", "2021", "by {author}, {sound_designer}" ]
+
+
+def test_tags_of_the_file_name():
+    tags = TagWriter().tags("/out/ch_012.flac", *METADATA)
+    assert (tags["tracknumber"], tags["comment"]) == ("12", "by Author, Designer")
+    # the name without the number are tagged without the track number
+    assert TagWriter().tags("/out/intro.flac", *METADATA)["tracknumber"] == ""
+
+
+def test_failed_tags_are_not_fatal(caplog):
+    assert TagWriter(logging.getLogger("test_tag_write")).prepare("/out/ch_01.flac", METADATA[:3]) == (None, None)
+    assert "tags are not written" in caplog.text
+    assert TagWriter().prepare("/out/ch_01.flac", ()) == (None, None)
+
+
+def test_tags_are_written_by_encoder(tmp_path, wav_files, job_file):
+    import soundfile
+    from mutagen.flac import FLAC
+
+    in_file = wav_files(1, subtype="PCM_24")[0]
+    _, settings = job_file("gain", gain={"Gain": 0.25})
+    logger = logging.getLogger("test_tag_write")
+    metadata = METADATA + [ image(tmp_path) ]
+    plain, tagged = str(tmp_path / "plain.flac"), str(tmp_path / "ch_07.flac")
+    render_file(settings, in_file, plain, 4096, logger)
+    writer = TagWriter(logger)
+    tags, encoder_tags = writer.prepare(tagged, metadata)
+    render_file(settings, in_file, tagged, 4096, logger, tags=encoder_tags)
+    size = os.path.getsize(tagged)
+    writer.complete(tagged, tags, metadata[-1])
+    # the picture are written over the encoder placeholder, the audio are not moved
+    assert os.path.getsize(tagged) == size
+    flac = FLAC(tagged)
+    assert flac["tracknumber"] == [ "7" ] and flac["artist"] == [ "Artist" ]
+    assert picture(flac["metadata_block_picture"][0]).width == 600
+    assert numpy.array_equal(soundfile.read(tagged)[0], soundfile.read(plain)[0])
+
+
+def test_wav_tags_are_id3(tmp_path, wav_files):
+    from mutagen.wave import WAVE
+
+    path = str(tmp_path / "ch_03.wav")
+    os.rename(wav_files(1)[0], path)
+    writer = TagWriter(logging.getLogger("test_tag_write"))
+    tags, encoder_tags = writer.prepare(path, METADATA + [ image(tmp_path) ])
+    assert encoder_tags is None
+    writer.complete(path, tags, image(tmp_path))
+    wave = WAVE(path)
+    assert str(wave.tags["TRCK"]) == "3" and str(wave.tags["TPE1"]) == "Artist"
+    assert len(wave.tags.getall("APIC")) == 1
@@ -0,0 +1,81 @@
+import logging
+import threading
+
+import pytest
+
+import fake_vst
+from conftest import plugins_list
+from neil_vst_gui.tasks import BackgroundTask, TaskCancelled
+from neil_vst_gui.vst_chain import VSTChain
+
+
+def run(target):
+    done = threading.Event()
+    results = []
+    BackgroundTask("test", target, on_done=lambda result, error: (results.append((result, error)), done.set())).start()
+    assert done.wait(10.0)
+    return results[0]
+
+
+def test_task_result_and_progress():
+    progress = []
+    task = BackgroundTask("test", lambda task: task.progress(1, 2, "a") or 42, on_progress=progress.append)
+    task._run()
+    assert progress == [ "test [ 1 / 2 ] a" ]
+    assert run(lambda task: 42) == (42, None)
+
+
+def test_cancelled_task():
+    def target(task):
+        task.cancel()
+        task.progress(0, 1)
+        return 42
+
+    result, error = run(target)
+    assert result is None and isinstance(error, TaskCancelled)
+
+
+@pytest.fixture
+def chain(tmp_path):
+    chain = VSTChain(logging.getLogger("test_tasks"))
+    chain.plugins_load(plugins_list(tmp_path, "gain", "echo", gain={"Gain": 0.1}, echo={"Mix": 0.2}))
+    return chain
+
+
+def test_build_does_not_change_the_chain(tmp_path, chain):
+    gain, echo = chain.plugins()
+    settings = plugins_list(tmp_path, "echo", "gain3", echo={"Mix": 0.7}, gain3={"Gain": 0.3})
+    plugins, parameters = run(lambda task: chain.build(settings, task))[0]
+    # the chain instance are reused, its parameters are set by the replace only
+    assert plugins[0] is echo and echo.parameter_value(name="Mix") == 0.2
+    assert plugins[1].parameter_value(name="Gain") == 0.3
+    assert chain.plugins() == [ gain, echo ]
+    chain.replace(plugins, parameters)
+    assert chain.plugins() == plugins
+    assert echo.parameter_value(name="Mix") == 0.7
+    # the reused instance are reset to the load state under the job parameters
+    assert echo.parameter_value(name="Gain") == 0.5
+    assert list(chain.pool.values()) == [ gain ]
+
+
+def test_cancelled_build_keeps_the_chain(tmp_path, chain):
+    settings = plugins_list(tmp_path, "echo", "a", "b", echo={"Mix": 0.7})
+
+    def target(task):
+        original = task.progress
+
+        def progress(done, total, text=""):
+            if done == 2:
+                task.cancel()
+            original(done, total, text)
+
+        task.progress = progress
+        return chain.build(settings, task)
+
+    loads = fake_vst.loads
+    result, error = run(target)
+    assert isinstance(error, TaskCancelled)
+    assert fake_vst.loads - loads == 1
+    assert chain.plugins()[1].parameter_value(name="Mix") == 0.2
+    # the loaded instance are kept for the next build
+    assert [ p.name for p in chain.pool.values() ] == [ "a" ]
@@ -0,0 +1,41 @@
+import os
+import json
+
+from conftest import run_batch
+from neil_vst_gui.trace import Tracer, SLICE_US
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("load"):
+        pass
+    tracer.block("DSP", 0.0, 10.0)
+    tracer.flush()
+    assert tracer.events == []
+
+
+def test_blocks_are_joined_to_slices():
+    tracer = Tracer().enable("test")
+    for i in range(10):
+        tracer.block("DSP", i * 1000.0, i * 1000.0 + 500.0)
+    tracer.block("DSP", SLICE_US * 2.0, SLICE_US * 2.0 + 500.0)
+    tracer.flush()
+    slices = [ e for e in tracer.events if e["ph"] == "X" ]
+    assert [ e["args"]["blocks"] for e in slices ] == [ 10, 1 ]
+    assert slices[0]["args"]["busy_pct"] == round(100.0 * 5000 / 9500, 1)
+
+
+def test_batch_trace(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    job, _ = job_file("gain", "echo")
+    trace_file = str(tmp_path / "trace.json")
+    code, _ = run_batch("-j", job, "-o", tmp_path / "out", "-p", 2, "--trace", trace_file, *in_files)
+    assert code == 0
+    with open(trace_file) as f:
+        events = json.load(f)["traceEvents"]
+    names = set(e["name"] for e in events)
+    assert { "plugin load", "parameters restore", "decode", "DSP", "encode" } <= names
+    # the dispatcher worker lanes and the workers processes
+    assert len(set(e["pid"] for e in events)) == 3
+    assert min(e["ts"] for e in events if "ts" in e) == 0.0
+    assert not os.path.exists(trace_file + ".parts")
@@ -0,0 +1,54 @@
+import logging
+
+import pytest
+
+import fake_vst
+import neil_vst_gui.memory_monitor as memory_monitor
+from neil_vst_gui.memory_monitor import MB
+from neil_vst_gui.vst_chain import VSTChain
+from conftest import plugins_list
+
+
+@pytest.fixture
+def chain():
+    return VSTChain(logging.getLogger("test_vst_pool"))
+
+
+def test_removed_plugin_are_reused(tmp_path, chain):
+    plugins = plugins_list(tmp_path, "gain", "echo", echo={"Mix": 0.5})
+    chain.plugins_load(plugins)
+    loads = fake_vst.loads
+    echo = chain.plugin(1)
+    echo.parameter_value(name="Gain", value=0.9)
+    chain.clear()
+    assert len(chain.pool) == 2
+    chain.add(plugins["echo (1)"]["path"], {"Mix": {"value": 0.2, "fullscale": 1.0}})
+    assert fake_vst.loads == loads
+    assert chain.plugin(0) is echo
+    # the reused instance are reset to the load state under the new parameters
+    assert echo.parameter_value(name="Gain") == 0.5
+    assert echo.parameter_value(name="Mix") == 0.2
+
+
+def test_pool_size_limit(tmp_path, chain):
+    chain.pool_size = 1
+    chain.plugins_load(plugins_list(tmp_path, "gain", "echo"))
+    chain.clear()
+    assert [ p.name for p in chain.pool.values() ] == [ "echo" ]
+
+
+def test_memory_trim_stops_when_rss_does_not_drop(tmp_path, chain, monkeypatch):
+    chain.pool_memory_mb = 100
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: (500 * MB, 500 * MB))
+    chain.plugins_load(plugins_list(tmp_path, "a", "b", "c", "d"))
+    chain.clear()
+    # the heap keeps the unloaded plugin memory, only one instance are unloaded
+    assert len(chain.pool) == 3
+
+
+def test_memory_trim_while_rss_drops(tmp_path, chain, monkeypatch):
+    chain.pool_memory_mb = 100
+    chain.plugins_load(plugins_list(tmp_path, "a", "b", "c", "d"))
+    monkeypatch.setattr(memory_monitor, "process_memory", lambda pid: ((50 + 30 * len(chain.pool)) * MB, None))
+    chain.clear()
+    assert len(chain.pool) == 1
@@ -0,0 +1,43 @@
+import os
+import types
+
+import numpy
+
+from conftest import read, run_batch
+from neil_vst_gui.watchdog import Watchdog
+
+
+def worker(start_time, beat, cost=10.0):
+    return types.SimpleNamespace(start_time=start_time, heartbeat=types.SimpleNamespace(value=beat), cost=cost)
+
+
+def test_check():
+    watchdog = Watchdog(heartbeat_sec=5.0, timeout_factor=2.0, min_timeout_sec=30.0)
+    assert watchdog.timeout(10.0) == 30.0 and watchdog.timeout(100.0) == 200.0
+    assert watchdog.check(worker(100.0, 0.0), now=104.0) is None
+    assert watchdog.check(worker(100.0, 103.0), now=107.0) is None
+    assert watchdog.check(worker(100.0, 103.0), now=109.0).startswith("no progress")
+    assert watchdog.check(worker(100.0, 140.0), now=141.0).startswith("render time over")
+    assert Watchdog(heartbeat_sec=0).check(worker(100.0, 0.0), now=120.0) is None
+
+
+def test_hung_worker_are_retried(tmp_path, wav_files, job_file):
+    in_files = wav_files(2)
+    job, settings = job_file("gain", gain={"Gain": 0.25})
+    open(settings["plugins_list"]["gain (0)"]["path"] + ".hang", "w").close()
+    code, events = run_batch("-j", job, "-o", tmp_path / "out", "-p", 1, "--heartbeat", 1, *in_files)
+    assert code == 0
+    assert [ e["event"] for e in events ].count("retry") == 1
+    assert [ e["event"] for e in events ].count("done") == 2
+    for f in in_files:
+        assert numpy.array_equal(read(tmp_path / "out" / os.path.basename(f)), read(f) * numpy.float32(0.5))
+
+
+def test_retries_are_limited(tmp_path, wav_files, job_file):
+    in_files = wav_files(1)
+    job, settings = job_file("gain")
+    open(settings["plugins_list"]["gain (0)"]["path"] + ".hang", "w").close()
+    code, events = run_batch("-j", job, "-o", tmp_path / "out", "--heartbeat", 1, "--retries", 0, *in_files)
+    assert code == 1
+    assert [ e["event"] for e in events ].count("failed") == 1
+    assert not (tmp_path / "out" / "in_0.wav").exists()
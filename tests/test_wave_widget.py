@@ -0,0 +1,23 @@
+import logging
+
+import soundfile
+
+from conftest import noise
+
+
+def test_short_file_view(tmp_path, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtWidgets
+    from neil_vst_gui.wave_widget import WaveWidget
+
+    # the widgets need the application, it are kept to the test end
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    path = str(tmp_path / "short.wav")
+    soundfile.write(path, noise(100 / 44100.0), 44100)
+    widget = WaveWidget(logging.getLogger("test_wave_widget"))
+    widget.resize(800, 40)
+    # the file has less peaks bins than the view pixels
+    widget.set_wave_file(path)
+    assert len(widget.wave_data) == 100
+    assert len([ item for item in widget.scene.items() if item is not widget.play_rect ]) == 100
+    app.processEvents()